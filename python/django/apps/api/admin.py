@@ -0,0 +1,24 @@
+"""
+API admin configuration.
+"""
+from django.contrib import admin
+
+from .models import Item, WebhookEvent
+
+
+@admin.register(Item)
+class ItemAdmin(admin.ModelAdmin):
+    """Admin for items."""
+    list_display = ['id', 'name', 'status', 'created_at']
+    list_filter = ['status']
+    search_fields = ['name']
+    ordering = ['-created_at', '-id']
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    """Admin for stored webhook deliveries."""
+    list_display = ['id', 'status', 'content_type', 'received_at', 'processed_at']
+    list_filter = ['status']
+    search_fields = ['idempotency_key']
+    ordering = ['-received_at']
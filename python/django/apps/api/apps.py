@@ -8,4 +8,7 @@ class ApiConfig(AppConfig):
     """API app configuration."""
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.api'
-    verbose_name = 'API' 
\ No newline at end of file
+    verbose_name = 'API' 
+
+    def ready(self):
+        from . import signals  # noqa: F401
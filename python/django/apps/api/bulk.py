@@ -0,0 +1,96 @@
+"""
+Validation and batched insertion of items.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from .conditional import bump_items_version
+from .models import Item
+
+ITEM_STATUSES = frozenset(Item.Status.values)
+NAME_MAX_LENGTH = Item._meta.get_field('name').max_length
+COPY_COLUMNS = ('name', 'description', 'status', 'created_at', 'updated_at')
+
+
+class MalformedRow:
+    """Placeholder for an input row that could not be decoded."""
+
+    def __init__(self, message):
+        self.message = message
+
+
+def validate_item(data):
+    """Return a DRF-style ``{field: [messages]}`` dict of errors for one item."""
+    if isinstance(data, MalformedRow):
+        return {'non_field_errors': [data.message]}
+    if not isinstance(data, dict):
+        return {'non_field_errors': ['Expected a JSON object.']}
+
+    errors = {}
+    name = data.get('name')
+    if not name:
+        errors['name'] = ['This field is required.']
+    elif not isinstance(name, str) or len(name) > NAME_MAX_LENGTH:
+        errors['name'] = [f'Must be a string of at most {NAME_MAX_LENGTH} characters.']
+
+    if data.get('status') not in ITEM_STATUSES:
+        errors['status'] = ['This field is required and must be one of: active, inactive, pending.']
+
+    description = data.get('description')
+    if description is not None and not isinstance(description, str):
+        errors['description'] = ['Must be a string.']
+    return errors
+
+
+def validate_items(rows):
+    """
+    Validate ``rows`` in a single pass.
+
+    Returns ``(valid, errors)`` where ``valid`` holds normalised
+    ``(name, description, status)`` tuples and ``errors`` lists
+    ``{'row': index, 'errors': {...}}`` for every rejected row.
+    """
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        row_errors = validate_item(row)
+        if row_errors:
+            errors.append({'row': index, 'errors': row_errors})
+        else:
+            valid.append((row['name'], row.get('description') or '', row['status']))
+    return valid, errors
+
+
+def insert_items(rows, batch_size=None, copy_threshold=None, using=DEFAULT_DB_ALIAS):
+    """
+    Insert validated ``(name, description, status)`` tuples in one transaction.
+
+    Uses ``bulk_create`` in ``batch_size`` chunks, switching to PostgreSQL
+    ``COPY`` once there are at least ``copy_threshold`` rows.
+    """
+    batch_size = batch_size or settings.ITEMS_BULK_BATCH_SIZE
+    copy_threshold = copy_threshold or settings.ITEMS_BULK_COPY_THRESHOLD
+    connection = connections[using]
+
+    with transaction.atomic(using=using):
+        if len(rows) >= copy_threshold and connection.vendor == 'postgresql':
+            copy_items(connection, rows)
+        else:
+            Item.objects.using(using).bulk_create(
+                [Item(name=name, description=description, status=status)
+                 for name, description, status in rows],
+                batch_size=batch_size,
+            )
+        # bulk_create and COPY send no post_save signals.
+        transaction.on_commit(bump_items_version, using=using)
+    return len(rows)
+
+
+def copy_items(connection, rows):
+    """Stream rows into ``api_item`` with psycopg's COPY protocol."""
+    now = timezone.now()
+    sql = f"COPY {Item._meta.db_table} ({', '.join(COPY_COLUMNS)}) FROM STDIN"
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(sql) as copy:
+            for name, description, status in rows:
+                copy.write_row((name, description, status, now, now))
@@ -0,0 +1,25 @@
+"""
+Cleanup targets for the API application (see apps.core.cleanup).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.cleanup import ModelCleanup
+
+from .models import WebhookEvent
+
+
+class OldWebhookEvents(ModelCleanup):
+    """Processed and failed webhook deliveries older than ``WEBHOOK_RETENTION_DAYS``."""
+    name = 'webhook_events'
+    model = WebhookEvent
+    order_field = 'received_at'
+
+    def queryset(self):
+        cutoff = timezone.now() - timedelta(days=settings.WEBHOOK_RETENTION_DAYS)
+        return super().queryset().filter(
+            received_at__lt=cutoff,
+            status__in=[WebhookEvent.Status.PROCESSED, WebhookEvent.Status.FAILED],
+        )
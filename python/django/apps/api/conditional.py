@@ -0,0 +1,67 @@
+"""
+Conditional GET helpers.
+
+Validators are computed from cheap state (a version stamp, a cache entry's
+timestamp) before the view queries or renders anything, so a client whose
+copy is current gets a 304 for the cost of one cache read.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+ITEMS_VERSION_KEY = 'api.items.version'
+
+
+def items_version():
+    """
+    Unix timestamp of the last committed change to ``Item`` rows.
+
+    Bumped by the model signals and by ``insert_items``; ``QuerySet.update()``
+    and raw SQL bypass both and must call ``bump_items_version`` themselves.
+    A missing key (eviction, fresh cache) starts a new version, so clients
+    revalidate once rather than being served stale data.
+
+    ``Last-Modified`` has one-second resolution, so every bump moves the whole
+    second forward: a second change within the same second would otherwise
+    keep the header and get ``If-Modified-Since`` clients a stale 304. Under
+    bursts the stamp runs ahead of the clock, which only keeps reads on the
+    primary a little longer.
+    """
+    version = cache.get(ITEMS_VERSION_KEY)
+    if version is None:
+        cache.add(ITEMS_VERSION_KEY, time.time(), None)
+        version = cache.get(ITEMS_VERSION_KEY, time.time())
+    return version
+
+
+def bump_items_version():
+    version = cache.get(ITEMS_VERSION_KEY)
+    now = time.time()
+    cache.set(ITEMS_VERSION_KEY, now if version is None else max(now, int(version) + 1), None)
+
+
+def make_etag(*parts, weak=False):
+    """Quoted ETag from ``parts``; weak ones only promise an equivalent body."""
+    digest = hashlib.md5(':'.join(map(str, parts)).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def not_modified(request, etag=None, last_modified=None):
+    """Return a 304 (or 412) response if the client's copy is current, else None."""
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified) if last_modified is not None else None,
+    )
+    return set_validators(response, etag, last_modified) if response is not None else None
+
+
+def set_validators(response, etag=None, last_modified=None):
+    if etag:
+        response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
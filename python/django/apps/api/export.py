@@ -0,0 +1,77 @@
+"""
+Streaming item exports.
+
+Rows are read through a server-side cursor (``QuerySet.iterator``) and
+serialised a chunk at a time, so memory use does not grow with the size
+of the export. Under ASGI the stream is wrapped in ``aiter_chunks``:
+Django would read a sync iterator to the end before sending anything.
+"""
+import csv
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+EXPORT_FIELDS = ('id', 'name', 'description', 'status', 'created_at', 'updated_at')
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, chunk_size):
+    """Yield export rows as tuples, ``chunk_size`` rows per cursor fetch."""
+    return queryset.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+def stream_ndjson(queryset, chunk_size):
+    """Yield NDJSON text, one buffer per ``chunk_size`` rows."""
+    encoder = DjangoJSONEncoder()
+    buffer = []
+    for row in iter_rows(queryset, chunk_size):
+        buffer.append(encoder.encode(dict(zip(EXPORT_FIELDS, row, strict=True))))
+        if len(buffer) >= chunk_size:
+            yield '\n'.join(buffer) + '\n'
+            buffer = []
+    if buffer:
+        yield '\n'.join(buffer) + '\n'
+
+
+def stream_csv(queryset, chunk_size):
+    """Yield CSV text with a header row, one buffer per ``chunk_size`` rows."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    buffer = []
+    for row in iter_rows(queryset, chunk_size):
+        buffer.append(writer.writerow(
+            [value.isoformat() if hasattr(value, 'isoformat') else value for value in row]
+        ))
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+async def aiter_chunks(stream):
+    """
+    Yield the chunks of the sync ``stream`` one at a time, for ASGI.
+
+    Each chunk is produced in the request's sync thread, where the cursor's
+    connection lives, and sent before the next one is read.
+    """
+    done = object()
+    next_chunk = sync_to_async(next)
+    try:
+        while (chunk := await next_chunk(stream, done)) is not done:
+            yield chunk
+    finally:
+        await sync_to_async(stream.close)()
+
+
+STREAMERS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv,
+}
@@ -0,0 +1,183 @@
+"""
+Health checks for the API app.
+
+``HealthMonitor`` runs the checks concurrently, each against its own
+deadline, and caches the result per process. Fresh snapshots are served
+as is; stale ones are served while a single background refresh runs, so
+probe traffic triggers at most one real round of checks per interval.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.core.db_router import get_replicas
+
+from .storage_health import get_storage_probe
+
+
+def check_database():
+    """
+    Check primary database connectivity and measure replica lag.
+
+    The primary is probed on its own alias, whatever the request's read
+    scope; each replica is probed by its lag query.
+    """
+    try:
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception as e:
+        return {'status': 'error', 'message': f'Database connection failed: {str(e)}'}
+    result = {'status': 'ok', 'message': 'Database connection successful'}
+    replicas = get_replicas()
+    if replicas.aliases:
+        # Reads fall back to the primary, so a lagging replica is not an error.
+        replicas.refresh()
+        result['replicas'] = replicas.status()
+    return result
+
+
+def check_cache():
+    """Check cache connectivity."""
+    try:
+        cache.set('health_check', 'ok', 10)
+        value = cache.get('health_check')
+        return {'status': 'ok' if value == 'ok' else 'error',
+                'message': 'Cache is working' if value == 'ok' else 'Cache read/write failed'}
+    except Exception as e:
+        return {'status': 'error', 'message': f'Cache error: {str(e)}'}
+
+
+def check_storage():
+    """Check storage writability and free space from the background probe."""
+    try:
+        return get_storage_probe().check()
+    except Exception as e:
+        return {'status': 'error', 'message': f'Storage error: {str(e)}'}
+
+
+HEALTH_CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+    'storage': check_storage,
+}
+
+
+class HealthMonitor:
+    """Runs health checks concurrently and caches the latest snapshot."""
+
+    def __init__(self, checks=None, ttl=None, stale_ttl=None, timeouts=None):
+        self.checks = dict(checks or HEALTH_CHECKS)
+        self.ttl = settings.HEALTH_CHECK_CACHE_TTL if ttl is None else ttl
+        self.stale_ttl = settings.HEALTH_CHECK_STALE_TTL if stale_ttl is None else stale_ttl
+        self.timeouts = {**settings.HEALTH_CHECK_TIMEOUTS, **(timeouts or {})}
+        self.executor = ThreadPoolExecutor(max_workers=len(self.checks), thread_name_prefix='health')
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.snapshot = None
+        self.refreshing = False
+
+    def get_snapshot(self):
+        """Return the latest snapshot, refreshing it if needed."""
+        snapshot = self.snapshot
+        age = time.monotonic() - snapshot['checked_at'] if snapshot else None
+
+        if snapshot and age < self.ttl:
+            return self.serve(snapshot, cached=True)
+
+        if snapshot and age < self.ttl + self.stale_ttl:
+            # Stale-while-revalidate: answer now, refresh once in the background.
+            with self.lock:
+                start = not self.refreshing
+                self.refreshing = True
+            if start:
+                threading.Thread(target=self.refresh_in_background, daemon=True).start()
+            return self.serve(snapshot, cached=True)
+
+        with self.lock:
+            # Another thread may have refreshed while we waited for the lock.
+            cached = self.snapshot is not snapshot
+            if not cached:
+                self.snapshot = self.run_checks()
+            return self.serve(self.snapshot, cached=cached)
+
+    def refresh_in_background(self):
+        try:
+            snapshot = self.run_checks()
+            with self.lock:
+                self.snapshot = snapshot
+        finally:
+            self.refreshing = False
+
+    def run_checks(self):
+        """Run every check concurrently, each bounded by its own deadline."""
+        started = time.monotonic()
+        futures = {}
+        results = {}
+        for name, check in self.checks.items():
+            previous = self.pending.get(name)
+            if previous is not None and not previous.done():
+                # Never stack checks behind one that is still hanging.
+                results[name] = {'status': 'error', 'message': 'Previous check still running', 'latency_ms': None}
+                continue
+            futures[name] = self.pending[name] = self.executor.submit(self.timed, check)
+
+        for name, future in futures.items():
+            deadline = self.timeouts.get(name, self.timeouts['default'])
+            remaining = max(0.0, started + deadline - time.monotonic())
+            try:
+                results[name] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                results[name] = {
+                    'status': 'error',
+                    'message': f'Check timed out after {deadline}s',
+                    'latency_ms': round(deadline * 1000, 2),
+                }
+
+        return {
+            'checks': {name: results[name] for name in self.checks},
+            'checked_at': time.monotonic(),
+            'timestamp': datetime.now().isoformat(),
+        }
+
+    @staticmethod
+    def timed(check):
+        start = time.perf_counter()
+        try:
+            result = check()
+        finally:
+            # Pool threads must not keep their own database connections open.
+            connections.close_all()
+        return {**result, 'latency_ms': round((time.perf_counter() - start) * 1000, 2)}
+
+    def serve(self, snapshot, cached):
+        return {
+            'checks': snapshot['checks'],
+            'timestamp': snapshot['timestamp'],
+            'age': round(time.monotonic() - snapshot['checked_at'], 3),
+            'cached': cached,
+        }
+
+    def reset(self):
+        """Drop the cached snapshot (used by tests)."""
+        with self.lock:
+            self.snapshot = None
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_health_monitor():
+    """Return the per-process ``HealthMonitor``."""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = HealthMonitor()
+    return _monitor
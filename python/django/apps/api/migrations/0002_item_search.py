@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:18
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='api_item_search_idx'),
+        ),
+        # pg_trgm is optional (apps.api.search detects it at runtime): the
+        # extension and its index are created only where the server ships it
+        # and the role may install it. The test settings build the schema
+        # without migrations, so they never have the index.
+        migrations.RunSQL(
+            sql="""
+                DO $$
+                BEGIN
+                    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+                        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+                        CREATE INDEX IF NOT EXISTS api_item_name_trgm_idx ON api_item USING gin (name gin_trgm_ops);
+                    ELSE
+                        RAISE NOTICE 'pg_trgm is not available; item search runs without trigrams';
+                    END IF;
+                EXCEPTION WHEN insufficient_privilege THEN
+                    RAISE NOTICE 'Not allowed to create pg_trgm; item search runs without trigrams';
+                END
+                $$
+            """,
+            reverse_sql='DROP INDEX IF EXISTS api_item_name_trgm_idx',
+        ),
+    ]
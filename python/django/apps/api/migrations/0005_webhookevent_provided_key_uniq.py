@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_webhookevent_api_webhook_received_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='webhookevent',
+            name='key_provided',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddConstraint(
+            model_name='webhookevent',
+            constraint=models.UniqueConstraint(condition=models.Q(('key_provided', True)), fields=('idempotency_key',), name='api_webhook_provided_key_uniq'),
+        ),
+        migrations.AlterField(
+            model_name='webhookevent',
+            name='idempotency_key',
+            field=models.CharField(max_length=64),
+        ),
+    ]
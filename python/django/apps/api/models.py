@@ -0,0 +1,79 @@
+"""
+API models for Django Docker Template.
+"""
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+
+SEARCH_CONFIG = 'english'
+
+
+class Item(models.Model):
+    """Sample item exposed through the CRUD endpoints."""
+
+    class Status(models.TextChoices):
+        ACTIVE = 'active', 'Active'
+        INACTIVE = 'inactive', 'Inactive'
+        PENDING = 'pending', 'Pending'
+
+    name = models.CharField(max_length=255)
+    description = models.TextField(blank=True, default='')
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.ACTIVE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by PostgreSQL on every insert/update, including bulk_create and COPY.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector('name', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        # Composite indexes back the keyset pagination seeks in ItemCursorPagination.
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='api_item_created_id_idx'),
+            models.Index(fields=['name', 'id'], name='api_item_name_id_idx'),
+            GinIndex(fields=['search_vector'], name='api_item_search_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class WebhookEvent(models.Model):
+    """Raw webhook delivery, stored as received and processed by a Celery task."""
+
+    class Status(models.TextChoices):
+        RECEIVED = 'received', 'Received'
+        PROCESSED = 'processed', 'Processed'
+        FAILED = 'failed', 'Failed'
+
+    # SHA-256 of the Idempotency-Key header, or of the body when there is none
+    # (key_provided False). Only provider keys are unique: a repeated body is
+    # a duplicate only within WEBHOOK_IDEMPOTENCY_TTL, which the cache enforces.
+    idempotency_key = models.CharField(max_length=64)
+    key_provided = models.BooleanField(default=True)
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    payload = models.TextField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.RECEIVED)
+    error = models.TextField(blank=True, default='')
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Keyset order for the retention cleanup (apps.api.cleanup).
+        indexes = [
+            models.Index(fields=['received_at', 'id'], name='api_webhook_received_id_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['idempotency_key'], condition=models.Q(key_provided=True),
+                name='api_webhook_provided_key_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f'Webhook {self.pk} ({self.status})'
@@ -0,0 +1,122 @@
+"""
+Pagination classes for the API app.
+"""
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+def get_page_size(request, default, maximum, query_param='per_page'):
+    """Read the requested page size, clamped to ``1..maximum``."""
+    try:
+        size = int(request.query_params.get(query_param, default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, maximum))
+
+
+class ItemPagination(PageNumberPagination):
+    """Custom pagination for items."""
+    page_size = 15
+    page_size_query_param = 'per_page'
+    max_page_size = 100
+
+    def get_paginated_response(self, data):
+        paginator = self.page.paginator
+        return Response({
+            'status': 'success',
+            'data': data,
+            'meta': {
+                'current_page': self.page.number,
+                'per_page': paginator.per_page,
+                'total': paginator.count,
+                'last_page': paginator.num_pages,
+            },
+        })
+
+
+class ItemCursorPagination(BasePagination):
+    """
+    Keyset pagination for items.
+
+    Pages are addressed by an opaque cursor holding the last row's
+    ``(sort value, id)`` pair, so every page is a seek on the matching
+    composite index instead of an OFFSET scan.
+    """
+    page_size = ItemPagination.page_size
+    page_size_query_param = ItemPagination.page_size_query_param
+    max_page_size = ItemPagination.max_page_size
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, sort_field='created_at', descending=True):
+        self.sort_field = sort_field
+        self.descending = descending
+        self.next_cursor = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.per_page = get_page_size(
+            request, self.page_size, self.max_page_size, self.page_size_query_param
+        )
+        prefix = '-' if self.descending else ''
+        queryset = queryset.order_by(f'{prefix}{self.sort_field}', f'{prefix}id')
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded:
+            value, pk = self.decode_cursor(encoded)
+            queryset = queryset.filter(self.seek_filter(value, pk))
+
+        rows = list(queryset[:self.per_page + 1])
+        page, has_more = rows[:self.per_page], len(rows) > self.per_page
+        if has_more:
+            self.next_cursor = self.encode_cursor(page[-1])
+        return page
+
+    def seek_filter(self, value, pk):
+        """Build the ``(sort_field, id) < / > (value, pk)`` predicate."""
+        op = 'lt' if self.descending else 'gt'
+        field = self.sort_field
+        # The redundant inclusive bound lets the planner range-scan the index.
+        return Q(**{f'{field}__{op}e': value}) & (
+            Q(**{f'{field}__{op}': value}) | Q(**{field: value, f'id__{op}': pk})
+        )
+
+    def encode_cursor(self, item):
+        value = getattr(item, self.sort_field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = json.dumps([self.sort_field, self.descending, value, item.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, encoded):
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            field, descending, value, pk = json.loads(base64.urlsafe_b64decode(padded))
+        except (TypeError, ValueError, binascii.Error) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+        # A cursor is only valid for the ordering it was issued under.
+        if field != self.sort_field or descending != self.descending or not isinstance(pk, int):
+            raise NotFound(self.invalid_cursor_message)
+        if field == 'created_at':
+            value = parse_datetime(value) if isinstance(value, str) else None
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+    def get_paginated_response(self, data):
+        return Response({
+            'status': 'success',
+            'data': data,
+            'meta': {
+                'per_page': self.per_page,
+                'next_cursor': self.next_cursor,
+                'has_more': self.next_cursor is not None,
+            },
+        })
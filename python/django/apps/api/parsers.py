@@ -0,0 +1,51 @@
+"""
+Request parsers for the API app.
+"""
+import json
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from .bulk import MalformedRow
+
+
+class ORJSONParser(BaseParser):
+    """Parses a UTF-8 JSON body with orjson."""
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}') from exc
+
+
+# JSON parser for views that list their parsers explicitly.
+JSONBodyParser = ORJSONParser if settings.API_FAST_JSON else JSONParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parses newline-delimited JSON into a list of objects.
+
+    The body is read line by line rather than decoded as one document.
+    Lines that are not valid JSON become ``MalformedRow`` entries so the
+    caller can report them per row.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        rows = []
+        for line in stream or ():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(json.loads(line.decode(encoding)))
+            except (UnicodeDecodeError, ValueError) as exc:
+                rows.append(MalformedRow(f'Invalid JSON: {exc}'))
+        return rows
@@ -0,0 +1,62 @@
+"""
+Item search backed by PostgreSQL full-text search and pg_trgm.
+"""
+import re
+from functools import cache
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import F, Q
+
+from .models import SEARCH_CONFIG
+
+TERM_RE = re.compile(r'\w+')
+
+
+@cache
+def trigram_available(using=DEFAULT_DB_ALIAS):
+    """Return True if the pg_trgm extension is installed on ``using``."""
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class ItemSearch:
+    """
+    Ranked item search.
+
+    Terms are matched as prefixes against the GIN-indexed ``search_vector``
+    column. When pg_trgm is installed, names that are word-similar to the
+    query (typos, partial words the stemmer would not produce) are OR-ed in
+    through the trigram index and added to the rank.
+    """
+    config = SEARCH_CONFIG
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+
+    def build_query(self, text):
+        """Turn free text into a prefix-matching tsquery, or None if it has no terms."""
+        terms = TERM_RE.findall(text)
+        if not terms:
+            return None
+        return SearchQuery(
+            ' & '.join(f'{term}:*' for term in terms), config=self.config, search_type='raw'
+        )
+
+    def search(self, queryset, text):
+        """Filter ``queryset`` to matches of ``text`` and annotate a ``rank``."""
+        query = self.build_query(text)
+        if query is None:
+            return queryset.none()
+
+        condition = Q(search_vector=query)
+        rank = SearchRank(F('search_vector'), query)
+        if trigram_available(self.using):
+            condition |= Q(name__trigram_word_similar=text)
+            rank = rank + TrigramWordSimilarity(text, 'name')
+        return queryset.filter(condition).annotate(rank=rank)
@@ -0,0 +1,15 @@
+"""
+API serializers for Django Docker Template.
+"""
+from rest_framework import serializers
+
+from .models import Item
+
+
+class ItemSerializer(serializers.ModelSerializer):
+    """Serializer for items."""
+
+    class Meta:
+        model = Item
+        fields = ['id', 'name', 'description', 'status', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
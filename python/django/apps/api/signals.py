@@ -0,0 +1,16 @@
+"""
+Signal handlers for the API application.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .conditional import bump_items_version
+from .models import Item
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def item_changed(sender, using, **kwargs):
+    """Invalidate item ETags once the change is visible to other connections."""
+    transaction.on_commit(bump_items_version, using=using)
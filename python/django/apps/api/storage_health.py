@@ -0,0 +1,118 @@
+"""
+Storage health probing.
+
+Writability of the storage roots is probed once when the probe starts and
+then periodically from a background thread. Health requests only read the
+latest probe result and call ``statvfs`` for free space and inodes, so a
+probe request never touches the filesystem's write path.
+"""
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class StorageProbe:
+    """Tracks writability and free space of the configured storage roots."""
+
+    def __init__(self, paths=None, interval=None, min_free_percent=None, min_free_inodes_percent=None):
+        self.paths = {
+            name: str(path)
+            for name, path in (settings.STORAGE_HEALTH_PATHS if paths is None else paths).items()
+        }
+        self.interval = settings.STORAGE_HEALTH_INTERVAL if interval is None else interval
+        self.min_free_percent = (
+            settings.STORAGE_HEALTH_MIN_FREE_PERCENT if min_free_percent is None else min_free_percent
+        )
+        self.min_free_inodes_percent = (
+            settings.STORAGE_HEALTH_MIN_FREE_INODES_PERCENT
+            if min_free_inodes_percent is None else min_free_inodes_percent
+        )
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.writable = {}
+        self.probed_at = None
+
+    def start(self):
+        """Probe once now and keep probing every ``interval`` seconds."""
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.probe_writable()
+            self.thread = threading.Thread(target=self.run, name='storage-probe', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.probe_writable()
+
+    def probe_writable(self):
+        """Create and remove a scratch file in every root (no fsync)."""
+        results = {}
+        for name, path in self.paths.items():
+            try:
+                fd, scratch = tempfile.mkstemp(dir=path, prefix='.health-')
+                os.close(fd)
+                os.unlink(scratch)
+                results[name] = None
+            except OSError as e:
+                logger.warning('Storage probe failed for %s (%s): %s', name, path, e)
+                results[name] = f'not writable: {e.strerror or e}'
+        self.writable = results
+        self.probed_at = datetime.now()
+
+    def check(self):
+        """Combine the latest writability probe with a live ``statvfs``."""
+        self.start()
+        paths = {}
+        problems = []
+        for name, path in self.paths.items():
+            info = {'writable': self.writable.get(name) is None}
+            if not info['writable']:
+                problems.append(f'{name} {self.writable[name]}')
+            try:
+                stats = os.statvfs(path)
+            except OSError as e:
+                problems.append(f'{name} statvfs failed: {e.strerror or e}')
+                paths[name] = info
+                continue
+
+            info['free_percent'] = round(100 * stats.f_bavail / stats.f_blocks, 2) if stats.f_blocks else None
+            # Some filesystems (btrfs, overlay on some hosts) report no inode counts.
+            info['free_inodes_percent'] = round(100 * stats.f_favail / stats.f_files, 2) if stats.f_files else None
+            if info['free_percent'] is not None and info['free_percent'] < self.min_free_percent:
+                problems.append(f"{name} has {info['free_percent']}% space free")
+            if (info['free_inodes_percent'] is not None
+                    and info['free_inodes_percent'] < self.min_free_inodes_percent):
+                problems.append(f"{name} has {info['free_inodes_percent']}% inodes free")
+            paths[name] = info
+
+        return {
+            'status': 'error' if problems else 'ok',
+            'message': '; '.join(problems) if problems else 'Storage is writable',
+            'paths': paths,
+            'probed_at': self.probed_at.isoformat() if self.probed_at else None,
+        }
+
+
+_probe = None
+_probe_lock = threading.Lock()
+
+
+def get_storage_probe():
+    """Return the per-process ``StorageProbe``."""
+    global _probe
+    if _probe is None:
+        with _probe_lock:
+            if _probe is None:
+                _probe = StorageProbe()
+    return _probe
@@ -0,0 +1,53 @@
+"""
+Celery tasks for the API application.
+"""
+import json
+import logging
+
+from celery import shared_task
+from django.utils import timezone
+
+from apps.core.resilience import RetryPolicy
+
+from .models import WebhookEvent
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_RETRY = RetryPolicy(base=30, cap=900, max_retries=3)
+
+
+@shared_task(bind=True, max_retries=WEBHOOK_RETRY.max_retries)
+def process_webhook_event(self, event_id):
+    """Process a stored webhook delivery."""
+    event = WebhookEvent.objects.filter(pk=event_id, status=WebhookEvent.Status.RECEIVED).first()
+    if event is None:
+        return 'Already processed'
+
+    try:
+        payload = json.loads(event.payload)
+    except ValueError as e:
+        event.status = WebhookEvent.Status.FAILED
+        event.error = f'Invalid JSON: {e}'
+        event.save(update_fields=['status', 'error'])
+        return event.error
+
+    try:
+        handle_webhook(payload)
+    except Exception as exc:
+        logger.error(f'Webhook event {event_id} failed: {exc}')
+        if self.request.retries >= self.max_retries:
+            event.status = WebhookEvent.Status.FAILED
+            event.error = str(exc)
+            event.save(update_fields=['status', 'error'])
+            raise
+        raise self.retry(exc=exc, countdown=WEBHOOK_RETRY.countdown(self.request.retries)) from exc
+
+    event.status = WebhookEvent.Status.PROCESSED
+    event.processed_at = timezone.now()
+    event.save(update_fields=['status', 'processed_at'])
+    return f'Webhook event {event_id} processed'
+
+
+def handle_webhook(payload):
+    """Application-specific handling of a webhook payload."""
+    logger.info('Webhook received', extra={'data': payload})
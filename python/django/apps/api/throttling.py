@@ -0,0 +1,166 @@
+"""
+Rate limiting in Redis.
+
+DRF's throttles keep each client's request history as a list in the cache.
+Every check reads the list, trims it in Python and writes it back: two
+round trips, a race between workers, and a list as long as the rate.
+These throttles instead run one Lua script per check. It approximates a
+sliding window from two fixed-window counters, weighting the previous
+window by how much of it still overlaps the sliding one. The state is one
+small hash per client and scope, and the check is atomic in one round trip.
+
+The script needs the default cache to be django-redis; with other backends
+(development, tests) the throttles behave like DRF's. If Redis fails, the
+request is allowed.
+
+DRF only throttles its own views; ``throttled`` applies the default
+throttles to plain async views such as the health check and webhooks.
+"""
+import logging
+import math
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions, throttling
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .renderers import json_response
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: the client's hash (window, current, previous), named by DRF's cache key
+# ARGV[1]: allowed requests per period, ARGV[2]: period in seconds
+# Returns {1, ''} when allowed, {0, seconds to wait} when throttled.
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local window = math.floor(now / period)
+local elapsed = now - window * period
+
+local state = redis.call('HMGET', KEYS[1], 'window', 'current', 'previous')
+local stored = tonumber(state[1])
+local current = tonumber(state[2]) or 0
+local previous = tonumber(state[3]) or 0
+if stored ~= window then
+    if stored == window - 1 then previous = current else previous = 0 end
+    current = 0
+end
+
+if previous * (period - elapsed) / period + current + 1 <= limit then
+    redis.call('HSET', KEYS[1], 'window', window, 'current', current + 1, 'previous', previous)
+    redis.call('EXPIRE', KEYS[1], 2 * period)
+    return {1, ''}
+end
+
+-- Throttled: wait until the previous window's weight has dropped enough.
+-- If this window alone is full, that happens in the next window, where
+-- this window's count becomes the previous one.
+local wait
+if current + 1 > limit then
+    wait = period - elapsed + period * (1 - (limit - 1) / current)
+else
+    wait = period * (1 - (limit - current - 1) / previous) - elapsed
+end
+return {0, tostring(wait)}
+"""
+
+
+class RedisRateLimiter:
+    """Sliding-window counters checked by one Lua script call."""
+
+    def __init__(self, client):
+        self.client = client
+        # EVALSHA, falling back to EVAL once if Redis has not seen the script.
+        self.script = client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def hit(self, key, limit, period):
+        """Count a request for ``key``; returns ``(allowed, seconds to wait)``."""
+        allowed, wait = self.script(keys=[key], args=[limit, period])
+        return bool(allowed), (max(0.0, float(wait)) if wait else None)
+
+
+_limiter = None
+
+
+def get_rate_limiter():
+    """Return the Redis limiter if the default cache is django-redis, else None."""
+    global _limiter
+    if _limiter is None:
+        try:
+            from django_redis import get_redis_connection
+            _limiter = RedisRateLimiter(get_redis_connection('default'))
+        except (ImportError, NotImplementedError):
+            _limiter = False
+    return _limiter or None
+
+
+class RedisRateThrottle(throttling.SimpleRateThrottle):
+    """``SimpleRateThrottle`` that checks the rate with ``RedisRateLimiter``."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return super().allow_request(request, view)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        try:
+            allowed, self.retry_after = limiter.hit(self.key, self.num_requests, self.duration)
+        except Exception:
+            logger.warning('Rate limit check failed; allowing the request', exc_info=True)
+            return True
+        return allowed
+
+    def wait(self):
+        if get_rate_limiter() is None:
+            return super().wait()
+        return self.retry_after
+
+
+class AnonRateThrottle(RedisRateThrottle, throttling.AnonRateThrottle):
+    """Limits anonymous clients by IP address (``anon`` rate)."""
+
+
+class UserRateThrottle(RedisRateThrottle, throttling.UserRateThrottle):
+    """Limits authenticated users by id, anonymous clients by IP (``user`` rate)."""
+
+
+def check_throttles(request):
+    """
+    Run the default throttle classes on a Django ``request``, like
+    ``APIView.check_throttles``; returns ``(allowed, seconds to wait)``.
+    """
+    drf_request = Request(request)
+    if hasattr(request, 'user'):
+        # The session user, not DRF authentication, which would enforce CSRF.
+        drf_request.user = request.user
+    waits = [
+        throttle.wait()
+        for throttle in (throttle_class() for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES)
+        if not throttle.allow_request(drf_request, None)
+    ]
+    if not waits:
+        return True, None
+    return False, max((wait for wait in waits if wait is not None), default=None)
+
+
+def throttled(view):
+    """Apply the default throttles to an async view; throttled requests get 429."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # The session lookup and Redis call block, so they run in a thread.
+        allowed, wait = await sync_to_async(check_throttles)(request)
+        if not allowed:
+            exc = exceptions.Throttled(wait)
+            response = json_response({'detail': exc.detail}, status=exc.status_code)
+            if wait is not None:
+                response['Retry-After'] = str(math.ceil(wait))
+            return response
+        return await view(request, *args, **kwargs)
+    return wrapper
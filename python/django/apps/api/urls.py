@@ -15,6 +15,8 @@ urlpatterns = [
     # Sample CRUD endpoints
     path('items/', views.api_items, name='items'),
     path('items/create/', views.api_create_item, name='create_item'),
+    path('items/bulk/', views.api_bulk_create_items, name='bulk_create_items'),
+    path('items/export/', views.api_export_items, name='export_items'),
     
     # Sample webhook endpoint
     path('webhook/', views.api_webhook, name='webhook'),
@@ -1,51 +1,85 @@
 """
 API views for Django Docker Template.
+
+Only ``api_health`` and ``api_webhook`` are async: they wait on a snapshot
+or on Redis and Postgres round trips, and can do so on the event loop. The
+DRF views stay sync on purpose. DRF has no async views, and their ORM work
+would go through ``sync_to_async`` anyway, which is exactly how Django runs
+a sync view under ASGI. Wrapping them by hand would add a thread hop and
+lose DRF's parsing, rendering and throttling.
 """
-import time
 import psutil
 import shutil
-from datetime import datetime, timedelta
-from django.http import JsonResponse
-from django.core.cache import cache
-from django.db import connection
+import time
+from datetime import datetime
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
 from django.conf import settings
-from rest_framework.decorators import api_view, permission_classes
+from django.contrib.auth import get_user_model
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+from rest_framework.decorators import api_view, parser_classes, permission_classes, renderer_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.pagination import PageNumberPagination
+
+from apps.core.caching import get_or_recompute
+from apps.core.db_router import fresh_reads
+from apps.core.metrics import get_metrics_store
+
+from .bulk import insert_items, validate_item, validate_items
+from .conditional import items_version, make_etag, not_modified, set_validators
+from .export import STREAMERS, aiter_chunks
+from .health import get_health_monitor
+from .models import Item
+from .pagination import ItemCursorPagination, ItemPagination
+from .parsers import JSONBodyParser, NDJSONParser
+from .renderers import CSVRenderer, NDJSONRenderer, json_response
+from .search import ItemSearch
+from .serializers import ItemSerializer
+from .throttling import throttled
+from .webhooks import claim_delivery, idempotency_key, release_delivery, store_event
+
+API_VERSION = '1.0.0'
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def api_status(request):
     """API status endpoint."""
-    return Response({
+    environment = settings.DEBUG and 'development' or 'production'
+    # Only the timestamp changes between calls, so the ETag is weak.
+    etag = make_etag(API_VERSION, environment, weak=True)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    return set_validators(Response({
         'status': 'success',
         'message': 'Django API is running!',
-        'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0',
-        'environment': settings.DEBUG and 'development' or 'production',
+        'timestamp': datetime.now(),
+        'version': API_VERSION,
+        'environment': environment,
         'uptime': get_uptime(),
-    })
+    }), etag)
 
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def api_health(request):
+@require_safe
+@throttled
+async def api_health(request):
     """Health check endpoint for monitoring."""
-    checks = {
-        'database': check_database(),
-        'cache': check_cache(),
-        'storage': check_storage(),
-    }
+    # Checks run in the monitor's own pool; this only waits for the snapshot.
+    snapshot = await sync_to_async(get_health_monitor().get_snapshot, thread_sensitive=False)()
+    checks = snapshot['checks']
 
     is_healthy = all(check['status'] == 'ok' for check in checks.values())
 
-    return Response({
+    return json_response({
         'status': 'healthy' if is_healthy else 'unhealthy',
         'checks': checks,
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': snapshot['timestamp'],
+        'cached': snapshot['cached'],
+        'age': snapshot['age'],
     }, status=status.HTTP_200_OK if is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE)
 
 
@@ -53,85 +87,106 @@ def api_health(request):
 @permission_classes([AllowAny])
 def api_stats(request):
     """Get application statistics."""
-    stats = cache.get('app.stats')
-    if not stats:
-        stats = {
-            'users_count': 1250,
-            'active_users': 340,
-            'total_requests': 45678,
-            'avg_response_time': '120ms',
-            'error_rate': '0.1%',
-            'uptime_percentage': '99.9%',
-            'last_deployment': (datetime.now() - timedelta(days=3)).isoformat(),
-            'memory_usage': get_memory_usage(),
-            'disk_usage': get_disk_usage(),
-        }
-        cache.set('app.stats', stats, 300)  # Cache for 5 minutes
-
-    return Response({
+    stats, computed_at = get_or_recompute(
+        'app.stats', compute_stats,
+        ttl=settings.STATS_CACHE_TTL, beta=settings.STATS_EARLY_REFRESH_BETA,
+    )
+    # The body is fully determined by the cached entry, so the ETag is strong.
+    etag = make_etag('stats', computed_at)
+    response = not_modified(request, etag, computed_at)
+    if response is not None:
+        return response
+
+    return set_validators(Response({
         'status': 'success',
         'data': stats,
-        'cached_at': cache.get('app.stats.timestamp', datetime.now().isoformat()),
-    })
-
-
-class ItemPagination(PageNumberPagination):
-    """Custom pagination for items."""
-    page_size = 15
-    page_size_query_param = 'per_page'
-    max_page_size = 100
+        'cached_at': datetime.fromtimestamp(computed_at),
+    }), etag, computed_at)
+
+
+def compute_stats():
+    """Build application statistics from the request counters."""
+    metrics = get_metrics_store().read(time.time())
+    window = metrics['window']
+    window_requests = window['requests']
+
+    return {
+        'users_count': get_user_model().objects.count(),
+        'active_users': metrics['active_users'],
+        'total_requests': metrics['total_requests'],
+        'total_errors': metrics['total_errors'],
+        'window_minutes': settings.STATS_WINDOW_MINUTES,
+        'window_requests': window_requests,
+        'avg_response_time': f"{window['latency_ms'] / window_requests:.0f}ms" if window_requests else 'N/A',
+        'error_rate': f"{100 * window['errors'] / window_requests:.2f}%" if window_requests else 'N/A',
+        'memory_usage': get_memory_usage(),
+        'disk_usage': get_disk_usage(),
+    }
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def api_items(request):
-    """Sample CRUD endpoint - Get all items."""
-    # Sample data
-    items = [
-        {'id': 1, 'name': 'Django Application', 'status': 'active', 'created_at': datetime.now() - timedelta(days=10)},
-        {'id': 2, 'name': 'Docker Container', 'status': 'running', 'created_at': datetime.now() - timedelta(days=5)},
-        {'id': 3, 'name': 'PostgreSQL Database', 'status': 'connected', 'created_at': datetime.now() - timedelta(days=3)},
-        {'id': 4, 'name': 'Redis Cache', 'status': 'active', 'created_at': datetime.now() - timedelta(days=1)},
-        {'id': 5, 'name': 'API Endpoints', 'status': 'operational', 'created_at': datetime.now()},
-    ]
+    """List items with search, sorting and page or cursor pagination."""
+    # Checked before any query: a current client costs one cache read.
+    version = items_version()
+    etag = make_etag(version, request.get_full_path(), weak=True)
+    response = not_modified(request, etag, version)
+    if response is not None:
+        return response
+
+    items = Item.objects.all()
 
     # Apply search filter
     search = request.GET.get('search')
     if search:
-        items = [item for item in items if search.lower() in item['name'].lower()]
+        items = ItemSearch().search(items, search)
 
     # Apply sorting
     sort_field = request.GET.get('sort', 'created_at')
-    order = request.GET.get('order', 'desc')
-    reverse = order == 'desc'
-    
-    if sort_field in ['name', 'created_at']:
-        items.sort(key=lambda x: x[sort_field], reverse=reverse)
-
-    # Pagination
-    page = int(request.GET.get('page', 1))
-    per_page = int(request.GET.get('per_page', 15))
-    
-    total = len(items)
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_items = items[start:end]
-
-    # Convert datetime objects to ISO format
-    for item in paginated_items:
-        if isinstance(item['created_at'], datetime):
-            item['created_at'] = item['created_at'].isoformat()
+    if sort_field not in ['name', 'created_at'] and not (search and sort_field == 'relevance'):
+        sort_field = 'created_at'
+    descending = request.GET.get('order', 'desc') == 'desc'
+
+    # Pagination: ``?cursor=`` (empty for the first page) switches to keyset mode.
+    # Relevance is computed per query and has no index to seek on, so it is paged.
+    if ItemCursorPagination.cursor_query_param in request.GET and sort_field != 'relevance':
+        paginator = ItemCursorPagination(sort_field, descending)
+    else:
+        paginator = ItemPagination()
+        prefix = '-' if descending else ''
+        order_field = 'rank' if sort_field == 'relevance' else sort_field
+        items = items.order_by(f'{prefix}{order_field}', f'{prefix}id')
+
+    # The ETag version is bumped when the primary commits: only a replica
+    # that had replayed that commit may answer under it.
+    with fresh_reads(version):
+        page = paginator.paginate_queryset(items, request)
+        response = paginator.get_paginated_response(ItemSerializer(page, many=True).data)
+    return set_validators(response, etag, version)
 
-    return Response({
-        'status': 'success',
-        'data': paginated_items,
-        'meta': {
-            'current_page': page,
-            'per_page': per_page,
-            'total': total,
-            'last_page': (total + per_page - 1) // per_page,
-        },
-    })
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+@renderer_classes([NDJSONRenderer, CSVRenderer])
+def api_export_items(request):
+    """Stream every item as NDJSON (default) or CSV (``?format=csv``)."""
+    items = Item.objects.all()
+
+    search = request.GET.get('search')
+    if search:
+        items = ItemSearch().search(items, search)
+    if request.GET.get('status'):
+        items = items.filter(status=request.GET['status'])
+
+    export_format = request.accepted_renderer.format
+    stream = STREAMERS[export_format](items, settings.ITEMS_EXPORT_CHUNK_SIZE)
+    # Only ASGI requests carry a scope; the ASGI handler wants an async iterator.
+    if getattr(request, 'scope', None) is not None:
+        stream = aiter_chunks(stream)
+    response = StreamingHttpResponse(stream, content_type=request.accepted_renderer.media_type)
+    response['Content-Disposition'] = f'attachment; filename="items.{export_format}"'
+    return response
 
 
 @api_view(['POST'])
@@ -141,94 +196,106 @@ def api_create_item(request):
     data = request.data
 
     # Validation
-    if not data.get('name'):
+    errors = validate_item(data)
+    if errors:
         return Response({
             'status': 'error',
             'message': 'Validation failed',
-            'errors': {'name': ['This field is required.']},
-        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
-
-    if not data.get('status') or data.get('status') not in ['active', 'inactive', 'pending']:
-        return Response({
-            'status': 'error',
-            'message': 'Validation failed',
-            'errors': {'status': ['This field is required and must be one of: active, inactive, pending.']},
+            'errors': errors,
         }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
 
     # Create item
-    item = {
-        'id': int(time.time() * 1000) % 10000,  # Simple ID generation
-        'name': data.get('name'),
-        'description': data.get('description'),
-        'status': data.get('status'),
-        'created_at': datetime.now().isoformat(),
-        'updated_at': datetime.now().isoformat(),
-    }
+    item = Item.objects.create(
+        name=data.get('name'),
+        description=data.get('description') or '',
+        status=data.get('status'),
+    )
 
     return Response({
         'status': 'success',
         'message': 'Item created successfully',
-        'data': item,
+        'data': ItemSerializer(item).data,
     }, status=status.HTTP_201_CREATED)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
-def api_webhook(request):
-    """Sample webhook endpoint."""
-    import logging
-    logger = logging.getLogger(__name__)
-    
-    # Log the webhook payload
-    logger.info('Webhook received', extra={'data': request.data})
-
-    return Response({
-        'status': 'success',
-        'message': 'Webhook received',
-        'received_at': datetime.now().isoformat(),
-    })
-
+@parser_classes([JSONBodyParser, NDJSONParser])
+def api_bulk_create_items(request):
+    """Create many items from a JSON array or an NDJSON stream."""
+    rows = request.data
+    if not isinstance(rows, list):
+        return Response({
+            'status': 'error',
+            'message': 'Expected a JSON array or NDJSON body',
+        }, status=status.HTTP_400_BAD_REQUEST)
 
-def check_database():
-    """Check database connectivity."""
     try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-        return {'status': 'ok', 'message': 'Database connection successful'}
-    except Exception as e:
-        return {'status': 'error', 'message': f'Database connection failed: {str(e)}'}
+        batch_size = int(request.GET.get('batch_size', settings.ITEMS_BULK_BATCH_SIZE))
+    except ValueError:
+        batch_size = settings.ITEMS_BULK_BATCH_SIZE
+    batch_size = max(1, min(batch_size, settings.ITEMS_BULK_MAX_BATCH_SIZE))
 
+    # Invalid rows are reported and skipped; the valid ones are still inserted.
+    valid, errors = validate_items(rows)
+    created = insert_items(valid, batch_size=batch_size) if valid else 0
 
-def check_cache():
-    """Check cache connectivity."""
-    try:
-        cache.set('health_check', 'ok', 10)
-        value = cache.get('health_check')
-        return {'status': 'ok' if value == 'ok' else 'error', 
-                'message': 'Cache is working' if value == 'ok' else 'Cache read/write failed'}
-    except Exception as e:
-        return {'status': 'error', 'message': f'Cache error: {str(e)}'}
+    return Response({
+        'status': 'success' if not errors else 'partial' if created else 'error',
+        'message': f'{created} items created, {len(errors)} rejected',
+        'created': created,
+        'failed': len(errors),
+        'errors': errors,
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+
+@csrf_exempt
+@require_POST
+@throttled
+async def api_webhook(request):
+    """
+    Accept a webhook delivery and process it asynchronously.
+
+    The raw body is stored without parsing and handed to a Celery task, so
+    the provider gets 202 as soon as the row is written. Repeated deliveries
+    (same ``Idempotency-Key``, or same body within ``WEBHOOK_IDEMPOTENCY_TTL``
+    when the header is absent) are acknowledged with 200 and not processed
+    again.
+    """
+    if request.content_type != 'application/json':
+        return json_response({
+            'status': 'error',
+            'message': 'Webhook payloads must be application/json',
+        }, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
 
+    key, provided = idempotency_key(request)
+    duplicate = {
+        'status': 'success',
+        'message': 'Duplicate delivery ignored',
+        'received': True,
+        'duplicate': True,
+    }
+    if not await claim_delivery(key):
+        return json_response(duplicate)
 
-def check_storage():
-    """Check storage accessibility."""
     try:
-        import tempfile
-        import os
-        
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-            f.write('test')
-            temp_file = f.name
-        
-        with open(temp_file, 'r') as f:
-            content = f.read()
-        
-        os.unlink(temp_file)
-        
-        return {'status': 'ok' if content == 'test' else 'error',
-                'message': 'Storage is writable' if content == 'test' else 'Storage read/write failed'}
-    except Exception as e:
-        return {'status': 'error', 'message': f'Storage error: {str(e)}'}
+        event, created = await store_event(
+            key, provided, request.content_type, request.body.decode('utf-8', errors='replace'),
+        )
+    except Exception:
+        await release_delivery(key)
+        raise
+    if not created:
+        return json_response(duplicate)
+
+    return json_response({
+        'status': 'success',
+        'message': 'Webhook accepted',
+        'received': True,
+        'duplicate': False,
+        'event_id': event.pk,
+        'received_at': event.received_at,
+    }, status=status.HTTP_202_ACCEPTED)
 
 
 def get_uptime():
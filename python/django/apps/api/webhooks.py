@@ -0,0 +1,88 @@
+"""
+Webhook ingestion helpers.
+
+Deliveries are deduplicated on an idempotency key before anything is
+written: the key is claimed with ``cache.add`` (SET NX with a TTL on
+django-redis), so provider retries within the TTL cost one Redis round
+trip. Keys sent by the provider are also unique in ``WebhookEvent``, which
+catches duplicates that arrive after the Redis key has expired or been
+evicted. A body hash is only a key within the TTL: the same payload sent
+later is a new delivery.
+"""
+import hashlib
+import logging
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def idempotency_key(request):
+    """
+    Hash of the ``Idempotency-Key`` header, falling back to the raw body;
+    returns ``(key, provided)``, ``provided`` False for the body hash.
+    """
+    provided = request.headers.get(IDEMPOTENCY_HEADER)
+    source = provided.encode() if provided else request.body
+    return hashlib.sha256(source).hexdigest(), bool(provided)
+
+
+def cache_key(key):
+    return f'webhook:idempotency:{key}'
+
+
+async def claim_delivery(key):
+    """Return True if this is the first delivery of ``key`` within the TTL."""
+    return await cache.aadd(cache_key(key), 1, settings.WEBHOOK_IDEMPOTENCY_TTL)
+
+
+async def release_delivery(key):
+    """Forget ``key`` so the provider's retry is accepted."""
+    await cache.adelete(cache_key(key))
+
+
+async def store_event(key, provided, content_type, payload):
+    """
+    Insert the delivery and queue it for processing.
+
+    Returns ``(event, created)``; ``created`` is False when the provider's
+    key is already stored. ``aget_or_create`` inserts in a savepoint and
+    retries the lookup on ``IntegrityError``, so a concurrent duplicate
+    neither raises nor breaks an enclosing transaction.
+    """
+    from .models import WebhookEvent
+
+    fields = {'content_type': content_type, 'payload': payload}
+    if provided:
+        event, created = await WebhookEvent.objects.aget_or_create(
+            idempotency_key=key, key_provided=True, defaults=fields,
+        )
+    else:
+        event = await WebhookEvent.objects.acreate(idempotency_key=key, key_provided=False, **fields)
+        created = True
+    if created:
+        # Same thread as the ORM, so on_commit sees the insert's connection;
+        # the broker publish blocks, so it stays off the event loop.
+        await sync_to_async(enqueue)(event)
+    return event, created
+
+
+def enqueue(event):
+    """Queue ``event`` for processing once the surrounding transaction commits."""
+    from .tasks import process_webhook_event
+
+    transaction.on_commit(partial(send, process_webhook_event, event.pk))
+
+
+def send(task, event_id):
+    try:
+        task.delay(event_id)
+    except Exception:
+        # The event stays 'received' and can be requeued; the delivery is not lost.
+        logger.exception('Failed to queue webhook event %s', event_id)
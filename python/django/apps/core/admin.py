@@ -0,0 +1,14 @@
+"""
+Core admin configuration.
+"""
+from django.contrib import admin
+
+from .models import CleanupState
+
+
+@admin.register(CleanupState)
+class CleanupStateAdmin(admin.ModelAdmin):
+    """Read-only view of cleanup progress."""
+    list_display = ['target', 'deleted', 'passes', 'cursor', 'updated_at']
+    readonly_fields = ['target', 'cursor', 'deleted', 'passes', 'updated_at']
+    ordering = ['target']
@@ -2,10 +2,21 @@
 Core app configuration.
 """
 from django.apps import AppConfig
+from django.contrib.staticfiles.apps import StaticFilesConfig as BaseStaticFilesConfig
 
 
 class CoreConfig(AppConfig):
     """Core app configuration."""
+    # Chosen for 'apps.core' over the other configs in this module.
+    default = True
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
-    verbose_name = 'Core' 
\ No newline at end of file
+    verbose_name = 'Core' 
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+
+class StaticFilesConfig(BaseStaticFilesConfig):
+    """Staticfiles without the Tailwind source; only its build output is served."""
+    ignore_patterns = [*BaseStaticFilesConfig.ignore_patterns, 'css/input.css']
@@ -0,0 +1,274 @@
+"""
+Two-tier cache backend.
+
+``TwoTierRedisCache`` is django-redis with a bounded, TTL-aware LRU in each
+process for a configured set of hot keys (``LOCAL_KEYS``, fnmatch
+patterns). Reads of those keys are served from process memory; writes go
+to Redis and are announced on a pub/sub channel so every other process
+drops its local copy. Everything else behaves exactly like django-redis.
+
+Keys that are compared or counted (locks, idempotency keys, counters) must
+not be listed: a local copy may lag Redis for up to the pub/sub delivery
+time, and ``LOCAL_TIMEOUT`` bounds the lag if a message is ever lost.
+
+    CACHES = {'default': {
+        'BACKEND': 'apps.core.cache_backends.TwoTierRedisCache',
+        'LOCATION': 'redis://redis:6379/0',
+        'OPTIONS': {
+            'LOCAL_KEYS': ['app.stats', 'api.items.version'],
+            'LOCAL_MAX_ENTRIES': 1000,
+            'LOCAL_TIMEOUT': 30,
+        },
+    }}
+"""
+import fnmatch
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+CACHE_REQUESTS = Counter(
+    'django_cache_requests_total',
+    'Cache reads by tier and result.',
+    ['tier', 'result'],
+)
+LOCAL_HIT = CACHE_REQUESTS.labels('local', 'hit')
+LOCAL_MISS = CACHE_REQUESTS.labels('local', 'miss')
+REDIS_HIT = CACHE_REQUESTS.labels('redis', 'hit')
+REDIS_MISS = CACHE_REQUESTS.labels('redis', 'miss')
+
+CLEAR_ALL = '*'
+_missing = object()
+
+
+class LocalTier:
+    """Thread-safe LRU of raw Redis values with per-entry expiry."""
+
+    def __init__(self, max_entries, timeout):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Bumped on every invalidation so a read that raced one is not stored.
+        self.generation = 0
+
+    def get(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, raw = entry
+            if expires_at <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return raw
+
+    def set(self, key, raw, ttl, generation, now=None):
+        """Store ``raw`` unless an invalidation arrived since ``generation``."""
+        now = time.monotonic() if now is None else now
+        timeout = self.timeout if ttl is None else min(self.timeout, ttl)
+        if timeout <= 0:
+            return
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = (now + timeout, raw)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self.lock:
+            self.generation += 1
+            if key == CLEAR_ALL:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+
+class TwoTierRedisCache(RedisCache):
+    """django-redis with a per-process LRU for hot keys and pub/sub invalidation."""
+
+    def __init__(self, server, params):
+        options = dict(params.get('OPTIONS', {}))
+        self.local_patterns = tuple(options.pop('LOCAL_KEYS', ()))
+        self.local = LocalTier(options.pop('LOCAL_MAX_ENTRIES', 1000), options.pop('LOCAL_TIMEOUT', 30))
+        self.channel = options.pop('INVALIDATION_CHANNEL', 'cache:invalidate')
+        super().__init__(server, {**params, 'OPTIONS': options})
+        self.origin = uuid.uuid4().hex
+        self.subscribed = threading.Event()
+        self.subscriber = None
+        self.subscriber_pid = None
+        self.subscriber_lock = threading.Lock()
+
+    def is_local(self, key):
+        return any(fnmatch.fnmatchcase(key, pattern) for pattern in self.local_patterns)
+
+    # Reads
+
+    def get(self, key, default=None, version=None, client=None):
+        if client is None and self.is_local(key) and self.ensure_subscribed():
+            return self.get_two_tier(key, default, version)
+        value = super().get(key, _missing, version, client)
+        if value is _missing:
+            REDIS_MISS.inc()
+            return default
+        REDIS_HIT.inc()
+        return value
+
+    def get_two_tier(self, key, default, version):
+        redis_key = self.client.make_key(key, version=version)
+        raw = self.local.get(redis_key)
+        if raw is not None:
+            LOCAL_HIT.inc()
+            return self.client.decode(raw)
+        LOCAL_MISS.inc()
+
+        generation = self.local.generation
+        try:
+            pipe = self.client.get_client(write=False).pipeline(transaction=False)
+            pipe.get(redis_key)
+            pipe.pttl(redis_key)
+            raw, pttl = pipe.execute()
+        except Exception:
+            # Let django-redis apply IGNORE_EXCEPTIONS and its logging.
+            return super().get(key, default, version)
+        if raw is None:
+            REDIS_MISS.inc()
+            return default
+        REDIS_HIT.inc()
+        self.local.set(redis_key, raw, pttl / 1000 if pttl > 0 else None, generation)
+        return self.client.decode(raw)
+
+    # Writes: run against Redis, then invalidate every process's local copy.
+    # The parameters are the parent methods', so a version passed by position
+    # invalidates the key that was written.
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().set(key, value, timeout, version, **kwargs)
+        self.invalidate(key, version)
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().add(key, value, timeout, version, **kwargs)
+        if result:
+            self.invalidate(key, version)
+        return result
+
+    def delete(self, key, version=None, **kwargs):
+        result = super().delete(key, version, **kwargs)
+        self.invalidate(key, version)
+        return result
+
+    def incr(self, key, delta=1, version=None, **kwargs):
+        result = super().incr(key, delta, version, **kwargs)
+        self.invalidate(key, version)
+        return result
+
+    def decr(self, key, delta=1, version=None, **kwargs):
+        result = super().decr(key, delta, version, **kwargs)
+        self.invalidate(key, version)
+        return result
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().touch(key, timeout, version, **kwargs)
+        self.invalidate(key, version)
+        return result
+
+    def expire(self, key, timeout, version=None, **kwargs):
+        result = super().expire(key, timeout, version, **kwargs)
+        self.invalidate(key, version)
+        return result
+
+    def persist(self, key, version=None, **kwargs):
+        result = super().persist(key, version, **kwargs)
+        self.invalidate(key, version)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().set_many(data, timeout, version, **kwargs)
+        for key in data:
+            self.invalidate(key, version)
+        return result
+
+    def delete_many(self, keys, version=None, **kwargs):
+        result = super().delete_many(keys, version, **kwargs)
+        for key in keys:
+            self.invalidate(key, version)
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self.invalidate_all()
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self.invalidate_all()
+        return result
+
+    def invalidate(self, key, version=None):
+        if self.is_local(key):
+            self.publish(self.client.make_key(key, version=version))
+
+    def invalidate_all(self):
+        if self.local_patterns:
+            self.publish(CLEAR_ALL)
+
+    def publish(self, redis_key):
+        self.local.invalidate(redis_key)
+        try:
+            self.client.get_client(write=True).publish(self.channel, f'{self.origin}|{redis_key}')
+        except Exception:
+            logger.warning('Failed to publish cache invalidation for %s', redis_key, exc_info=True)
+
+    # Subscriber
+
+    def ensure_subscribed(self):
+        """Start the invalidation listener; the local tier is used only while it is connected."""
+        if self.subscriber_pid != os.getpid():
+            with self.subscriber_lock:
+                if self.subscriber_pid != os.getpid():
+                    # First use, or a forked worker: the parent's thread did not survive.
+                    self.subscribed.clear()
+                    self.local.invalidate(CLEAR_ALL)
+                    self.subscriber_pid = os.getpid()
+                    self.subscriber = threading.Thread(target=self.listen, name='cache-invalidation', daemon=True)
+                    self.subscriber.start()
+        return self.subscribed.is_set()
+
+    def listen(self):
+        pid = os.getpid()
+        delay = 0.5
+        while self.subscriber_pid == pid:
+            try:
+                pubsub = self.client.get_client(write=True).pubsub()
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message['type'] == 'subscribe':
+                        self.subscribed.set()
+                        delay = 0.5
+                    elif message['type'] == 'message':
+                        self.handle_message(message['data'])
+            except Exception:
+                logger.warning('Cache invalidation listener disconnected', exc_info=True)
+            # Messages may have been missed while disconnected.
+            self.subscribed.clear()
+            self.local.invalidate(CLEAR_ALL)
+            time.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    def handle_message(self, data):
+        origin, _, redis_key = (data.decode() if isinstance(data, bytes) else data).partition('|')
+        if origin != self.origin:
+            self.local.invalidate(redis_key)
@@ -0,0 +1,80 @@
+"""
+Stampede-safe cache helpers.
+"""
+import logging
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache as default_cache
+
+from .db_router import fresh_reads
+
+logger = logging.getLogger(__name__)
+
+
+def get_or_recompute(key, compute, ttl, beta=1.0, lock_timeout=30, wait=2.0, cache=None):
+    """
+    Return the cached value for ``key``, recomputing it at most once at a time.
+
+    Entries remember how long they took to compute and are refreshed early
+    with a probability that rises as expiry approaches (XFetch), so a hot key
+    is normally refreshed by one caller before it expires. The refresh itself
+    runs under a cache lock (``add`` is SET NX on Redis); callers that lose the
+    race keep serving the previous value. Values are kept past their logical
+    expiry (for another ``ttl``) so there is something to serve meanwhile.
+
+    Returns ``(value, computed_at)`` where ``computed_at`` is a Unix timestamp.
+    """
+    cache = cache or default_cache
+    entry = cache.get(key)
+    now = time.time()
+
+    if entry is not None and not should_refresh(entry, now, beta):
+        return entry['value'], entry['computed_at']
+
+    lock_key = f'{key}.lock'
+    token = uuid.uuid4().hex
+    # A refill must not be older than the entry it replaces.
+    since = entry['computed_at'] if entry is not None else None
+    if cache.add(lock_key, token, lock_timeout):
+        try:
+            return store(cache, key, compute, ttl, since)
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+
+    if entry is not None:
+        return entry['value'], entry['computed_at']
+
+    # Cold cache and someone else is computing: wait briefly for their result.
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry['value'], entry['computed_at']
+    logger.warning('Timed out waiting for %s to be computed; computing locally', key)
+    return store(cache, key, compute, ttl, since)
+
+
+def should_refresh(entry, now, beta):
+    """XFetch: refresh when ``now - delta * beta * ln(rand)`` passes expiry."""
+    return now - entry['delta'] * beta * math.log(1.0 - random.random()) >= entry['expires_at']
+
+
+def store(cache, key, compute, ttl, since=None):
+    start = time.time()
+    # Replicas only if current as of ``since``: a lagging one would put
+    # older data back for a whole ttl.
+    with fresh_reads(since):
+        value = compute()
+    computed_at = time.time()
+    cache.set(key, {
+        'value': value,
+        'computed_at': computed_at,
+        'delta': computed_at - start,
+        'expires_at': computed_at + ttl,
+    }, ttl * 2)
+    return value, computed_at
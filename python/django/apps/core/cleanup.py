@@ -0,0 +1,266 @@
+"""
+Incremental cleanup engine behind ``periodic_cleanup_task``.
+
+Each cleanup target (``CLEANUP_TARGETS``) deletes in small batches read in
+key order from a cursor. The cursor is saved in ``CleanupState`` after every
+batch, so a run that hits its time budget, or dies, resumes where it
+stopped. A pass over a target ends when a batch comes back short, and the
+next run starts a fresh pass.
+
+Between batches the engine sleeps ``CLEANUP_BATCH_PAUSE`` seconds. It waits
+while replicas lag more than ``CLEANUP_MAX_REPLICATION_LAG`` seconds or more
+than ``CLEANUP_MAX_ACTIVE_QUERIES`` other queries are running, and stops once
+the budget is spent.
+
+A target subclasses ``CleanupTarget`` (or ``ModelCleanup`` for rows):
+
+    class OldWebhookEvents(ModelCleanup):
+        name = 'webhook_events'
+        model = WebhookEvent
+        order_field = 'received_at'
+
+        def queryset(self):
+            return super().queryset().filter(received_at__lt=...)
+"""
+import bisect
+import json
+import logging
+import os
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, models
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import CleanupState
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY = 'cleanup.lock'
+
+
+class CleanupTarget:
+    """One kind of garbage, read and deleted in cursor order."""
+    name = None
+    batch_size = 500
+
+    def next_batch(self, cursor, limit):
+        """Up to ``limit`` items after ``cursor`` (``None``: from the start), in cursor order."""
+        raise NotImplementedError
+
+    def cursor_of(self, item):
+        """String cursor positioned just after ``item``."""
+        raise NotImplementedError
+
+    def delete(self, items):
+        """Delete ``items``; returns how many were removed."""
+        raise NotImplementedError
+
+
+class ModelCleanup(CleanupTarget):
+    """
+    Rows of ``model`` matched by ``queryset()``, in ``(order_field, pk)`` order.
+
+    ``order_field`` should be indexed together with the primary key. Seeking
+    from the cursor instead of rescanning from the start skips the dead
+    index entries earlier batches left behind.
+    """
+    model = None
+    order_field = None
+
+    def queryset(self):
+        return self.model._default_manager.all()
+
+    def next_batch(self, cursor, limit):
+        queryset = self.queryset()
+        if cursor is not None:
+            value, pk = json.loads(cursor)
+            value = self.model._meta.get_field(self.order_field).to_python(value)
+            queryset = queryset.filter(
+                Q(**{f'{self.order_field}__gt': value}) | Q(**{self.order_field: value, 'pk__gt': pk})
+            )
+        return list(queryset.order_by(self.order_field, 'pk').values_list(self.order_field, 'pk')[:limit])
+
+    def cursor_of(self, item):
+        return json.dumps(item, cls=DjangoJSONEncoder)
+
+    def delete(self, items):
+        deleted, _ = self.model._default_manager.filter(pk__in=[pk for _, pk in items]).delete()
+        return deleted
+
+
+class ExpiredSessions(ModelCleanup):
+    """Database sessions past their expiry date."""
+    name = 'sessions'
+    order_field = 'expire_date'
+
+    @property
+    def model(self):
+        return apps.get_model('sessions', 'Session')
+
+    def queryset(self):
+        return super().queryset().filter(expire_date__lt=timezone.now())
+
+
+class OrphanedMedia(CleanupTarget):
+    """
+    Files under ``MEDIA_ROOT`` that no ``FileField`` references.
+
+    Files younger than ``CLEANUP_MEDIA_GRACE_HOURS`` are kept, so an upload
+    whose row is not yet committed is not taken for an orphan. Dotfiles
+    (such as the storage health probe's scratch files) are ignored.
+
+    The sorted listing and the referenced names are read once per run (or
+    pass), and batches are sliced from them. A run is bounded by the time
+    budget, so a file saved since is younger than the grace period.
+    """
+    name = 'media'
+    batch_size = 100
+
+    def __init__(self):
+        self.paths = None
+        self.referenced_names = None
+
+    def referenced(self):
+        names = set()
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if isinstance(field, models.FileField):
+                    names.update(
+                        model._default_manager.exclude(**{field.name: ''}).values_list(field.name, flat=True)
+                    )
+        return names
+
+    def scan(self, root):
+        self.paths = sorted(
+            os.path.relpath(os.path.join(directory, filename), root)
+            for directory, _, filenames in os.walk(root)
+            for filename in filenames
+            if not filename.startswith('.')
+        )
+        self.referenced_names = self.referenced()
+
+    def next_batch(self, cursor, limit):
+        root = settings.MEDIA_ROOT
+        if not os.path.isdir(root):
+            return []
+        if cursor is None or self.paths is None:
+            self.scan(root)
+        cutoff = time.time() - settings.CLEANUP_MEDIA_GRACE_HOURS * 3600
+        start = 0 if cursor is None else bisect.bisect_right(self.paths, cursor)
+        batch = self.paths[start:start + limit]
+        # Return every path examined so the cursor moves past kept files too;
+        # delete() skips the ones that are not orphans. A path may have gone
+        # since the scan.
+        self.orphans = set()
+        for path in batch:
+            if path in self.referenced_names:
+                continue
+            try:
+                if os.path.getmtime(os.path.join(root, path)) < cutoff:
+                    self.orphans.add(path)
+            except FileNotFoundError:
+                pass
+        return batch
+
+    def cursor_of(self, item):
+        return item
+
+    def delete(self, items):
+        deleted = 0
+        for path in items:
+            if path in self.orphans:
+                default_storage.delete(path)
+                deleted += 1
+        return deleted
+
+
+def get_targets():
+    return [import_string(path)() for path in settings.CLEANUP_TARGETS]
+
+
+def replication_lag():
+    """Seconds the slowest streaming replica is behind, 0 without replicas or privileges."""
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COALESCE(EXTRACT(EPOCH FROM MAX(replay_lag)), 0) FROM pg_stat_replication')
+        return float(cursor.fetchone()[0])
+
+
+def active_queries():
+    """Other backends currently running a query on this database."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_stat_activity "
+            "WHERE state = 'active' AND datname = current_database() AND pid <> pg_backend_pid()"
+        )
+        return cursor.fetchone()[0]
+
+
+def database_busy():
+    return (
+        replication_lag() > settings.CLEANUP_MAX_REPLICATION_LAG
+        or active_queries() > settings.CLEANUP_MAX_ACTIVE_QUERIES
+    )
+
+
+def wait_until_idle(deadline):
+    """Sleep while the database is busy; False if the deadline passes first."""
+    while database_busy():
+        if time.monotonic() + settings.CLEANUP_THROTTLE_SLEEP > deadline:
+            return False
+        time.sleep(settings.CLEANUP_THROTTLE_SLEEP)
+    return True
+
+
+def run_target(target, deadline):
+    """Delete batches of ``target`` until its pass completes or ``deadline`` passes."""
+    state, _ = CleanupState.objects.get_or_create(target=target.name)
+    deleted = batches = 0
+    finished = False
+    while time.monotonic() < deadline:
+        if not wait_until_idle(deadline):
+            break
+        items = target.next_batch(state.cursor, target.batch_size)
+        batch_deleted = target.delete(items) if items else 0
+        deleted += batch_deleted
+        batches += bool(items)
+        finished = len(items) < target.batch_size
+        state.cursor = None if finished else target.cursor_of(items[-1])
+        state.deleted += batch_deleted
+        state.passes += finished
+        state.save()
+        if finished:
+            break
+        time.sleep(settings.CLEANUP_BATCH_PAUSE)
+    return {'deleted': deleted, 'batches': batches, 'finished': finished}
+
+
+def run_cleanup(targets=None, budget=None):
+    """
+    Run every target within ``budget`` seconds (``CLEANUP_TIME_BUDGET``).
+
+    Targets split what is left of the budget evenly, so a large backlog in
+    one does not starve the others. Returns per-target counts, or ``None``
+    if another run holds the lock.
+    """
+    targets = get_targets() if targets is None else targets
+    budget = settings.CLEANUP_TIME_BUDGET if budget is None else budget
+    if not cache.add(LOCK_KEY, True, timeout=int(budget * 2) + 60):
+        logger.info('Cleanup already running, skipping')
+        return None
+    try:
+        deadline = time.monotonic() + budget
+        results = {}
+        for index, target in enumerate(targets):
+            share = (deadline - time.monotonic()) / (len(targets) - index)
+            results[target.name] = run_target(target, time.monotonic() + share)
+            logger.info(f'Cleanup {target.name}: {results[target.name]}')
+        return results
+    finally:
+        cache.delete(LOCK_KEY)
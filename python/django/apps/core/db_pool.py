@@ -0,0 +1,98 @@
+"""
+Prometheus metrics for the psycopg 3 connection pools.
+
+Each process reads its pools' statistics (``ConnectionPool.pop_stats()``)
+when a request finishes, at most every ``DATABASE_POOL_STATS_INTERVAL``
+seconds, and adds them to counters and gauges. Reading on the request path
+rather than at scrape time keeps the numbers right under gunicorn's
+multiprocess mode, where the scrape merges files and never runs code in
+the workers.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from prometheus_client import Counter, Gauge
+
+POOL_CONNECTIONS = Gauge(
+    'django_db_pool_connections',
+    'Connections in the pool: open (size), idle (available), and requests waiting for one.',
+    ['alias', 'state'],
+    multiprocess_mode='livesum',
+)
+POOL_CHECKOUTS = Counter(
+    'django_db_pool_checkouts_total',
+    'Connections handed out by the pool, by whether the request had to queue.',
+    ['alias', 'queued'],
+)
+POOL_WAIT = Counter(
+    'django_db_pool_checkout_wait_seconds_total',
+    'Time requests spent queued for a connection.',
+    ['alias'],
+)
+POOL_CHECKOUT_ERRORS = Counter(
+    'django_db_pool_checkout_errors_total',
+    'Requests that timed out or failed waiting for a connection.',
+    ['alias'],
+)
+POOL_USAGE = Counter(
+    'django_db_pool_usage_seconds_total',
+    'Time connections spent checked out of the pool.',
+    ['alias'],
+)
+POOL_CONNECTS = Counter(
+    'django_db_pool_connects_total',
+    'Connection attempts made by the pool, by result.',
+    ['alias', 'result'],
+)
+POOL_CONNECT_TIME = Counter(
+    'django_db_pool_connect_seconds_total',
+    'Time spent opening new connections.',
+    ['alias'],
+)
+POOL_DISCARDED = Counter(
+    'django_db_pool_discarded_total',
+    'Connections thrown away: failed the health check (lost) or returned broken (bad).',
+    ['alias', 'reason'],
+)
+
+_lock = threading.Lock()
+_last_recorded = 0.0
+
+
+def record_pool(alias, pool):
+    """Add the statistics gathered since the last call to the metrics."""
+    stats = pool.pop_stats()
+    for state, key in (('size', 'pool_size'), ('available', 'pool_available'), ('waiting', 'requests_waiting')):
+        POOL_CONNECTIONS.labels(alias, state).set(stats.get(key, 0))
+    requests, queued = stats.get('requests_num', 0), stats.get('requests_queued', 0)
+    POOL_CHECKOUTS.labels(alias, 'false').inc(requests - queued)
+    POOL_CHECKOUTS.labels(alias, 'true').inc(queued)
+    POOL_WAIT.labels(alias).inc(stats.get('requests_wait_ms', 0) / 1000)
+    POOL_CHECKOUT_ERRORS.labels(alias).inc(stats.get('requests_errors', 0))
+    POOL_USAGE.labels(alias).inc(stats.get('usage_ms', 0) / 1000)
+    errors = stats.get('connections_errors', 0)
+    POOL_CONNECTS.labels(alias, 'ok').inc(stats.get('connections_num', 0) - errors)
+    POOL_CONNECTS.labels(alias, 'error').inc(errors)
+    POOL_CONNECT_TIME.labels(alias).inc(stats.get('connections_ms', 0) / 1000)
+    POOL_DISCARDED.labels(alias, 'lost').inc(stats.get('connections_lost', 0))
+    POOL_DISCARDED.labels(alias, 'bad').inc(stats.get('returns_bad', 0))
+
+
+def record_pools(force=False):
+    """Record every configured pool, unless that was done less than an interval ago."""
+    global _last_recorded
+    now = time.monotonic()
+    if not force and now - _last_recorded < settings.DATABASE_POOL_STATS_INTERVAL:
+        return
+    # One thread records; the others carry on with their requests.
+    if not _lock.acquire(blocking=False):
+        return
+    try:
+        _last_recorded = now
+        for alias in connections:
+            if connections.settings[alias].get('OPTIONS', {}).get('pool'):
+                record_pool(alias, connections[alias].pool)
+    finally:
+        _lock.release()
@@ -0,0 +1,228 @@
+"""
+Read-replica routing.
+
+Replicas are the ``DATABASES`` aliases listed in ``DATABASE_REPLICAS``.
+Reads go to one only where slightly old data is acceptable:
+
+- requests with a safe method (``ReplicaMiddleware``), unless the client
+  wrote less than ``DATABASE_REPLICA_PIN_SECONDS`` ago
+- code wrapped in ``replica_reads()``, such as a task reading reports
+
+Anything else uses the primary, and so does every read that follows a
+write or runs inside a transaction.
+
+Reads answered under a version bumped on commit (``api_items``, cached
+pages, ``get_or_recompute`` refills) run in ``fresh_reads(version)``: a
+replica serves them only if it was known to be current at ``version``, so
+old rows are never stored or sent under a new key.
+
+Each process measures the replicas' lag at most every
+``DATABASE_REPLICA_LAG_INTERVAL`` seconds. A replica that is more than
+``DATABASE_REPLICA_MAX_LAG`` seconds behind, or unreachable, leaves the
+rotation until a later measurement brings it back. A measurement also
+gives the time the replica was current as of: the measurement time less
+the lag, which is the last replayed commit's timestamp when behind.
+"""
+import contextlib
+import contextvars
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from prometheus_client import Gauge
+
+REPLICA_LAG = Gauge(
+    'django_db_replica_lag_seconds',
+    'Replication lag last measured on each replica.',
+    ['alias'],
+    multiprocess_mode='max',
+)
+REPLICA_IN_ROTATION = Gauge(
+    'django_db_replica_in_rotation',
+    'Whether the replica receives reads (0 when lagging or unreachable).',
+    ['alias'],
+    multiprocess_mode='min',
+)
+
+# On an idle primary the last replayed transaction gets old while the
+# replica is fully caught up, so a streaming replica that has replayed all
+# it received counts as no lag. Without a streaming WAL receiver the replica
+# receives nothing new and can only be as current as its last replayed
+# transaction; if it never replayed one, the lag is unknown (NULL). The
+# receiver's status is only visible to roles with pg_read_all_stats, so the
+# others always get the conservative measure. A server that is not in
+# recovery is not lagging.
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')
+            THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class ReadScope:
+    """Routing state of one request or ``replica_reads()`` block."""
+
+    def __init__(self, replicas=True, parent=None, since=None):
+        self.replicas = replicas
+        self.parent = parent
+        self.since = since
+        self.wrote = False
+        # Keep the enclosing scope's replica, so reads do not go back in time.
+        self.alias = parent.alias if parent is not None else None
+
+
+_scope = contextvars.ContextVar('db_read_scope', default=None)
+
+
+@contextlib.contextmanager
+def read_scope(replicas=True, since=None):
+    """Route the reads inside the block; yields the ``ReadScope``."""
+    scope = ReadScope(replicas, parent=_scope.get(), since=since)
+    with entered(scope):
+        yield scope
+
+
+@contextlib.contextmanager
+def entered(scope):
+    """Make an existing ``scope`` current again, e.g. while a response streams."""
+    token = _scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _scope.reset(token)
+
+
+def replica_reads():
+    """Send the reads inside the block (or decorated function) to a replica, until the first write."""
+    return read_scope(replicas=True)
+
+
+def primary_reads():
+    """Send the reads inside the block (or decorated function) to the primary."""
+    return read_scope(replicas=False)
+
+
+def fresh_reads(since):
+    """
+    Keep the enclosing scope's routing for the reads inside the block, but
+    only use replicas known to be current as of ``since`` (a Unix time).
+    """
+    parent = _scope.get()
+    return read_scope(replicas=parent is not None and parent.replicas and not parent.wrote, since=since)
+
+
+def measure_lag(alias):
+    """Seconds ``alias`` is behind the primary, or None if unreachable or unknown."""
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            lag = cursor.fetchone()[0]
+    except DatabaseError:
+        return None
+    return None if lag is None else float(lag)
+
+
+class ReplicaSet:
+    """The configured replicas with their last measured lag."""
+
+    def __init__(self, aliases):
+        self.aliases = tuple(aliases)
+        self.lag = dict.fromkeys(self.aliases)
+        self.current_as_of = dict.fromkeys(self.aliases, 0.0)
+        self.checked_at = None
+        self.lock = threading.Lock()
+
+    def available(self, since=None):
+        """
+        Aliases in rotation (and current as of ``since``, if given),
+        measuring again if the last measurement is too old.
+        """
+        if self.checked_at is None or time.monotonic() - self.checked_at >= settings.DATABASE_REPLICA_LAG_INTERVAL:
+            self.refresh()
+        return [
+            alias for alias in self.aliases
+            if self.in_rotation(alias) and (since is None or self.current_as_of[alias] >= since)
+        ]
+
+    def in_rotation(self, alias):
+        lag = self.lag[alias]
+        return lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG
+
+    def refresh(self):
+        """Measure every replica; other threads keep the previous result meanwhile."""
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            for alias in self.aliases:
+                # Taken before the query, so the estimate errs on the old side.
+                measured_at = time.time()
+                self.lag[alias] = lag = measure_lag(alias)
+                if lag is not None:
+                    self.current_as_of[alias] = measured_at - lag
+                    REPLICA_LAG.labels(alias).set(lag)
+                REPLICA_IN_ROTATION.labels(alias).set(int(self.in_rotation(alias)))
+            self.checked_at = time.monotonic()
+        finally:
+            self.lock.release()
+
+    def status(self):
+        """Lag and rotation of every replica, for the health check."""
+        return {alias: {'lag': self.lag[alias], 'in_rotation': self.in_rotation(alias)} for alias in self.aliases}
+
+
+_replicas = None
+
+
+def get_replicas():
+    """Return the per-process ``ReplicaSet`` for ``DATABASE_REPLICAS``."""
+    global _replicas
+    aliases = tuple(settings.DATABASE_REPLICAS)
+    replicas = _replicas
+    if replicas is None or replicas.aliases != aliases:
+        replicas = _replicas = ReplicaSet(aliases)
+    return replicas
+
+
+class ReplicaRouter:
+    """Reads in a replica scope go to a replica in rotation; everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or not scope.replicas or scope.wrote:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        available = get_replicas().available(scope.since)
+        if not available:
+            return DEFAULT_DB_ALIAS
+        # One replica per scope, so reads in a request do not go back in time.
+        if scope.alias not in available:
+            scope.alias = random.choice(available)
+        return scope.alias
+
+    def db_for_write(self, model, **hints):
+        # Enclosing scopes too: a write in a primary_reads() block still
+        # pins the request's client.
+        scope = _scope.get()
+        while scope is not None:
+            scope.wrote = True
+            scope = scope.parent
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema through replication.
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
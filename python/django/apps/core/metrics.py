@@ -0,0 +1,152 @@
+"""
+Application request counters.
+
+Counters live in Redis when the default cache is django-redis: each
+request costs one pipelined round trip (totals, a per-minute hash and a
+HyperLogLog of active users). Other cache backends fall back to the
+Django cache API, which is fine for development and tests.
+"""
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Active users are tracked in 5-minute HyperLogLog buckets.
+ACTIVE_BUCKET_SECONDS = 300
+
+
+def minute_bucket(timestamp):
+    return int(timestamp // 60)
+
+
+def active_bucket(timestamp):
+    return int(timestamp // ACTIVE_BUCKET_SECONDS)
+
+
+class RedisMetricsStore:
+    """Counters stored directly in Redis."""
+
+    def __init__(self, client, prefix='metrics'):
+        self.client = client
+        self.prefix = prefix
+
+    def record(self, timestamp, latency_ms, is_error, user_id=None):
+        minute_key = f'{self.prefix}:minute:{minute_bucket(timestamp)}'
+        pipe = self.client.pipeline(transaction=False)
+        pipe.incr(f'{self.prefix}:requests')
+        pipe.hincrby(minute_key, 'requests', 1)
+        pipe.hincrby(minute_key, 'latency_ms', latency_ms)
+        if is_error:
+            pipe.incr(f'{self.prefix}:errors')
+            pipe.hincrby(minute_key, 'errors', 1)
+        pipe.expire(minute_key, settings.STATS_WINDOW_MINUTES * 60 + 60)
+        if user_id is not None:
+            active_key = f'{self.prefix}:active:{active_bucket(timestamp)}'
+            pipe.pfadd(active_key, user_id)
+            pipe.expire(active_key, settings.STATS_ACTIVE_USER_MINUTES * 60 + ACTIVE_BUCKET_SECONDS)
+        pipe.execute()
+
+    def read(self, now):
+        minutes = window_minutes(now)
+        active = window_active_buckets(now)
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(f'{self.prefix}:requests')
+        pipe.get(f'{self.prefix}:errors')
+        for minute in minutes:
+            pipe.hgetall(f'{self.prefix}:minute:{minute}')
+        pipe.pfcount(*(f'{self.prefix}:active:{bucket}' for bucket in active))
+        results = pipe.execute()
+
+        window = {'requests': 0, 'errors': 0, 'latency_ms': 0}
+        for bucket in results[2:-1]:
+            for field, value in bucket.items():
+                window[field.decode() if isinstance(field, bytes) else field] += int(value)
+        return {
+            'total_requests': int(results[0] or 0),
+            'total_errors': int(results[1] or 0),
+            'window': window,
+            'active_users': results[-1],
+        }
+
+
+class CacheMetricsStore:
+    """Counters kept through the Django cache API (not atomic across processes)."""
+
+    def __init__(self, prefix='metrics'):
+        self.prefix = prefix
+
+    def incr(self, key, delta=1, timeout=None):
+        if cache.add(key, delta, timeout):
+            return
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, timeout)
+
+    def record(self, timestamp, latency_ms, is_error, user_id=None):
+        minute_key = f'{self.prefix}:minute:{minute_bucket(timestamp)}'
+        timeout = settings.STATS_WINDOW_MINUTES * 60 + 60
+        self.incr(f'{self.prefix}:requests')
+        self.incr(f'{minute_key}:requests', timeout=timeout)
+        self.incr(f'{minute_key}:latency_ms', latency_ms, timeout=timeout)
+        if is_error:
+            self.incr(f'{self.prefix}:errors')
+            self.incr(f'{minute_key}:errors', timeout=timeout)
+        if user_id is not None:
+            active_key = f'{self.prefix}:active:{active_bucket(timestamp)}'
+            users = cache.get(active_key, set())
+            if user_id not in users:
+                users.add(user_id)
+                cache.set(active_key, users, settings.STATS_ACTIVE_USER_MINUTES * 60 + ACTIVE_BUCKET_SECONDS)
+
+    def read(self, now):
+        window = {'requests': 0, 'errors': 0, 'latency_ms': 0}
+        for minute in window_minutes(now):
+            for field in window:
+                window[field] += cache.get(f'{self.prefix}:minute:{minute}:{field}', 0)
+        users = set()
+        for bucket in window_active_buckets(now):
+            users |= cache.get(f'{self.prefix}:active:{bucket}', set())
+        return {
+            'total_requests': cache.get(f'{self.prefix}:requests', 0),
+            'total_errors': cache.get(f'{self.prefix}:errors', 0),
+            'window': window,
+            'active_users': len(users),
+        }
+
+
+def window_minutes(now):
+    current = minute_bucket(now)
+    return range(current - settings.STATS_WINDOW_MINUTES + 1, current + 1)
+
+
+def window_active_buckets(now):
+    current = active_bucket(now)
+    count = max(1, settings.STATS_ACTIVE_USER_MINUTES * 60 // ACTIVE_BUCKET_SECONDS)
+    return range(current - count + 1, current + 1)
+
+
+_store = None
+
+
+def get_metrics_store():
+    """Return the Redis-backed store if the default cache is django-redis."""
+    global _store
+    if _store is None:
+        try:
+            from django_redis import get_redis_connection
+            _store = RedisMetricsStore(get_redis_connection('default'))
+        except (ImportError, NotImplementedError):
+            _store = CacheMetricsStore()
+    return _store
+
+
+def record_request(latency_ms, is_error, user_id=None):
+    """Record one request; never lets a metrics failure break the response."""
+    try:
+        get_metrics_store().record(time.time(), latency_ms, is_error, user_id)
+    except Exception:
+        logger.debug('Failed to record request metrics', exc_info=True)
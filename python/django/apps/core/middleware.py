@@ -0,0 +1,167 @@
+"""
+Middleware for the core application.
+"""
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .db_router import entered, read_scope
+from .metrics import record_request
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can sit in an async middleware chain.
+
+    WhiteNoise is sync-only, which would make Django run every async view
+    behind it in a thread under ASGI. The static file lookup is an in-memory
+    dict hit (outside autorefresh), so it is safe to do on the event loop.
+    """
+    async_capable = True
+
+    def __init__(self, get_response=None, **kwargs):
+        super().__init__(get_response, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """Counts requests, server errors, latency and active users."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        record_request(*self.sample(request, response, start))
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        # Recording is a blocking Redis round trip; keep it off the event loop.
+        await sync_to_async(record_request, thread_sensitive=False)(*self.sample(request, response, start))
+        return response
+
+    def sample(self, request, response, start):
+        latency_ms = int((time.perf_counter() - start) * 1000)
+        user = getattr(request, 'user', None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        return latency_ms, response.status_code >= 500, user_id
+
+
+class ReplicaMiddleware:
+    """
+    Lets safe requests read from the database replicas (read-your-writes).
+
+    A request that writes sets a cookie that keeps the client's reads on the
+    primary for ``DATABASE_REPLICA_PIN_SECONDS``, long enough for a replica
+    in rotation to catch up. A streamed body is produced after the view
+    returns, so its reads re-enter the request's scope chunk by chunk.
+    Without replicas this does nothing.
+    """
+    sync_capable = True
+    async_capable = True
+    cookie_name = 'db_primary_until'
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        with read_scope(self.use_replicas(request)) as scope:
+            response = self.get_response(request)
+        return self.pin(self.stream_in(response, scope), scope)
+
+    async def __acall__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+        with read_scope(self.use_replicas(request)) as scope:
+            response = await self.get_response(request)
+        return self.pin(self.stream_in(response, scope), scope)
+
+    def stream_in(self, response, scope):
+        if response.streaming:
+            content = response.streaming_content
+            response.streaming_content = (
+                astream_in_scope(content, scope) if response.is_async else stream_in_scope(content, scope)
+            )
+        return response
+
+    def use_replicas(self, request):
+        if request.method not in self.safe_methods:
+            return False
+        try:
+            return float(request.COOKIES.get(self.cookie_name, 0)) < time.time()
+        except ValueError:
+            return True
+
+    def pin(self, response, scope):
+        if scope.wrote:
+            seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+            response.set_cookie(
+                self.cookie_name, str(int(time.time() + seconds)),
+                max_age=int(seconds), httponly=True, samesite='Lax',
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+
+def stream_in_scope(content, scope):
+    """Produce each chunk of ``content`` inside ``scope``."""
+    try:
+        while True:
+            with entered(scope):
+                chunk = next(content, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        if hasattr(content, 'close'):
+            with entered(scope):
+                content.close()
+
+
+async def astream_in_scope(content, scope):
+    """``stream_in_scope`` for async iterators."""
+    try:
+        while True:
+            with entered(scope):
+                # Sync code awaited here copies the context, scope included.
+                chunk = await anext(content, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        if hasattr(content, 'aclose'):
+            with entered(scope):
+                await content.aclose()
@@ -0,0 +1,18 @@
+"""
+Core models for Django Docker Template.
+"""
+from django.db import models
+
+
+class CleanupState(models.Model):
+    """Resume cursor and running totals for one cleanup target (see apps.core.cleanup)."""
+
+    target = models.CharField(max_length=100, unique=True)
+    # Position after the last processed item; empty between passes.
+    cursor = models.TextField(null=True, blank=True)
+    deleted = models.BigIntegerField(default=0)
+    passes = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'Cleanup {self.target}'
@@ -0,0 +1,87 @@
+"""
+Page and fragment caching for the HTML views.
+
+Whole pages are cached for anonymous visitors only, keyed on host, path,
+query string and the headers in ``PAGE_CACHE_VARY_HEADERS``. Keys include
+a generation number, so ``invalidate()`` drops every cached page with one
+write. Template fragments (``{% cache %}``) listed in ``FRAGMENTS`` are
+deleted by the same call. Cached views read from a replica only if it was
+current when the generation was set, so a refill after ``invalidate()``
+never stores a lagging replica's data.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.http import HttpResponse
+
+from .db_router import fresh_reads
+
+GENERATION_KEY = 'pages.generation'
+
+# Fragment names used with {% cache fragment_timeout <name> %} in templates.
+FRAGMENTS = ('welcome_stats', 'dashboard_stats')
+
+
+def page_generation():
+    # A timestamp rather than a counter: if the key is evicted, the new
+    # generation cannot collide with pages cached under an old one.
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY, 0)
+    return generation
+
+
+def page_key(request, generation):
+    parts = [request.get_host(), request.get_full_path()]
+    parts += [request.headers.get(header, '') for header in settings.PAGE_CACHE_VARY_HEADERS]
+    digest = hashlib.md5('\n'.join(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'pages.{generation}.{digest}'
+
+
+def is_cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and 'private' not in response.get('Cache-Control', '')
+        and 'no-store' not in response.get('Cache-Control', '')
+    )
+
+
+def cache_anonymous_page(view):
+    """Serve the view from the cache for anonymous GET/HEAD requests."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        generation = page_generation()
+        timeout = settings.PAGE_CACHE_TIMEOUT
+        if not timeout or request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            # Its stats fragments are still cached under this generation.
+            with fresh_reads(generation / 1e9):
+                return view(request, *args, **kwargs)
+
+        key = page_key(request, generation)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Page-Cache'] = 'hit'
+            return response
+
+        with fresh_reads(generation / 1e9):
+            response = view(request, *args, **kwargs)
+        if is_cacheable(response):
+            cache.set(key, (response.content, response['Content-Type']), timeout)
+            response['X-Page-Cache'] = 'miss'
+        return response
+    return wrapper
+
+
+def invalidate():
+    """Drop every cached page and stats fragment; call when the data they show changes."""
+    cache.set(GENERATION_KEY, time.time_ns(), None)
+    cache.delete_many([make_template_fragment_key(name) for name in FRAGMENTS])
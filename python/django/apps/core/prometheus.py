@@ -0,0 +1,248 @@
+"""
+Prometheus request metrics.
+
+Latency histograms, response counts and in-flight gauges are labelled by
+URL name (``api:items``, ``core:home``...). Under gunicorn, set
+``PROMETHEUS_MULTIPROC_DIR`` so every worker writes its samples to mmap'd
+files in that directory; the scrape endpoint merges them. The endpoint
+answers only ``METRICS_ALLOWED_IPS`` and holders of ``METRICS_TOKEN``.
+
+Requests only add to plain per-route tallies. A thread in each process
+applies them to the metrics every ``PROMETHEUS_FLUSH_INTERVAL`` seconds
+(and at exit), so the locked mmap writes of multiprocess mode stay off the
+request path; samples reach the scrape up to one interval late.
+"""
+import atexit
+import ipaddress
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.urls import Resolver404, resolve
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+UNMATCHED_ROUTE = 'unmatched'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    'django_http_request_duration_seconds',
+    'Request latency by route.',
+    ['route', 'method'],
+    buckets=LATENCY_BUCKETS,
+)
+RESPONSES = Counter(
+    'django_http_responses_total',
+    'Responses by route and status code.',
+    ['route', 'method', 'status'],
+)
+IN_FLIGHT = Gauge(
+    'django_http_requests_in_flight',
+    'Requests currently being processed, by route.',
+    ['route'],
+    multiprocess_mode='livesum',
+)
+
+
+class RouteMetrics:
+    """
+    Per-(route, method) tallies and the metric children they are flushed to.
+
+    The histogram is flushed a bucket at a time through the child's value
+    objects, since ``Histogram.observe`` only adds one sample per call.
+    """
+
+    __slots__ = (
+        'latency', 'in_flight', 'responses', 'route', 'method',
+        'lock', 'active', 'buckets', 'total', 'statuses',
+    )
+    bounds = LATENCY_BUCKETS + (math.inf,)
+
+    def __init__(self, route, method):
+        self.route = route
+        self.method = method
+        self.latency = REQUEST_LATENCY.labels(route, method)
+        self.in_flight = IN_FLIGHT.labels(route)
+        self.responses = {}
+        self.lock = threading.Lock()
+        self.active = 0
+        self.reset()
+
+    def reset(self):
+        self.buckets = [0] * len(self.bounds)
+        self.total = 0.0
+        self.statuses = {}
+
+    def started(self):
+        with self.lock:
+            self.active += 1
+
+    def failed(self):
+        with self.lock:
+            self.active -= 1
+
+    def finished(self, duration, status):
+        index = bisect_left(self.bounds, duration)
+        with self.lock:
+            self.active -= 1
+            self.buckets[index] += 1
+            self.total += duration
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def flush(self):
+        """Add the tallies since the last flush to the metrics."""
+        with self.lock:
+            active, buckets, total, statuses = self.active, self.buckets, self.total, self.statuses
+            self.reset()
+        self.in_flight.set(active)
+        if not statuses:
+            return
+        self.latency._sum.inc(total)
+        for value, count in zip(self.latency._buckets, buckets, strict=True):
+            if count:
+                value.inc(count)
+        for status, count in statuses.items():
+            child = self.responses.get(status)
+            if child is None:
+                child = self.responses[status] = RESPONSES.labels(self.route, self.method, str(status))
+            child.inc(count)
+
+
+_routes = {}
+_flusher = None
+_flusher_lock = threading.Lock()
+
+
+@lru_cache(maxsize=2048)
+def route_name(path):
+    """URL name for ``path``; bounded, since unmatched paths are unbounded."""
+    try:
+        return resolve(path).view_name or UNMATCHED_ROUTE
+    except Resolver404:
+        return UNMATCHED_ROUTE
+
+
+def route_metrics(route, method):
+    key = (route, method)
+    metrics = _routes.get(key)
+    if metrics is None:
+        metrics = _routes.setdefault(key, RouteMetrics(route, method))
+        start_flusher()
+    return metrics
+
+
+def flush():
+    """Apply every route's tallies in this process to the metrics."""
+    for metrics in list(_routes.values()):
+        metrics.flush()
+
+
+def start_flusher():
+    global _flusher
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=flush_periodically, name='prometheus-flush', daemon=True)
+            _flusher.start()
+
+
+def flush_periodically():
+    while True:
+        time.sleep(settings.PROMETHEUS_FLUSH_INTERVAL)
+        flush()
+
+
+def forget_routes():
+    """In a forked worker: the parent's tallies and flush thread are not ours."""
+    global _flusher, _flusher_lock
+    _routes.clear()
+    _flusher = None
+    _flusher_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=forget_routes)
+atexit.register(flush)
+
+
+class PrometheusMiddleware:
+    """
+    Records latency, status and requests in flight per URL name.
+
+    The route is resolved here, before the request goes on, rather than in
+    a ``process_view`` hook (which Django would run in a thread under ASGI).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = route_metrics(route_name(request.path_info), request.method)
+        metrics.started()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            metrics.failed()
+            raise
+        metrics.finished(time.perf_counter() - start, response.status_code)
+        return response
+
+    async def __acall__(self, request):
+        metrics = route_metrics(route_name(request.path_info), request.method)
+        metrics.started()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            metrics.failed()
+            raise
+        metrics.finished(time.perf_counter() - start, response.status_code)
+        return response
+
+
+def metrics_allowed(request):
+    """Whether the client is in ``METRICS_ALLOWED_IPS`` or sends ``METRICS_TOKEN``."""
+    token = settings.METRICS_TOKEN
+    if token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return any(
+        address in ipaddress.ip_network(allowed, strict=False) for allowed in settings.METRICS_ALLOWED_IPS
+    )
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, merging all workers in multiprocess mode."""
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    # The other workers flush on their own; this one need not lag behind.
+    flush()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
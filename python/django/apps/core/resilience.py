@@ -0,0 +1,208 @@
+"""
+Retry policy and circuit breaker for Celery tasks.
+
+``RetryPolicy`` spreads retries with exponential backoff and full jitter:
+retry ``n`` waits a random time between 0 and ``min(cap, base * 2**n)``
+seconds, so tasks that failed together during an outage do not all come
+back at the same moment.
+
+``CircuitBreaker`` keeps its state in the default cache (Redis outside of
+tests), shared by every worker. After ``failure_threshold`` failures within
+``window`` seconds the circuit opens and calls are rejected without
+touching the dependency. After ``reset_timeout`` seconds one call is let
+through as a probe: success closes the circuit, failure opens it again.
+
+``ResilientTask`` puts both around a task:
+
+    @shared_task(
+        bind=True,
+        base=ResilientTask,
+        circuit='payments-api',
+        retry_policy=RetryPolicy(base=2, cap=600, max_retries=8),
+    )
+    def charge(self, order_id):
+        ...
+"""
+import logging
+import random
+import time
+
+from celery import Task
+from celery.exceptions import CeleryError, Reject, Retry
+from django.conf import settings
+from django.core.cache import cache
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_EVENTS = Counter(
+    'celery_circuit_breaker_events_total',
+    'Circuit breaker transitions and rejected calls.',
+    ['circuit', 'event'],
+)
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, capped at ``cap`` seconds.
+
+    ``max_retries`` limits retries after failures; ``max_deferrals`` limits
+    re-queues while the circuit is open, which do not use up retries.
+    """
+
+    def __init__(self, base=1, cap=300, max_retries=5, max_deferrals=100):
+        self.base = base
+        self.cap = cap
+        self.max_retries = max_retries
+        self.max_deferrals = max_deferrals
+
+    def countdown(self, retries):
+        """Seconds to wait before retry number ``retries`` (0 for the first)."""
+        return random.uniform(0, min(self.cap, self.base * 2 ** retries))
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+    def __init__(self, name, retry_after):
+        super().__init__(name, retry_after)
+        self.name = name
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return f'Circuit {self.name} is open, retry in {self.retry_after:.0f}s'
+
+
+class CircuitBreaker:
+    """
+    Shared closed/open/half-open circuit for one dependency.
+
+    Thresholds default to the ``CIRCUIT_BREAKER_*`` settings. Keys are
+    ``circuit:<name>:*`` and must not be listed in the two-tier cache's
+    ``LOCAL_KEYS``.
+    """
+
+    def __init__(self, name, failure_threshold=None, window=None, reset_timeout=None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD
+        self.window = window or settings.CIRCUIT_BREAKER_WINDOW
+        self.reset_timeout = reset_timeout or settings.CIRCUIT_BREAKER_RESET_TIMEOUT
+        prefix = f'circuit:{name}'
+        self.failures_key = f'{prefix}:failures'
+        # Present while calls are rejected; its value is when that ends.
+        self.open_key = f'{prefix}:open'
+        # Present from opening until a probe succeeds.
+        self.tripped_key = f'{prefix}:tripped'
+        self.probe_key = f'{prefix}:probe'
+
+    def state(self):
+        if cache.get(self.open_key) is not None:
+            return OPEN
+        if cache.get(self.tripped_key) is not None:
+            return HALF_OPEN
+        return CLOSED
+
+    def retry_after(self):
+        """Seconds until the circuit lets a probe through (0 unless open)."""
+        opened_until = cache.get(self.open_key)
+        return max(0.0, opened_until - time.time()) if opened_until else 0.0
+
+    def allow(self):
+        """Whether a call may go ahead; in half-open state only one caller gets True."""
+        state = self.state()
+        if state == CLOSED:
+            return True
+        # The probe claim expires like an open period, so a probe whose
+        # worker died does not keep the circuit half-open forever.
+        if state == HALF_OPEN and cache.add(self.probe_key, True, self.reset_timeout):
+            logger.info(f'Circuit {self.name} half-open, sending a probe')
+            return True
+        CIRCUIT_EVENTS.labels(self.name, 'rejected').inc()
+        return False
+
+    def record_success(self):
+        if cache.get(self.tripped_key) is not None:
+            cache.delete_many([self.tripped_key, self.probe_key, self.failures_key])
+            CIRCUIT_EVENTS.labels(self.name, 'closed').inc()
+            logger.info(f'Circuit {self.name} closed')
+
+    def record_failure(self):
+        if cache.get(self.tripped_key) is not None:
+            self.open()
+            return
+        if cache.add(self.failures_key, 1, self.window):
+            failures = 1
+        else:
+            try:
+                failures = cache.incr(self.failures_key)
+            except ValueError:  # expired between add() and incr()
+                cache.set(self.failures_key, 1, self.window)
+                failures = 1
+        if failures >= self.failure_threshold:
+            self.open()
+
+    def open(self):
+        cache.set(self.open_key, time.time() + self.reset_timeout, self.reset_timeout)
+        cache.set(self.tripped_key, True, None)
+        cache.delete_many([self.probe_key, self.failures_key])
+        CIRCUIT_EVENTS.labels(self.name, 'opened').inc()
+        logger.warning(f'Circuit {self.name} opened for {self.reset_timeout}s')
+
+
+class ResilientTask(Task):
+    """
+    Task base that retries failures with ``retry_policy`` and, when
+    ``circuit`` names a dependency, goes through its ``CircuitBreaker``.
+
+    Exceptions in ``retry_on`` count as dependency failures and are
+    retried; anything else propagates untouched. While the circuit is open
+    the task is not run: it is deferred to no earlier than the next probe.
+    Deferrals are counted in the ``deferrals`` message header, not in
+    ``request.retries``, so a long outage does not use up the retries.
+    """
+    retry_policy = RetryPolicy()
+    retry_on = (Exception,)
+    circuit = None
+
+    def get_circuit(self):
+        return CircuitBreaker(self.circuit) if self.circuit else None
+
+    def __call__(self, *args, **kwargs):
+        breaker = self.get_circuit()
+        if breaker is not None and not breaker.allow():
+            raise self.defer(CircuitOpen(self.circuit, breaker.retry_after()))
+        try:
+            result = super().__call__(*args, **kwargs)
+        except CeleryError:  # Retry, Ignore, Reject from the task body
+            raise
+        except self.retry_on as exc:
+            logger.warning(f'{self.name} failed: {exc}')
+            if breaker is not None:
+                breaker.record_failure()
+            raise self.retry_with_backoff(exc) from exc
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+    def retry_with_backoff(self, exc, minimum=0):
+        countdown = max(minimum, self.retry_policy.countdown(self.request.retries))
+        return self.retry(exc=exc, countdown=countdown, max_retries=self.retry_policy.max_retries)
+
+    def defer(self, exc):
+        """Re-queue the task after the open period, like ``retry`` but keeping ``retries``."""
+        headers = self.request.headers or {}
+        deferrals = headers.get('deferrals', 0) + 1
+        if self.request.called_directly or deferrals > self.retry_policy.max_deferrals:
+            return exc
+        countdown = max(exc.retry_after, self.retry_policy.countdown(self.request.retries))
+        signature = self.signature_from_request(
+            countdown=countdown, headers={**headers, 'deferrals': deferrals},
+        )
+        if not self.request.is_eager:
+            try:
+                signature.apply_async()
+            except Exception as error:
+                raise Reject(error, requeue=False) from error
+        return Retry(exc=exc, when=countdown, is_eager=self.request.is_eager, sig=signature)
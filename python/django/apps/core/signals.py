@@ -0,0 +1,27 @@
+"""
+Signal handlers for the core application.
+"""
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import db_pool, page_cache
+
+
+@receiver(post_save, sender=get_user_model())
+def user_saved(sender, created, using, **kwargs):
+    # Logins also save the user (last_login); only sign-ups change the pages.
+    if created:
+        transaction.on_commit(page_cache.invalidate, using=using)
+
+
+@receiver(post_delete, sender=get_user_model())
+def user_deleted(sender, using, **kwargs):
+    transaction.on_commit(page_cache.invalidate, using=using)
+
+
+@receiver(request_finished)
+def request_done(sender, **kwargs):
+    db_pool.record_pools()
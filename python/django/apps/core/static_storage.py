@@ -0,0 +1,107 @@
+"""
+Static files storage with incremental, parallel precompression.
+
+``IncrementalCompressedStorage`` is WhiteNoise's manifest storage with
+three changes:
+
+* Brotli (``.br``) and gzip (``.gz``) variants are written by a process
+  pool sized by ``STATICFILES_COMPRESS_WORKERS`` (default: all cores), so
+  Brotli at its highest quality is not serialized on the GIL.
+* A file whose hashed name is unchanged since the previous manifest, and
+  whose variants are still on disk, is not compressed again. Keep
+  ``STATIC_ROOT`` between builds (see the Dockerfile cache mount) and only
+  changed assets are compressed. The variants written for each file are
+  recorded in ``COMPRESSED_MANIFEST_NAME``, so a file WhiteNoise declined to
+  compress (too small, or no smaller compressed) is not retried either.
+* Hashed files dropped from the manifest, and their variants, are deleted
+  so a persistent ``STATIC_ROOT`` does not grow with every build.
+
+Hashed names are served with ``Cache-Control: max-age=315360000, public,
+immutable`` by WhiteNoise.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from whitenoise.compress import Compressor
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+COMPRESSED_SUFFIXES = ('.gz', '.br')
+COMPRESSED_MANIFEST_NAME = 'staticfiles.compressed.json'
+
+
+def compress_file(path, extensions):
+    """Write the compressed variants of ``path``; returns their paths."""
+    return list(Compressor(extensions=extensions, quiet=True).compress(path))
+
+
+class IncrementalCompressedStorage(CompressedManifestStaticFilesStorage):
+    """Manifest storage that only compresses changed files, in parallel."""
+
+    def post_process(self, *args, **kwargs):
+        # Read before the parent's post_process replaces it.
+        self.previous_files, _ = self.load_manifest()
+        self.previous_compressed = self.load_compressed_manifest()
+        yield from super().post_process(*args, **kwargs)
+        if not kwargs.get('dry_run'):
+            self.delete_stale_files()
+
+    def compress_files(self, paths):
+        extensions = getattr(settings, 'WHITENOISE_SKIP_COMPRESS_EXTENSIONS', None)
+        self.compressor = self.create_compressor(extensions=extensions, quiet=True)
+        compressed = {}
+        pending = []
+        for path in paths:
+            if not self.compressor.should_compress(path):
+                continue
+            if self.is_unchanged(path):
+                compressed[path] = self.previous_compressed['paths'][path]
+            else:
+                pending.append(path)
+
+        if pending:
+            workers = getattr(settings, 'STATICFILES_COMPRESS_WORKERS', None) or os.cpu_count()
+            with ProcessPoolExecutor(max_workers=min(workers, len(pending))) as executor:
+                full_paths = [self.path(path) for path in pending]
+                results = executor.map(compress_file, full_paths, [extensions] * len(pending), chunksize=4)
+                for path, full_path, compressed_paths in zip(pending, full_paths, results, strict=True):
+                    prefix_len = len(full_path) - len(path)
+                    compressed[path] = [compressed_path[prefix_len:] for compressed_path in compressed_paths]
+                    for name in compressed[path]:
+                        yield path, name
+        self.save_compressed_manifest(compressed)
+
+    def is_unchanged(self, path):
+        """True if ``path`` had the same hashed name last time and its variants exist."""
+        previous = getattr(self, 'previous_files', {})
+        key = self.hash_key(path)
+        # A hashed name is derived from the content; an original is unchanged
+        # if it hashes to the same name as in the previous manifest.
+        if path not in previous.values() and (key not in previous or previous[key] != self.hashed_files.get(key)):
+            return False
+        compressed = getattr(self, 'previous_compressed', {})
+        # Files compressed without Brotli get another chance once it is installed.
+        if compressed.get('brotli') != self.compressor.use_brotli or path not in compressed.get('paths', {}):
+            return False
+        return all(self.exists(name) for name in compressed['paths'][path])
+
+    def load_compressed_manifest(self):
+        try:
+            with self.manifest_storage.open(COMPRESSED_MANIFEST_NAME) as manifest:
+                return json.loads(manifest.read().decode())
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def save_compressed_manifest(self, compressed):
+        """Record the variants written for each file, including none at all."""
+        payload = {'brotli': self.compressor.use_brotli, 'paths': compressed}
+        if self.manifest_storage.exists(COMPRESSED_MANIFEST_NAME):
+            self.manifest_storage.delete(COMPRESSED_MANIFEST_NAME)
+        self.manifest_storage._save(COMPRESSED_MANIFEST_NAME, ContentFile(json.dumps(payload).encode()))
+
+    def delete_stale_files(self):
+        current = set(self.hashed_files.values())
+        for name in set(self.previous_files.values()) - current:
+            self.delete_files([name] + [name + suffix for suffix in COMPRESSED_SUFFIXES])
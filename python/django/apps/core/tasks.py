@@ -1,23 +1,27 @@
 """
 Celery tasks for the core application.
 """
-from celery import shared_task
-from django.core.mail import send_mail
+from smtplib import SMTPDataError, SMTPException, SMTPRecipientsRefused, SMTPSenderRefused
+
+from celery import group, shared_task
+from django.core.mail import EmailMessage, get_connection, send_mail
 from django.conf import settings
 import time
 import logging
 
+from .resilience import ResilientTask, RetryPolicy
+
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True)
+@shared_task(bind=True, ignore_result=False)
 def debug_task(self):
     """Debug task for testing Celery worker functionality."""
     logger.info(f'Request: {self.request!r}')
     return f'Task executed successfully! Request ID: {self.request.id}'
 
 
-@shared_task
+@shared_task(ignore_result=False)
 def sample_async_task(message="Hello from Celery!"):
     """Sample asynchronous task."""
     logger.info(f'Processing async task with message: {message}')
@@ -43,23 +47,96 @@ def send_email_task(subject, message, recipient_list):
         raise
 
 
+@shared_task(
+    bind=True,
+    autoretry_for=(SMTPException, OSError),
+    retry_backoff=30,
+    retry_jitter=True,
+    max_retries=settings.EMAIL_MAX_RETRIES,
+)
+def send_email_message_task(self, subject, message, recipient):
+    """Send one message to one recipient, retrying with backoff."""
+    send_mail(
+        subject=subject,
+        message=message,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[recipient],
+        fail_silently=False,
+    )
+    return f'Email sent to {recipient}'
+
+
+@shared_task(bind=True, autoretry_for=(OSError,), retry_backoff=30, max_retries=3)
+def send_email_batch_task(self, subject, message, recipients):
+    """
+    Send one message per recipient over a single SMTP connection.
+
+    A recipient whose message fails is handed to ``send_email_message_task``
+    on its own, so one bad address does not resend the whole batch. Only a
+    failure to connect at all retries the batch, before anything was sent.
+    """
+    connection = get_connection()
+    connection.open()
+    sent, failed = 0, []
+    try:
+        for index, recipient in enumerate(recipients):
+            email = EmailMessage(subject, message, settings.DEFAULT_FROM_EMAIL, [recipient], connection=connection)
+            try:
+                sent += connection.send_messages([email])
+            except (SMTPRecipientsRefused, SMTPSenderRefused, SMTPDataError) as e:
+                logger.warning(f'Email to {recipient} rejected, retrying separately: {e}')
+                failed.append(recipient)
+            except OSError as e:
+                # The connection is gone: reconnect for the rest of the batch.
+                logger.warning(f'SMTP connection lost sending to {recipient}: {e}')
+                failed.append(recipient)
+                connection.close()
+                try:
+                    connection.open()
+                except OSError:
+                    failed.extend(recipients[index + 1:])
+                    break
+    finally:
+        connection.close()
+
+    for recipient in failed:
+        send_email_message_task.delay(subject, message, recipient)
+    logger.info(f'Email batch sent: {sent} sent, {len(failed)} retrying')
+    return {'sent': sent, 'retrying': len(failed)}
+
+
+@shared_task
+def send_bulk_email_task(subject, message, recipient_list, batch_size=None):
+    """Split ``recipient_list`` into batches and send them in parallel across workers."""
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    batches = [recipient_list[i:i + batch_size] for i in range(0, len(recipient_list), batch_size)]
+    result = group(send_email_batch_task.s(subject, message, batch) for batch in batches).apply_async()
+    logger.info(f'Bulk email to {len(recipient_list)} recipients queued in {len(batches)} batches')
+    return result.id
+
+
 @shared_task
 def periodic_cleanup_task():
-    """Periodic task for cleanup operations."""
+    """Delete expired data in bounded batches (see apps.core.cleanup)."""
+    from .cleanup import run_cleanup
+
     logger.info('Running periodic cleanup task')
-    # Add your cleanup logic here
-    return 'Cleanup task completed'
+    results = run_cleanup()
+    if results is None:
+        return 'Cleanup already running'
+    return results
 
 
-@shared_task(bind=True, autoretry_for=(Exception,), retry_kwargs={'max_retries': 3, 'countdown': 60})
+@shared_task(
+    bind=True,
+    base=ResilientTask,
+    circuit='resilient-task',
+    retry_policy=RetryPolicy(base=5, cap=300, max_retries=8),
+)
 def resilient_task(self, data):
-    """Task with automatic retry on failure."""
-    try:
-        logger.info(f'Processing resilient task with data: {data}')
-        # Simulate potential failure
-        if data.get('should_fail', False):
-            raise ValueError('Simulated failure')
-        return f'Resilient task completed successfully: {data}'
-    except Exception as exc:
-        logger.error(f'Task failed: {exc}')
-        raise self.retry(exc=exc) 
\ No newline at end of file
+    """Task retried with jittered backoff behind a shared circuit breaker."""
+    logger.info(f'Processing resilient task with data: {data}')
+    # Simulate potential failure
+    if data.get('should_fail', False):
+        raise ValueError('Simulated failure')
+    return f'Resilient task completed successfully: {data}'
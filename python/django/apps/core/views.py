@@ -7,7 +7,10 @@ from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 import json
 
+from .page_cache import cache_anonymous_page
 
+
+@cache_anonymous_page
 def home(request):
     """Home page view."""
     stats = {
@@ -16,9 +19,13 @@ def home(request):
         'deployments': 15670,
         'uptime': '99.9%'
     }
-    return render(request, 'core/welcome.html', {'stats': stats})
+    return render(request, 'core/welcome.html', {
+        'stats': stats,
+        'fragment_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+    })
 
 
+@cache_anonymous_page
 def about(request):
     """About page view."""
     features = [
@@ -46,6 +53,7 @@ def about(request):
     return render(request, 'core/about.html', {'features': features})
 
 
+@cache_anonymous_page
 def dashboard(request):
     """Dashboard page view."""
     recent_activity = [
@@ -54,7 +62,10 @@ def dashboard(request):
         'Database backup completed',
         'SSL certificate renewed'
     ]
-    return render(request, 'core/dashboard.html', {'recent_activity': recent_activity})
+    return render(request, 'core/dashboard.html', {
+        'recent_activity': recent_activity,
+        'fragment_timeout': settings.FRAGMENT_CACHE_TIMEOUT,
+    })
 
 
 def health(request):
@@ -0,0 +1,66 @@
+"""
+Bulk item creation throughput benchmark.
+
+Compares rows/sec of looping over ``/api/v1/items/create/`` with the bulk
+endpoint fed a JSON array (bulk_create) and an NDJSON stream (COPY).
+
+    python -m benchmarks.bulk_items --rows 20000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import make_client, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--single-rows', type=int, default=1000,
+                        help='rows sent through the single-item endpoint')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from apps.api.models import Item
+
+    client = make_client()
+    rows = [
+        {'name': f'Bulk item {i}', 'description': 'Imported by benchmark', 'status': 'active'}
+        for i in range(args.rows)
+    ]
+    results = []
+
+    def record(case, count, func):
+        start = time.perf_counter()
+        response = func()
+        elapsed = time.perf_counter() - start
+        assert response.status_code == 201, response.content[:200]
+        results.append({'case': case, 'rows': count, 'seconds': elapsed, 'rows/sec': count / elapsed})
+
+    def single():
+        for row in rows[:args.single_rows]:
+            response = client.post('/api/v1/items/create/', json.dumps(row), content_type='application/json')
+        return response
+
+    record('single-item loop', args.single_rows, single)
+
+    below_copy = min(args.rows, settings.ITEMS_BULK_COPY_THRESHOLD - 1)
+    record('bulk JSON (bulk_create)', below_copy, lambda: client.post(
+        '/api/v1/items/bulk/', json.dumps(rows[:below_copy]), content_type='application/json'))
+
+    ndjson = '\n'.join(json.dumps(row) for row in rows)
+    record('bulk NDJSON (COPY)', args.rows, lambda: client.post(
+        '/api/v1/items/bulk/', ndjson, content_type='application/x-ndjson'))
+
+    baseline = results[0]['rows/sec']
+    for row in results:
+        row['speedup'] = f"{row['rows/sec'] / baseline:.1f}x"
+
+    print()
+    print_table(results, ['case', 'rows', 'seconds', 'rows/sec', 'speedup'])
+    print(f'\n{Item.objects.count()} items in table')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Redis round trips per request: django-redis vs. the two-tier cache.
+
+Replays a read-heavy mix of API requests (item list polling with
+If-None-Match, stats) in-process against each cache backend and counts
+the commands Redis processed (``INFO commandstats``). Request metrics are
+written to Redis in both cases, so reads are also reported on their own.
+
+    python -m benchmarks.cache_tiers --requests 2000
+"""
+import argparse
+import os
+import time
+
+from benchmarks.common import make_client, print_table, setup_django
+
+READ_COMMANDS = ('get', 'mget', 'pttl')
+
+
+def command_counts(client):
+    stats = client.info('commandstats')
+    return {name.removeprefix('cmdstat_'): value['calls'] for name, value in stats.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--redis-url', default=os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+    args = parser.parse_args()
+
+    setup_django()
+    import redis
+    from django.test import override_settings
+
+    backends = {
+        'django-redis': {'BACKEND': 'django_redis.cache.RedisCache', 'LOCATION': args.redis_url},
+        'two-tier': {
+            'BACKEND': 'apps.core.cache_backends.TwoTierRedisCache',
+            'LOCATION': args.redis_url,
+            'OPTIONS': {'LOCAL_KEYS': ['app.stats', 'api.items.version']},
+        },
+    }
+    server = redis.Redis.from_url(args.redis_url)
+    client = make_client()
+    results = []
+
+    for name, backend in backends.items():
+        with override_settings(CACHES={'default': backend}):
+            etag = client.get('/api/v1/items/')['ETag']
+            client.get('/api/v1/stats/')
+            time.sleep(0.5)  # let the invalidation listener subscribe
+
+            server.config_resetstat()
+            start = time.perf_counter()
+            for index in range(args.requests):
+                if index % 4 == 3:
+                    client.get('/api/v1/stats/')
+                else:
+                    client.get('/api/v1/items/', headers={'if-none-match': etag})
+            elapsed = time.perf_counter() - start
+            counts = command_counts(server)
+            counts.pop('config', None)
+            counts.pop('info', None)
+
+        reads = sum(counts.get(command, 0) for command in READ_COMMANDS)
+        results.append({
+            'backend': name,
+            'commands/request': sum(counts.values()) / args.requests,
+            'reads/request': reads / args.requests,
+            'ms/request': elapsed / args.requests * 1000,
+        })
+
+    print_table(results, ['backend', 'commands/request', 'reads/request', 'ms/request'])
+
+
+if __name__ == '__main__':
+    main()
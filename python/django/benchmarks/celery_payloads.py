@@ -0,0 +1,75 @@
+"""
+Broker bytes per task: JSON vs. the compact transport (msgpack, zlib above
+a threshold, short argument reprs in the headers).
+
+Publishes a mix of the app's task messages to a scratch queue on the Redis
+broker under each profile and reports the bytes stored in Redis per
+message, then purges the queue. No worker is needed.
+
+    python -m benchmarks.celery_payloads --messages 1000
+"""
+import argparse
+
+from benchmarks.common import print_table, setup_django
+
+QUEUE = 'benchmark-payloads'
+# The baseline raises the threshold out of reach rather than disabling
+# compression: compression=None falls back to the app's task_compression.
+PROFILES = {
+    'json': {'serializer': 'json', 'compression_threshold': float('inf'), 'argsrepr_maxsize': 1024},
+    'compact': {'serializer': 'msgpack', 'compression_threshold': 1024, 'argsrepr_maxsize': 128},
+}
+
+
+def payloads():
+    from apps.api.tasks import process_webhook_event
+    from apps.core.tasks import (
+        periodic_cleanup_task,
+        send_bulk_email_task,
+        send_email_batch_task,
+        send_email_message_task,
+    )
+
+    body = 'Hello,\n\nThe release notes for this month are below.\n' * 20
+    batch = [f'user{i}@example.com' for i in range(100)]
+    return {
+        'webhook event': (process_webhook_event, (12345,)),
+        'cleanup': (periodic_cleanup_task, ()),
+        'single email': (send_email_message_task, ('Release notes', body, 'user@example.com')),
+        'email batch (100)': (send_email_batch_task, ('Release notes', body, batch)),
+        'bulk email (10k)': (send_bulk_email_task, ('Release notes', body, [f'user{i}@example.com' for i in range(10000)])),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from config.celery import app
+
+    results = []
+    with app.connection_for_write() as connection:
+        redis = connection.default_channel.client
+        for task_name, (task, task_args) in payloads().items():
+            for profile, options in PROFILES.items():
+                app.conf['CELERY_COMPRESSION_THRESHOLD'] = options['compression_threshold']  # namespaced key wins
+                app.amqp.argsrepr_maxsize = app.amqp.kwargsrepr_maxsize = options['argsrepr_maxsize']
+                redis.delete(QUEUE)
+                for _ in range(args.messages):
+                    task.apply_async(task_args, queue=QUEUE, connection=connection, serializer=options['serializer'])
+                stored = sum(len(message) for message in redis.lrange(QUEUE, 0, -1))
+                results.append({
+                    'task': task_name,
+                    'profile': profile,
+                    'bytes/message': stored / args.messages,
+                    'redis memory/message': redis.memory_usage(QUEUE) / args.messages,
+                })
+                redis.delete(QUEUE)
+
+    print_table(results, ['task', 'profile', 'bytes/message', 'redis memory/message'])
+
+
+if __name__ == '__main__':
+    main()
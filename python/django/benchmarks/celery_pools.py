@@ -0,0 +1,183 @@
+"""
+Celery task throughput and latency under the prefork, threads and gevent
+pools.
+
+Starts one real worker per pool against the configured Redis broker
+(importing this module for its signal handlers), sends each of the app's
+tasks at ``--rate`` per second and reports, per pool and task:
+
+- queue wait: enqueue to start of execution
+- run time: start to end of execution
+- throughput: tasks completed per second, first enqueue to last finish
+
+``sample_async_task`` sleeps for 2 s per call, so it gets its own count.
+Pools are ``name:concurrency``; gevent is skipped when not installed.
+
+    python -m benchmarks.celery_pools --count 500 --rate 200
+    python -m benchmarks.celery_pools --save benchmarks/baselines/celery_pools.json
+    python -m benchmarks.celery_pools --baseline benchmarks/baselines/celery_pools.json --tolerance 0.25
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import check_baseline, print_table, save_baseline, setup_django, summarize
+
+setup_django()
+
+import redis  # noqa: E402
+from celery.signals import task_postrun, task_prerun  # noqa: E402
+
+from config.celery import app  # noqa: E402
+
+QUEUE = 'bench-pools'
+SAMPLES_KEY = 'benchmark:celery-pools:samples'
+HEADER = 'bench_enqueued_at'
+
+_client = None
+_started = {}
+
+
+def redis_client():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(app.conf.broker_url)
+    return _client
+
+
+@task_prerun.connect
+def record_start(task_id, task, **kwargs):
+    if task.request.get(HEADER) is not None:
+        _started[task_id] = time.time()
+
+
+@task_postrun.connect
+def record_finish(task_id, task, **kwargs):
+    started = _started.pop(task_id, None)
+    if started is not None:
+        sample = [started - task.request.get(HEADER), time.time() - started, time.time()]
+        redis_client().rpush(SAMPLES_KEY, json.dumps(sample))
+
+
+def workloads(args):
+    from apps.core.tasks import resilient_task, sample_async_task, send_email_task
+
+    return {
+        'send_email_task': (send_email_task, lambda i: ('Hello', 'Body', [f'user{i}@example.com']), args.count),
+        'resilient_task': (resilient_task, lambda i: ({'n': i},), args.count),
+        'sample_async_task': (sample_async_task, lambda i: (f'message {i}',), args.sleep_count),
+    }
+
+
+def start_worker(pool, concurrency):
+    name = f'{pool}@benchmark'
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'celery', '-A', 'config', 'worker', '-l', 'warning',
+            '-n', name, '-Q', QUEUE, '-I', 'benchmarks.celery_pools',
+            '-P', pool, f'--concurrency={concurrency}',
+        ],
+        env={**os.environ, 'CELERY_TASK_ALWAYS_EAGER': 'False'},
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while not app.control.ping(destination=[name], timeout=0.5):
+        if time.monotonic() > deadline:
+            process.terminate()
+            raise RuntimeError(f'worker {name} did not start')
+    return process
+
+
+def drive(task, make_args, count, args):
+    """Send ``count`` tasks at ``args.rate`` per second; returns the samples."""
+    client = redis_client()
+    client.delete(SAMPLES_KEY)
+    interval = 1 / args.rate
+    first = time.time()
+    for i in range(count):
+        # Pace against the schedule rather than sleeping a fixed interval,
+        # so publishing time does not lower the rate.
+        delay = first + i * interval - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        task.apply_async(make_args(i), queue=QUEUE, headers={HEADER: time.time()})
+    deadline = time.monotonic() + args.timeout
+    while client.llen(SAMPLES_KEY) < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+    samples = [json.loads(sample) for sample in client.lrange(SAMPLES_KEY, 0, -1)]
+    client.delete(SAMPLES_KEY)
+    return first, samples
+
+
+def run_pool(pool, concurrency, args):
+    rows = []
+    process = start_worker(pool, concurrency)
+    try:
+        for name, (task, make_args, count) in workloads(args).items():
+            if name not in args.tasks:
+                continue
+            first, samples = drive(task, make_args, count, args)
+            waits = [wait * 1000 for wait, _, _ in samples]
+            runs = [run * 1000 for _, run, _ in samples]
+            elapsed = max((finished for _, _, finished in samples), default=first) - first
+            rows.append({
+                'pool': f'{pool}:{concurrency}',
+                'task': name,
+                'completed': f'{len(samples)}/{count}',
+                'tasks/s': len(samples) / elapsed if elapsed else 0.0,
+                'wait p50': summarize(waits)['p50'],
+                'wait p99': summarize(waits)['p99'],
+                'run p50': summarize(runs)['p50'],
+                'run p99': summarize(runs)['p99'],
+            })
+    finally:
+        process.terminate()
+        process.wait()
+        redis_client().delete(QUEUE, *redis_client().keys(f'{QUEUE}*'))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--pools', nargs='+', default=['prefork:4', 'threads:16', 'gevent:100'])
+    parser.add_argument('--tasks', nargs='+', default=['send_email_task', 'resilient_task', 'sample_async_task'])
+    parser.add_argument('--count', type=int, default=500, help='tasks sent per workload')
+    parser.add_argument('--sleep-count', type=int, default=100, help='sample_async_task calls sent')
+    parser.add_argument('--rate', type=float, default=200, help='tasks sent per second')
+    parser.add_argument('--timeout', type=float, default=120, help='seconds to wait for a workload to finish')
+    parser.add_argument('--save', help='write the results as a baseline JSON file')
+    parser.add_argument('--baseline', help='compare against a baseline JSON file; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed relative regression')
+    args = parser.parse_args()
+
+    results = []
+    for spec in args.pools:
+        pool, concurrency = spec.split(':')
+        if pool == 'gevent' and importlib.util.find_spec('gevent') is None:
+            print('gevent is not installed, skipping its pool')
+            continue
+        results.extend(run_pool(pool, int(concurrency), args))
+
+    print(f'{args.rate:.0f} tasks/s offered; wait and run times in ms')
+    columns = ['pool', 'task', 'completed', 'tasks/s', 'wait p50', 'wait p99', 'run p50', 'run p99']
+    print_table(results, columns)
+
+    key = ('pool', 'task')
+    if args.save:
+        save_baseline(args.save, results, key)
+    if args.baseline:
+        failures = check_baseline(
+            args.baseline, results, key, args.tolerance,
+            higher=['tasks/s'], lower=['wait p50', 'run p50'],
+        )
+        for failure in failures:
+            print(f'REGRESSION {failure}')
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
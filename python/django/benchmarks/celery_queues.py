@@ -0,0 +1,125 @@
+"""
+Queue wait for interactive tasks under bulk load: one shared queue vs.
+per-workload queues.
+
+Starts real Celery workers against the configured Redis broker (importing
+this module for the benchmark tasks), floods them with ``--bulk`` tasks of
+``--bulk-seconds`` each, then sends ``--interactive`` short tasks at a steady
+rate and records how long each waited in the queue before starting. Both
+layouts get the same total concurrency.
+
+    python -m benchmarks.celery_queues --bulk 200 --interactive 50
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table, setup_django, summarize
+
+setup_django()
+
+from config.celery import app  # noqa: E402
+
+WAITS_KEY = 'benchmark:celery-queues:waits'
+
+# name -> (worker processes: [(queues, concurrency, prefetch)], interactive queue, bulk queue)
+LAYOUTS = {
+    'single queue': ([('bench-default', 3, 4)], 'bench-default', 'bench-default'),
+    'per-workload queues': (
+        [('bench-interactive', 1, 1), ('bench-bulk', 2, 4)],
+        'bench-interactive',
+        'bench-bulk',
+    ),
+}
+
+
+def redis_client():
+    with app.connection_for_write() as connection:
+        return connection.default_channel.client
+
+
+@app.task(name='benchmarks.interactive', ignore_result=True)
+def interactive(enqueued_at):
+    redis_client().rpush(WAITS_KEY, time.time() - enqueued_at)
+
+
+@app.task(name='benchmarks.bulk', ignore_result=True)
+def bulk(seconds):
+    time.sleep(seconds)
+
+
+def start_worker(queues, concurrency, prefetch):
+    name = f'{queues}@benchmark'
+    process = subprocess.Popen(
+        [
+            sys.executable, '-m', 'celery', '-A', 'config', 'worker', '-l', 'warning',
+            '-n', name, '-Q', queues, '-I', 'benchmarks.celery_queues',
+            f'--concurrency={concurrency}', f'--prefetch-multiplier={prefetch}',
+        ],
+        env={**os.environ, 'CELERY_TASK_ALWAYS_EAGER': 'False'},
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while not app.control.ping(destination=[name], timeout=0.5):
+        if time.monotonic() > deadline:
+            process.terminate()
+            raise RuntimeError(f'worker {name} did not start')
+    return process
+
+
+def run(layout, args):
+    workers, interactive_queue, bulk_queue = layout
+    redis = redis_client()
+    redis.delete(WAITS_KEY)
+    processes = [start_worker(*worker) for worker in workers]
+    try:
+        for _ in range(args.bulk):
+            bulk.apply_async((args.bulk_seconds,), queue=bulk_queue)
+        for _ in range(args.interactive):
+            interactive.apply_async((time.time(),), queue=interactive_queue)
+            time.sleep(args.interval)
+        deadline = time.monotonic() + args.timeout
+        while redis.llen(WAITS_KEY) < args.interactive and time.monotonic() < deadline:
+            time.sleep(0.1)
+        waits = [float(wait) * 1000 for wait in redis.lrange(WAITS_KEY, 0, -1)]
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        redis.delete(WAITS_KEY)
+        for queue in {bulk_queue, interactive_queue}:  # one list per priority level
+            for key in redis.scan_iter(f'{queue}*'):
+                redis.delete(key)
+    return waits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bulk', type=int, default=200)
+    parser.add_argument('--bulk-seconds', type=float, default=0.1)
+    parser.add_argument('--interactive', type=int, default=50)
+    parser.add_argument('--interval', type=float, default=0.1, help='seconds between interactive tasks')
+    parser.add_argument('--timeout', type=float, default=120)
+    args = parser.parse_args()
+
+    results = []
+    for name, layout in LAYOUTS.items():
+        waits = run(layout, args)
+        stats = summarize(waits)
+        results.append({
+            'layout': name,
+            'completed': f'{len(waits)}/{args.interactive}',
+            'p50': stats['p50'],
+            'p99': stats['p99'],
+            'max': max(waits, default=0.0),
+        })
+
+    print(f'{args.bulk} bulk tasks of {args.bulk_seconds}s; interactive queue wait in ms')
+    print_table(results, ['layout', 'completed', 'p50', 'p99', 'max'])
+
+
+if __name__ == '__main__':
+    main()
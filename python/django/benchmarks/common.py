@@ -0,0 +1,109 @@
+"""
+Shared helpers for the benchmark scripts.
+"""
+import json
+import os
+import statistics
+import time
+
+
+def setup_django(settings_module='config.settings.local'):
+    """Configure Django so benchmarks can use the ORM and test client."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure(func, repeat):
+    """Call ``func`` ``repeat`` times and return the latencies in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples):
+    """Latency summary (milliseconds) for a list of samples."""
+    return {
+        'count': len(samples),
+        'mean': statistics.fmean(samples) if samples else 0.0,
+        'p50': percentile(samples, 50),
+        'p95': percentile(samples, 95),
+        'p99': percentile(samples, 99),
+    }
+
+
+def print_table(rows, columns):
+    """Print ``rows`` (dicts) as a fixed-width table."""
+    widths = {
+        col: max([len(col)] + [len(format_cell(row.get(col))) for row in rows])
+        for col in columns
+    }
+    print('  '.join(col.ljust(widths[col]) for col in columns))
+    print('  '.join('-' * widths[col] for col in columns))
+    for row in rows:
+        print('  '.join(format_cell(row.get(col)).ljust(widths[col]) for col in columns))
+
+
+def format_cell(value):
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return '' if value is None else str(value)
+
+
+def make_client():
+    """Django test client that drives requests in-process, bypassing throttles."""
+    from django.test import Client
+    from rest_framework.views import APIView
+
+    # Benchmarks measure the endpoints, not the per-day throttle budget
+    # (benchmarks.throttling measures the throttles).
+    APIView.check_throttles = lambda self, request: None
+    return Client(HTTP_HOST='localhost')
+
+
+def save_baseline(path, rows, key):
+    """Write ``rows`` to ``path`` as JSON, indexed by the ``key`` columns."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    baseline = {' / '.join(str(row[col]) for col in key): row for row in rows}
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print(f'Baseline written to {path}')
+
+
+def check_baseline(path, rows, key, tolerance, higher=(), lower=(), floor=1.0):
+    """
+    Compare ``rows`` with the baseline at ``path``; returns a message per regression.
+
+    A ``higher`` column regresses when it drops by more than ``tolerance``
+    (a fraction), a ``lower`` column when it grows by more than that and by
+    more than ``floor`` in absolute terms, so sub-millisecond jitter does
+    not fail a run. Rows missing from the baseline are not compared.
+    """
+    with open(path) as f:
+        baseline = json.load(f)
+    failures = []
+    for row in rows:
+        name = ' / '.join(str(row[col]) for col in key)
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for col in higher:
+            if row[col] < old[col] * (1 - tolerance):
+                failures.append(f'{name}: {col} {row[col]:.2f} < baseline {old[col]:.2f}')
+        for col in lower:
+            if row[col] > old[col] * (1 + tolerance) and row[col] - old[col] > floor:
+                failures.append(f'{name}: {col} {row[col]:.2f} > baseline {old[col]:.2f}')
+    return failures
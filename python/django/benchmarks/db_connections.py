@@ -0,0 +1,115 @@
+"""
+Per-request PostgreSQL connections vs. the psycopg 3 connection pool.
+
+Runs ``--threads`` threads, standing in for gunicorn threads, each serving
+``--requests`` requests of one short query, so the numbers are mostly
+connection cost. Three setups are compared:
+
+- a new connection per request, as with ``CONN_MAX_AGE=0``
+- one persistent connection per thread (``CONN_MAX_AGE``)
+- a shared pool of ``--pool-size`` connections
+
+A pool smaller than the thread count shows the queueing the pool metrics
+report. Pass ``--sslmode require`` to include the TLS handshake in the
+connection cost.
+
+    python -m benchmarks.db_connections --threads 4 --requests 500
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.common import print_table, setup_django, summarize
+
+QUERY = 'SELECT oid, relname FROM pg_class ORDER BY oid LIMIT 15'
+
+
+def run_threads(threads, requests, serve):
+    """Run ``serve`` ``requests`` times in each thread; returns latencies (ms) and elapsed seconds."""
+    samples = []
+    lock = threading.Lock()
+
+    def worker():
+        local = []
+        state = {}
+        for _ in range(requests):
+            start = time.perf_counter()
+            serve(state)
+            local.append((time.perf_counter() - start) * 1000)
+        if 'connection' in state:
+            state['connection'].close()
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=500, help='requests per thread')
+    parser.add_argument('--pool-size', type=int, nargs='+', default=[4, 2], help='pool sizes to try')
+    parser.add_argument('--sslmode', default=None)
+    args = parser.parse_args()
+
+    setup_django()
+    import psycopg
+    from django.db import connection
+    from psycopg_pool import ConnectionPool
+
+    params = {**connection.get_connection_params(), 'autocommit': True}
+    params.pop('cursor_factory', None)
+    if args.sslmode:
+        params['sslmode'] = args.sslmode
+
+    def per_request(state):
+        with psycopg.connect(**params) as conn:
+            conn.execute(QUERY).fetchall()
+
+    def persistent(state):
+        if 'connection' not in state:
+            state['connection'] = psycopg.connect(**params)
+        state['connection'].execute(QUERY).fetchall()
+
+    setups = [('connect per request', per_request, None), ('persistent per thread', persistent, None)]
+    for size in args.pool_size:
+        pool = ConnectionPool(kwargs=params, min_size=size, max_size=size, open=True)
+        pool.wait()
+
+        def pooled(state, pool=pool):
+            with pool.connection() as conn:
+                conn.execute(QUERY).fetchall()
+
+        setups.append((f'pool of {size}', pooled, pool))
+
+    results = []
+    for name, serve, pool in setups:
+        if pool is not None:
+            pool.pop_stats()
+        samples, elapsed = run_threads(args.threads, args.requests, serve)
+        stats = summarize(samples)
+        row = {
+            'setup': name,
+            'req/s': len(samples) / elapsed,
+            'p50': stats['p50'],
+            'p99': stats['p99'],
+        }
+        if pool is not None:
+            pool_stats = pool.pop_stats()
+            row['queued'] = f"{pool_stats.get('requests_queued', 0)}/{pool_stats.get('requests_num', 0)}"
+            row['wait ms'] = pool_stats.get('requests_wait_ms', 0) / max(1, pool_stats.get('requests_num', 0))
+            pool.close()
+        results.append(row)
+
+    print(f'{args.threads} threads x {args.requests} requests; latencies in ms, wait ms per checkout')
+    print_table(results, ['setup', 'req/s', 'p50', 'p99', 'queued', 'wait ms'])
+
+
+if __name__ == '__main__':
+    main()
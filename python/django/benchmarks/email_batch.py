@@ -0,0 +1,65 @@
+"""
+Bulk email throughput: one SMTP connection per message vs. per batch.
+
+Sends ``--recipients`` messages to a local SMTP sink (``benchmarks.smtp_sink``)
+that delays each new connection by ``--connect-delay`` ms, standing in for the
+TCP/TLS handshake with a remote relay. Tasks run in-process, one worker.
+
+    python -m benchmarks.email_batch --recipients 2000 --connect-delay 20
+"""
+import argparse
+import logging
+import time
+
+from benchmarks.common import print_table, setup_django
+from benchmarks.smtp_sink import SMTPSink
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--recipients', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--connect-delay', type=float, default=20.0, help='milliseconds')
+    args = parser.parse_args()
+
+    setup_django()
+    logging.disable(logging.INFO)  # one log line per message/batch
+    from django.test import override_settings
+
+    from apps.core.tasks import send_email_batch_task, send_email_task
+
+    recipients = [f'user{i}@example.com' for i in range(args.recipients)]
+    batches = [recipients[i:i + args.batch_size] for i in range(0, len(recipients), args.batch_size)]
+    modes = {
+        'send_mail per message': lambda: [send_email_task('Hello', 'Body', [r]) for r in recipients],
+        f'batches of {args.batch_size}': lambda: [send_email_batch_task('Hello', 'Body', b) for b in batches],
+    }
+    results = []
+
+    for name, send in modes.items():
+        sink = SMTPSink(connect_delay=args.connect_delay / 1000).start()
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST=sink.host,
+            EMAIL_PORT=sink.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER='',
+        ):
+            start = time.perf_counter()
+            send()
+            elapsed = time.perf_counter() - start
+        sink.stop()
+        results.append({
+            'mode': name,
+            'messages': sink.messages,
+            'connections': sink.connections,
+            'msgs/s': sink.messages / elapsed,
+            'seconds': elapsed,
+        })
+
+    print(f'{args.recipients} recipients, {args.connect_delay:.0f} ms connection setup')
+    print_table(results, ['mode', 'messages', 'connections', 'msgs/s', 'seconds'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Item export memory benchmark.
+
+Streams ``/api/v1/items/export/`` in-process and samples the worker's RSS
+as chunks are consumed, next to materialising the same rows as a list.
+RSS should stay flat for the streaming cases regardless of table size.
+
+    python -m benchmarks.export
+"""
+import argparse
+import time
+
+import psutil
+
+from benchmarks.common import make_client, print_table, setup_django
+
+
+def rss_mb():
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--materialize', action='store_true',
+                        help='also build the full row list in memory for comparison')
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.api.export import EXPORT_FIELDS
+    from apps.api.models import Item
+
+    client = make_client()
+    results = []
+
+    for export_format in ('ndjson', 'csv'):
+        baseline = peak = rss_mb()
+        start = time.perf_counter()
+        response = client.get('/api/v1/items/export/', {'format': export_format})
+        size = 0
+        for index, chunk in enumerate(response.streaming_content):
+            size += len(chunk)
+            if index % 50 == 0:
+                peak = max(peak, rss_mb())
+        response.close()
+        results.append({
+            'case': f'stream {export_format}',
+            'seconds': time.perf_counter() - start,
+            'MB sent': size / 1024 / 1024,
+            'RSS growth MB': peak - baseline,
+        })
+
+    if args.materialize:
+        baseline = rss_mb()
+        start = time.perf_counter()
+        rows = [dict(zip(EXPORT_FIELDS, row, strict=True)) for row in Item.objects.values_list(*EXPORT_FIELDS)]
+        results.append({
+            'case': 'list in memory',
+            'seconds': time.perf_counter() - start,
+            'RSS growth MB': rss_mb() - baseline,
+        })
+        del rows
+
+    print(f'\n{Item.objects.count()} items\n')
+    print_table(results, ['case', 'seconds', 'MB sent', 'RSS growth MB'])
+
+
+if __name__ == '__main__':
+    main()
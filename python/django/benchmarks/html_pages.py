@@ -0,0 +1,61 @@
+"""
+HTML page latency: uncached rendering vs. the template and page caches.
+
+Requests the core pages in-process as an anonymous visitor under three
+configurations: template loaders without caching, the cached template
+loader, and the cached loader plus full-page caching.
+
+    python -m benchmarks.html_pages --repeat 500
+"""
+import argparse
+
+from benchmarks.common import make_client, measure, print_table, setup_django, summarize
+
+PAGES = ('/', '/about/', '/dashboard/')
+
+UNCACHED_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+CACHED_LOADERS = [('django.template.loaders.cached.Loader', UNCACHED_LOADERS)]
+
+
+def templates(loaders):
+    from django.conf import settings
+
+    engine = {**settings.TEMPLATES[0], 'APP_DIRS': False}
+    engine['OPTIONS'] = {**engine['OPTIONS'], 'loaders': loaders}
+    return [engine]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.test import override_settings
+
+    modes = {
+        'uncached loaders': {'TEMPLATES': templates(UNCACHED_LOADERS), 'PAGE_CACHE_TIMEOUT': 0},
+        'cached loader': {'TEMPLATES': templates(CACHED_LOADERS), 'PAGE_CACHE_TIMEOUT': 0},
+        'cached loader + pages': {'TEMPLATES': templates(CACHED_LOADERS), 'PAGE_CACHE_TIMEOUT': 300},
+    }
+    client = make_client()
+    results = []
+
+    for name, overrides in modes.items():
+        with override_settings(DEBUG=False, FRAGMENT_CACHE_TIMEOUT=0, **overrides):
+            cache.clear()
+            for page in PAGES:
+                client.get(page)  # warm up
+                stats = summarize(measure(lambda page=page: client.get(page), args.repeat))
+                results.append({'mode': name, 'page': page, 'mean': stats['mean'], 'p99': stats['p99']})
+
+    print('Latencies in ms')
+    print_table(results, ['mode', 'page', 'mean', 'p99'])
+
+
+if __name__ == '__main__':
+    main()
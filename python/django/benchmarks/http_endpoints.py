@@ -0,0 +1,212 @@
+"""
+Request rate and latency for every URL route, with regression baselines.
+
+Creates a scratch test database (``test_<name>``) and seeds it with
+``--items`` items and ``--users`` users. Then it sends each case below
+``--repeat`` times per round, in-process with ``DEBUG=False``, and keeps
+each case's best of ``--rounds`` rounds. A collectstatic runs first, since
+pages need the static manifest. Task messages go to kombu's in-memory
+transport, so runs leave nothing in the real queues. Routes without a case
+are listed at the end. The DEBUG-only routes (``core:phpinfo``,
+``core:config``, ``core:test_celery``) are measured as the 403 they return
+in production.
+
+    python -m benchmarks.http_endpoints --save benchmarks/baselines/http_endpoints.json
+    python -m benchmarks.http_endpoints --baseline benchmarks/baselines/http_endpoints.json
+
+With ``--baseline`` the run exits 1 if the p50 latency of any case grew by
+more than ``--tolerance`` (and by more than 0.5 ms). The request rate is
+reported but not compared: a single GC pause moves it more than a real
+regression of a sub-millisecond endpoint would. Baselines are
+machine-specific: record one on the machine that runs the comparison.
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+import uuid
+
+from benchmarks.common import check_baseline, make_client, print_table, save_baseline, setup_django, summarize
+
+# Routes that are not application endpoints.
+SKIPPED_NAMESPACES = ('admin', 'djdt')
+
+
+class Case:
+    """One request shape for a route; ``body`` may be a function of the request number."""
+
+    def __init__(self, route, name, method, path, status, body=None, content_type='application/json', headers=None):
+        self.route = route
+        self.name = name
+        self.method = method
+        self.path = path
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers or {}
+
+    def send(self, client, i):
+        headers = {key: value(i) if callable(value) else value for key, value in self.headers.items()}
+        if self.method == 'GET':
+            response = client.get(self.path, headers=headers)
+        else:
+            body = self.body(i) if callable(self.body) else self.body
+            response = client.post(self.path, body, content_type=self.content_type, headers=headers)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+
+def item_row(i):
+    return {'name': f'Benchmark item {i}', 'description': 'Created by the HTTP benchmark', 'status': 'active'}
+
+
+def cases(args):
+    bulk_rows = json.dumps([item_row(i) for i in range(args.bulk_rows)])
+    webhook_payload = json.dumps({'event': 'invoice.paid', 'data': {'id': 'inv_123', 'amount': 4200, 'lines': [
+        {'sku': f'sku-{n}', 'quantity': n} for n in range(20)
+    ]}})
+    return [
+        Case('api:status', 'status', 'GET', '/api/v1/status/', 200),
+        Case('api:health', 'health', 'GET', '/api/v1/health/', 200),
+        Case('api:stats', 'stats', 'GET', '/api/v1/stats/', 200),
+        Case('api:items', 'first page', 'GET', '/api/v1/items/', 200),
+        Case('api:items', 'page 50', 'GET', '/api/v1/items/?page=50', 200),
+        Case('api:items', 'cursor', 'GET', '/api/v1/items/?cursor=', 200),
+        Case('api:items', 'search', 'GET', '/api/v1/items/?search=docker', 200),
+        Case('api:items', 'not modified', 'GET', '/api/v1/items/', 304, headers={'If-None-Match': '*'}),
+        Case('api:create_item', 'create', 'POST', '/api/v1/items/create/', 201,
+             body=lambda i: json.dumps(item_row(i))),
+        Case('api:bulk_create_items', f'{args.bulk_rows} rows', 'POST', '/api/v1/items/bulk/', 201, body=bulk_rows),
+        Case('api:export_items', 'ndjson search', 'GET', '/api/v1/items/export/?search=docker', 200,
+             headers={'Accept': 'application/x-ndjson'}),
+        Case('api:webhook', 'new delivery', 'POST', '/api/v1/webhook/', 202, body=webhook_payload,
+             headers={'Idempotency-Key': lambda i: uuid.uuid4().hex}),
+        Case('api:webhook', 'duplicate', 'POST', '/api/v1/webhook/', 200, body=webhook_payload,
+             headers={'Idempotency-Key': 'benchmark-duplicate'}),
+        Case('core:home', 'home', 'GET', '/', 200),
+        Case('core:about', 'about', 'GET', '/about/', 200),
+        Case('core:dashboard', 'dashboard', 'GET', '/dashboard/', 200),
+        Case('core:health', 'health', 'GET', '/health/', 200),
+        Case('core:phpinfo', 'production 403', 'GET', '/phpinfo/', 403),
+        Case('core:config', 'production 403', 'GET', '/config/', 403),
+        Case('core:test_celery', 'production 403', 'GET', '/test-celery/', 403),
+        Case('metrics', 'scrape', 'GET', '/metrics', 200),
+    ]
+
+
+def route_names(patterns=None, namespace=None):
+    """Names of every named URL pattern, namespaced like ``reverse()`` expects."""
+    from django.urls import URLResolver, get_resolver
+
+    names = set()
+    for pattern in patterns if patterns is not None else get_resolver().url_patterns:
+        if isinstance(pattern, URLResolver):
+            inner = ':'.join(filter(None, [namespace, pattern.namespace]))
+            if pattern.namespace not in SKIPPED_NAMESPACES:
+                names |= route_names(pattern.url_patterns, inner or None)
+        elif pattern.name:
+            names.add(f'{namespace}:{pattern.name}' if namespace else pattern.name)
+    return names
+
+
+def seed(args):
+    from django.contrib.auth import get_user_model
+
+    from benchmarks.search import seed as seed_items
+
+    seed_items(args.items)
+    User = get_user_model()
+    User.objects.bulk_create(User(username=f'benchmark{i}') for i in range(args.users))
+
+
+def run_case(client, case, repeat):
+    for i in range(5):  # warm up; the last response must have the expected status
+        response = case.send(client, -1 - i)
+    if response.status_code != case.status:
+        raise RuntimeError(f'{case.route} {case.name}: expected {case.status}, got {response.status_code}')
+    samples = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        case.send(client, i)
+        samples.append((time.perf_counter() - start) * 1000)
+    stats = summarize(samples)
+    return {
+        'route': case.route,
+        'case': case.name,
+        'req/s': repeat / (sum(samples) / 1000),
+        'p50': stats['p50'],
+        'p95': stats['p95'],
+        'p99': stats['p99'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=200, help='requests per case')
+    parser.add_argument('--rounds', type=int, default=3, help='passes over all cases; the best is kept')
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--bulk-rows', type=int, default=100, help='rows per bulk create request')
+    parser.add_argument('--keepdb', action='store_true', help='reuse the scratch database between runs')
+    parser.add_argument('--nomigrations', action='store_true',
+                        help='build the schema from the models (for servers without pg_trgm)')
+    parser.add_argument('--save', help='write the results as a baseline JSON file')
+    parser.add_argument('--baseline', help='compare against a baseline JSON file; exit 1 on regression')
+    parser.add_argument('--tolerance', type=float, default=0.3, help='allowed relative regression')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.apps import apps
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.test import override_settings
+    from django.test.utils import setup_databases, teardown_databases
+
+    from config.celery import app
+
+    # Namespaced key: it takes precedence over the plain one (see config/celery.py).
+    app.conf['CELERY_BROKER_URL'] = 'memory://'
+    if args.nomigrations:
+        settings.MIGRATION_MODULES = {config.label: None for config in apps.get_app_configs()}
+    # Pages need the static manifest once DEBUG is off; unchanged files are skipped.
+    call_command('collectstatic', interactive=False, verbosity=0)
+    old_config = setup_databases(verbosity=0, interactive=False, keepdb=args.keepdb)
+    # Request logging (403 warnings, debug SQL) would be timed with the views.
+    logging.disable(logging.WARNING)
+    try:
+        with override_settings(DEBUG=False):
+            seed(args)
+            cache.clear()
+            client = make_client()
+            selected = cases(args)
+            # Rounds interleave the cases; each case keeps its best round,
+            # which filters out noise from the rest of the machine.
+            rounds = [[run_case(client, case, args.repeat) for case in selected] for _ in range(args.rounds)]
+            results = [min(runs, key=lambda row: row['p50']) for runs in zip(*rounds, strict=True)]
+    finally:
+        logging.disable(logging.NOTSET)
+        teardown_databases(old_config, verbosity=0, keepdb=args.keepdb)
+
+    print(f'{args.repeat} requests per case, best of {args.rounds} rounds, {args.items} items; latencies in ms')
+    print_table(results, ['route', 'case', 'req/s', 'p50', 'p95', 'p99'])
+    missing = sorted(route_names() - {case.route for case in selected})
+    if missing:
+        print(f'Routes without a benchmark case: {", ".join(missing)}')
+
+    key = ('route', 'case')
+    if args.save:
+        save_baseline(args.save, results, key)
+    if args.baseline:
+        failures = check_baseline(
+            args.baseline, results, key, args.tolerance, lower=['p50'], floor=0.5,
+        )
+        for failure in failures:
+            print(f'REGRESSION {failure}')
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+JSON rendering and parsing benchmark.
+
+Serialises and renders a 1k-row ``Item`` page with DRF's stock path
+(string datetimes + ``JSONRenderer``) and with the orjson path (native
+datetimes + ``ORJSONRenderer``), then parses the same body with both
+parsers. No database access: the rows are unsaved model instances.
+
+    python -m benchmarks.json_rendering --rows 1000
+"""
+import argparse
+import io
+from datetime import timedelta
+
+from benchmarks.common import measure, print_table, setup_django, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.test import override_settings
+    from django.utils import timezone
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.api.models import Item
+    from apps.api.parsers import ORJSONParser
+    from apps.api.renderers import ORJSONRenderer
+    from apps.api.serializers import ItemSerializer
+
+    now = timezone.now()
+    items = [
+        Item(id=n, name=f'Item {n}', description='Lorem ipsum dolor sit amet ' * 4,
+             status='active', created_at=now - timedelta(minutes=n), updated_at=now)
+        for n in range(args.rows)
+    ]
+
+    def render_with(renderer, datetime_format):
+        rest_framework = {**settings.REST_FRAMEWORK, 'DATETIME_FORMAT': datetime_format}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            def run():
+                data = {'status': 'success', 'data': ItemSerializer(items, many=True).data}
+                return renderer.render(data)
+            body = run()
+            return body, summarize(measure(run, args.repeat))
+
+    stock_body, stock = render_with(JSONRenderer(), 'iso-8601')
+    fast_body, fast = render_with(ORJSONRenderer(), None)
+
+    results = [
+        {'case': 'render JSONRenderer', **stock, 'rows/s': args.rows / stock['mean'] * 1000},
+        {'case': 'render ORJSONRenderer', **fast, 'rows/s': args.rows / fast['mean'] * 1000},
+    ]
+    for name, json_parser in (('parse JSONParser', JSONParser()), ('parse ORJSONParser', ORJSONParser())):
+        stats = summarize(measure(lambda json_parser=json_parser: json_parser.parse(io.BytesIO(stock_body)), args.repeat))
+        results.append({'case': name, **stats, 'rows/s': args.rows / stats['mean'] * 1000})
+
+    print(f'{args.rows} rows, {len(stock_body) / 1024:.0f} KiB body (latencies in ms)')
+    print_table(results, ['case', 'mean', 'p50', 'p95', 'rows/s'])
+    print(f'identical output: {stock_body == fast_body}')
+
+
+if __name__ == '__main__':
+    main()
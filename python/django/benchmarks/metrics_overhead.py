@@ -0,0 +1,79 @@
+"""
+Prometheus recording overhead benchmark.
+
+Times the work ``PrometheusMiddleware`` adds to each request (route lookup
+and the in-process tallies) with the in-memory registry and with the
+multiprocess (mmap file) store gunicorn workers use, and separately what
+the background flush costs per request when it runs every ``--flush-every``
+requests. Each mode runs in its own interpreter because
+``prometheus_client`` picks its storage at import time.
+
+    python -m benchmarks.metrics_overhead
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table, setup_django
+
+
+def run(iterations, flush_every):
+    """Time the request path and the flushes; returns microseconds per request for each."""
+    setup_django()
+    from apps.core.prometheus import flush, route_metrics
+
+    routes = [(f'api:route{n}', 'GET') for n in range(20)]
+    request_timings, flush_timings = [], []
+    for _ in range(5):
+        request_time = flush_time = 0.0
+        for batch in range(0, iterations, flush_every):
+            start = time.perf_counter()
+            for index in range(batch, min(batch + flush_every, iterations)):
+                metrics = route_metrics(*routes[index % len(routes)])
+                metrics.started()
+                metrics.finished(0.012, 200)
+            flushed = time.perf_counter()
+            flush()
+            request_time += flushed - start
+            flush_time += time.perf_counter() - flushed
+        request_timings.append(request_time / iterations * 1e6)
+        flush_timings.append(flush_time / iterations * 1e6)
+    return min(request_timings), min(flush_timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--flush-every', type=int, default=1000,
+                        help='requests between flushes (a worker flushes once per PROMETHEUS_FLUSH_INTERVAL)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run(args.iterations, args.flush_every)))
+        return
+
+    results = []
+    for mode in ('in-memory', 'multiprocess'):
+        env = dict(os.environ)
+        env.pop('PROMETHEUS_MULTIPROC_DIR', None)
+        with tempfile.TemporaryDirectory() as path:
+            if mode == 'multiprocess':
+                env['PROMETHEUS_MULTIPROC_DIR'] = path
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.metrics_overhead', '--child',
+                 '--iterations', str(args.iterations), '--flush-every', str(args.flush_every)],
+                env=env, check=True, capture_output=True, text=True,
+            ).stdout
+        request, flushing = json.loads(output)
+        results.append({'store': mode, 'request us': request, 'flush us/request': flushing})
+
+    print_table(results, ['store', 'request us', 'flush us/request'])
+
+
+if __name__ == '__main__':
+    main()
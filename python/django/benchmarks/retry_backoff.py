@@ -0,0 +1,79 @@
+"""
+Retry waves after an outage: fixed countdown vs. full-jitter backoff.
+
+Simulates ``--tasks`` tasks that all fail at t=0 against a dependency that
+is down for ``--outage`` seconds and, once back, serves at most
+``--capacity`` calls per second (calls over that fail and are retried
+too). Compares the old ``resilient_task`` retry (60 s fixed countdown, 3
+retries) with the ``RetryPolicy`` it uses now. No broker or Redis needed.
+
+    python -m benchmarks.retry_backoff --tasks 1000 --outage 100 --capacity 200
+"""
+import argparse
+import heapq
+import math
+from collections import Counter
+
+from benchmarks.common import print_table, setup_django
+
+setup_django()
+
+from apps.core.resilience import RetryPolicy  # noqa: E402
+
+
+class FixedCountdown:
+    def __init__(self, countdown, max_retries):
+        self.countdown_seconds = countdown
+        self.max_retries = max_retries
+
+    def countdown(self, retries):
+        return self.countdown_seconds
+
+
+POLICIES = {
+    'fixed 60s': FixedCountdown(60, 3),
+    'full jitter': RetryPolicy(base=5, cap=300, max_retries=8),
+}
+
+
+def simulate(policy, args):
+    attempts = [(0.0, task, 0) for task in range(args.tasks)]
+    heapq.heapify(attempts)
+    per_second = Counter()
+    succeeded = exhausted = 0
+    finished_at = 0.0
+    while attempts:
+        at, task, retries = heapq.heappop(attempts)
+        second = math.floor(at)
+        per_second[second] += 1
+        if at >= args.outage and per_second[second] <= args.capacity:
+            succeeded += 1
+            finished_at = max(finished_at, at)
+        elif retries < policy.max_retries:
+            heapq.heappush(attempts, (at + policy.countdown(retries), task, retries + 1))
+        else:
+            exhausted += 1
+    after = [count for second, count in per_second.items() if second >= args.outage]
+    return {
+        'calls': sum(per_second.values()),
+        'peak/s': max(after, default=0),
+        'succeeded': succeeded,
+        'exhausted': exhausted,
+        'last success s': finished_at,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--outage', type=float, default=100, help='seconds the dependency is down')
+    parser.add_argument('--capacity', type=int, default=200, help='calls per second it serves once back')
+    args = parser.parse_args()
+
+    results = [{'policy': name, **simulate(policy, args)} for name, policy in POLICIES.items()]
+    print(f'{args.tasks} tasks, {args.outage:.0f}s outage, {args.capacity} calls/s capacity after')
+    print_table(results, ['policy', 'calls', 'peak/s', 'succeeded', 'exhausted', 'last success s'])
+
+
+if __name__ == '__main__':
+    main()
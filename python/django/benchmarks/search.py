@@ -0,0 +1,124 @@
+"""
+Item search latency benchmark.
+
+Seeds ``api_item`` up to ``--items`` rows with generate_series and reports
+p50/p95/p99 latency through ``ItemSearch`` for rare terms (a few hundred
+matches), common terms (~10% of rows), prefixes and misspellings, next to
+the unindexed ``icontains`` scan it replaced.
+
+    python -m benchmarks.search --items 1000000
+"""
+import argparse
+import random
+
+from benchmarks.common import measure, print_table, setup_django, summarize
+
+# Each name holds one common word and one of 20**3 generated "rare" words.
+WORDS = [
+    'docker', 'container', 'postgres', 'database', 'redis', 'cache', 'celery',
+    'worker', 'django', 'template', 'deployment', 'pipeline', 'gateway', 'storage',
+    'metrics', 'dashboard', 'webhook', 'scheduler', 'analytics', 'invoice',
+]
+SYLLABLES = [
+    'ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'ze', 'pa',
+    'do', 'gu', 'hi', 'ja', 'be', 'fo', 'wu', 'xi', 'yo', 'qe',
+]
+
+
+def rare_word(i):
+    n = len(SYLLABLES)
+    return SYLLABLES[i % n] + SYLLABLES[(i // n) % n] + SYLLABLES[(i // n ** 2) % n]
+
+
+def seed(target):
+    """Insert synthetic items until the table holds ``target`` rows."""
+    from django.db import connection
+    from apps.api.models import Item
+
+    missing = target - Item.objects.count()
+    if missing <= 0:
+        return
+    print(f'Seeding {missing} items...')
+    words = ','.join(f"'{word}'" for word in WORDS)
+    syllables = ','.join(f"'{syllable}'" for syllable in SYLLABLES)
+    n = len(SYLLABLES)
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO api_item (name, description, status, created_at, updated_at)
+            SELECT
+                initcap(w[1 + (i * 7) %% {len(WORDS)}]) || ' '
+                    || initcap(s[1 + i %% {n}] || s[1 + (i / {n}) %% {n}] || s[1 + (i / {n ** 2}) %% {n}]),
+                'Synthetic ' || w[1 + (i * 3) %% {len(WORDS)}] || ' item for benchmarking',
+                'active',
+                now() - (i || ' seconds')::interval,
+                now()
+            FROM generate_series(1, %s) AS i,
+                 (SELECT ARRAY[{words}] AS w, ARRAY[{syllables}] AS s) AS vocab
+        """, [missing])
+        cursor.execute('ANALYZE api_item')
+
+
+def misspell(word):
+    index = random.randrange(1, len(word) - 1)
+    return word[:index] + word[index + 1] + word[index] + word[index + 2:]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--items', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=15)
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.api.models import Item
+    from apps.api.search import ItemSearch, trigram_available
+
+    seed(args.items)
+    engine = ItemSearch()
+    random.seed(42)
+
+    def rare():
+        return rare_word(random.randrange(len(SYLLABLES) ** 3))
+
+    def common():
+        return random.choice(WORDS)
+
+    # The same two orderings api_items uses: newest first, or ?sort=relevance.
+    def search(make_term, ordering=('-created_at', '-id')):
+        def run():
+            matches = engine.search(Item.objects.all(), make_term())
+            list(matches.order_by(*ordering)[:args.page_size])
+        return run
+
+    def scan(make_term):
+        def run():
+            list(Item.objects.filter(name__icontains=make_term()).order_by('-created_at', '-id')[:args.page_size])
+        return run
+
+    cases = [
+        ('rare word', search(rare)),
+        ('rare word, relevance', search(rare, ('-rank', '-id'))),
+        ('rare prefix', search(lambda: rare()[:5])),
+        ('common word', search(common)),
+        ('common word, relevance', search(common, ('-rank', '-id'))),
+        ('two words', search(lambda: f'{common()} {rare()}')),
+    ]
+    if trigram_available():
+        cases.append(('misspelt word', search(lambda: misspell(common()))))
+    cases += [
+        ('icontains rare (old)', scan(rare)),
+        ('icontains common (old)', scan(common)),
+    ]
+
+    rows = []
+    for name, func in cases:
+        func()  # warm up
+        rows.append({'case': name, **summarize(measure(func, args.queries))})
+
+    print(f'\n{Item.objects.count()} items, {args.queries} queries per case (ms)\n')
+    print_table(rows, ['case', 'count', 'mean', 'p50', 'p95', 'p99'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Concurrent-connection capacity: WSGI (sync workers) vs. ASGI (uvicorn workers).
+
+Starts gunicorn with ``config/gunicorn.conf.py`` once per worker class on a
+local port, then holds ``--connections`` concurrent keep-alive connections
+against ``--path`` for ``--duration`` seconds and reports throughput,
+latency percentiles and failed connections.
+
+    python -m benchmarks.server_concurrency --connections 200 --path /api/v1/health/
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table, summarize
+
+WORKER_CLASSES = {
+    'wsgi sync': 'sync',
+    'asgi uvicorn': 'uvicorn_worker.UvicornWorker',
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not start on port {port}')
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; returns (status, keep_alive)."""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    if headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get('content-length', 0)))
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+async def client(port, path, deadline, latencies, counters):
+    request = f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode()
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            start = time.perf_counter()
+            writer.write(request)
+            status, keep_alive = await asyncio.wait_for(read_response(reader), deadline - time.monotonic())
+            latencies.append((time.perf_counter() - start) * 1000)
+            counters[status] = counters.get(status, 0) + 1
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, TimeoutError):
+            if time.monotonic() < deadline:  # requests cut off by the deadline are not failures
+                counters['failed'] = counters.get('failed', 0) + 1
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, path, connections, duration):
+    latencies, counters = [], {}
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(client(port, path, deadline, latencies, counters) for _ in range(connections)))
+    return latencies, counters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--path', default='/api/v1/health/')
+    parser.add_argument('--connections', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    results = []
+    for name, worker_class in WORKER_CLASSES.items():
+        port = free_port()
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings.local'),
+            'GUNICORN_BIND': f'127.0.0.1:{port}',
+            'GUNICORN_WORKER_CLASS': worker_class,
+            'GUNICORN_WORKERS': str(args.workers),
+        }
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '-c', 'config/gunicorn.conf.py', '--log-level', 'warning'],
+            env=env,
+        )
+        try:
+            wait_for_port(port)
+            asyncio.run(load(port, args.path, 5, 1.0))  # warm up workers
+            latencies, counters = asyncio.run(load(port, args.path, args.connections, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+        stats = summarize(latencies)
+        results.append({
+            'server': name,
+            'req/s': stats['count'] / args.duration,
+            'p50': stats['p50'],
+            'p99': stats['p99'],
+            'failed': counters.pop('failed', 0),
+            'statuses': ' '.join(f'{code}:{count}' for code, count in sorted(counters.items())),
+        })
+
+    print(f'{args.connections} connections for {args.duration:.0f}s against {args.path} (latencies in ms)')
+    print_table(results, ['server', 'req/s', 'p50', 'p99', 'failed', 'statuses'])
+
+
+if __name__ == '__main__':
+    main()
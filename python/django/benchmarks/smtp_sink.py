@@ -0,0 +1,94 @@
+"""
+Local SMTP stand-in that accepts and discards every message.
+
+Speaks enough SMTP for Django's SMTP backend (EHLO/HELO, MAIL, RCPT, DATA,
+RSET, NOOP, QUIT) and counts connections and messages. ``--connect-delay``
+holds each new connection before the greeting, standing in for the TCP and
+TLS handshake round trips of a remote relay.
+
+    python -m benchmarks.smtp_sink --port 1025 --connect-delay 50
+
+Point the app at it with ``EMAIL_HOST=localhost EMAIL_PORT=1025
+EMAIL_USE_TLS=False EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend``.
+"""
+import argparse
+import asyncio
+import threading
+
+
+class SMTPSink:
+    """Asyncio SMTP server; ``connections`` and ``messages`` count what it received."""
+
+    def __init__(self, host='127.0.0.1', port=0, connect_delay=0.0):
+        self.host = host
+        self.port = port
+        self.connect_delay = connect_delay
+        self.connections = 0
+        self.messages = 0
+        self.loop = None
+        self.server = None
+        self.ready = threading.Event()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        writer.write(b'220 localhost SMTP sink\r\n')
+        try:
+            while line := await reader.readline():
+                command = line[:4].upper()
+                if command == b'EHLO':
+                    writer.write(b'250-localhost\r\n250-8BITMIME\r\n250 SMTPUTF8\r\n')
+                elif command == b'DATA':
+                    writer.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+                    await writer.drain()
+                    while (await reader.readline()) not in (b'.\r\n', b''):
+                        pass
+                    self.messages += 1
+                    writer.write(b'250 OK\r\n')
+                elif command == b'QUIT':
+                    writer.write(b'221 Bye\r\n')
+                    break
+                else:  # HELO, MAIL, RCPT, RSET, NOOP
+                    writer.write(b'250 OK\r\n')
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self):
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.ready.set()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def start(self):
+        """Run in a daemon thread; returns once the port is bound."""
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self.loop.create_task(self.serve())
+            self.loop.run_forever()
+
+        threading.Thread(target=run, name='smtp-sink', daemon=True).start()
+        self.ready.wait()
+        return self
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.server.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1025)
+    parser.add_argument('--connect-delay', type=float, default=0.0, help='milliseconds before the greeting')
+    args = parser.parse_args()
+
+    sink = SMTPSink(args.host, args.port, args.connect_delay / 1000)
+    print(f'SMTP sink listening on {args.host}:{args.port}')
+    asyncio.run(sink.serve())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+DRF's cache-based throttles vs. the Redis script throttles.
+
+Both run against the Redis cache from the local settings. For each history
+size (requests the client has already made this period) it reports the
+cost of one check: latency, Redis commands and bytes stored for the
+client. The script's commands run inside its single EVALSHA round trip;
+DRF's GET and SET are two round trips. It then lets ``--threads`` threads
+race for the same client's last ``--limit`` requests and counts how many
+got through.
+
+    python -m benchmarks.throttling --history 10 100 1000 --threads 8
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.common import print_table, setup_django, summarize
+
+
+def throttles():
+    from rest_framework import throttling as drf
+
+    from apps.api import throttling
+
+    return {'DRF cache history': drf.AnonRateThrottle, 'Redis script': throttling.AnonRateThrottle}
+
+
+def make_request(ip):
+    from django.test import RequestFactory
+    from rest_framework.request import Request
+
+    return Request(RequestFactory().get('/api/v1/items/', REMOTE_ADDR=ip))
+
+
+def redis_key(throttle_class, request):
+    """The Redis key holding the client's state."""
+    from django.core.cache import cache
+
+    key = throttle_class().get_cache_key(request, None)
+    return key if throttle_class.__module__ == 'apps.api.throttling' else cache.make_key(key)
+
+
+def check_cost(throttle_class, history, repeat, client):
+    request = make_request(f'10.1.{history % 256}.{repeat % 256}')
+    key = redis_key(throttle_class, request)
+    client.delete(key)
+    rate = f'{history + repeat + 1}/day'
+    with override_rate(rate):
+        for _ in range(history):
+            throttle_class().allow_request(request, None)
+        commands = client.info('stats')['total_commands_processed']
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            throttle_class().allow_request(request, None)
+            samples.append((time.perf_counter() - start) * 1000)
+        # The INFO call itself counts as one command.
+        commands = client.info('stats')['total_commands_processed'] - commands - 1
+    memory = client.memory_usage(key)
+    client.delete(key)
+    stats = summarize(samples)
+    return {'p50': stats['p50'], 'p99': stats['p99'], 'commands': commands / repeat, 'bytes': memory}
+
+
+def race(throttle_class, limit, threads, client):
+    """Threads race for ``limit`` requests; returns how many were allowed."""
+    request = make_request('10.2.0.1')
+    key = redis_key(throttle_class, request)
+    client.delete(key)
+    allowed = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        barrier.wait()
+        count = 0
+        for _ in range(limit):
+            count += throttle_class().allow_request(request, None)
+        allowed.append(count)
+
+    with override_rate(f'{limit}/day'):
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    client.delete(key)
+    return sum(allowed)
+
+
+class override_rate:
+    """Set the ``anon`` rate on the throttle classes for the block."""
+
+    def __init__(self, rate):
+        self.rate = rate
+
+    def __enter__(self):
+        from rest_framework.throttling import SimpleRateThrottle
+
+        self.saved = SimpleRateThrottle.THROTTLE_RATES
+        SimpleRateThrottle.THROTTLE_RATES = {**self.saved, 'anon': self.rate}
+
+    def __exit__(self, *exc_info):
+        from rest_framework.throttling import SimpleRateThrottle
+
+        SimpleRateThrottle.THROTTLE_RATES = self.saved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--history', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=500, help='checks timed per history size')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--limit', type=int, default=100, help='requests allowed in the race')
+    args = parser.parse_args()
+
+    setup_django()
+    from django_redis import get_redis_connection
+
+    client = get_redis_connection('default')
+    results = []
+    for name, throttle_class in throttles().items():
+        for history in args.history:
+            row = check_cost(throttle_class, history, args.repeat, client)
+            results.append({'throttle': name, 'history': history, **row})
+        results[-1]['race'] = f'{race(throttle_class, args.limit, args.threads, client)}/{args.limit}'
+
+    print(f'latencies in ms per check; race: allowed of {args.limit} with {args.threads} threads')
+    print_table(results, ['throttle', 'history', 'p50', 'p99', 'commands', 'bytes', 'race'])
+
+
+if __name__ == '__main__':
+    main()
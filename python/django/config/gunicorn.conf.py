@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration.
+
+Sync workers serve the WSGI app by default. Set ``GUNICORN_WORKER_CLASS``
+to ``uvicorn_worker.UvicornWorker`` to serve the ASGI app instead, where the
+async views (health, webhook) wait on I/O without holding a worker.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set, every worker writes its Prometheus
+samples to files in that directory. The directory is emptied when the
+master starts and a dead worker's live gauges are dropped when it exits.
+"""
+import os
+import shutil
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:3000')
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+wsgi_app = 'config.asgi:application' if 'uvicorn' in worker_class.lower() else 'config.wsgi:application'
+workers = int(os.environ.get('GUNICORN_WORKERS', 4))
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+
+def on_starting(server):
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
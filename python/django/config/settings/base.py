@@ -5,6 +5,7 @@ import os
 from pathlib import Path
 
 import environ
+from kombu import Queue
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -34,7 +35,8 @@ DJANGO_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
-    'django.contrib.staticfiles',
+    'apps.core.apps.StaticFilesConfig',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -52,13 +54,16 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.core.prometheus.PrometheusMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'apps.core.middleware.StaticFilesMiddleware',
+    'apps.core.middleware.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.RequestMetricsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -87,6 +92,63 @@ WSGI_APPLICATION = 'config.wsgi.application'
 DATABASES = {
     'default': env.db(),
 }
+# Connections are checked before reuse. PostgreSQL gets a psycopg 3 pool per
+# process (DATABASE_POOL); without one, connections persist for CONN_MAX_AGE.
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+DATABASE_POOL = env.bool('DATABASE_POOL', default=True)
+if DATABASE_POOL and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # A gunicorn thread holds at most one connection at a time; the spare
+    # slots cover threads outside the request cycle (the health monitor).
+    # Every worker process has its own pool, so the server must allow
+    # GUNICORN_WORKERS * DATABASE_POOL_MAX_SIZE connections, plus Celery.
+    _threads = env.int('GUNICORN_THREADS', default=1)
+    DATABASES['default']['OPTIONS'] = {
+        **DATABASES['default'].get('OPTIONS', {}),
+        'pool': {
+            'min_size': env.int('DATABASE_POOL_MIN_SIZE', default=_threads),
+            'max_size': env.int('DATABASE_POOL_MAX_SIZE', default=_threads + env.int('DATABASE_POOL_SPARE', default=2)),
+            # Seconds a request waits for a free connection before failing
+            'timeout': env.float('DATABASE_POOL_TIMEOUT', default=10.0),
+            # Idle connections above min_size are closed after max_idle
+            # seconds; every connection is replaced after max_lifetime.
+            'max_idle': env.float('DATABASE_POOL_MAX_IDLE', default=600.0),
+            'max_lifetime': env.float('DATABASE_POOL_MAX_LIFETIME', default=3600.0),
+            'name': 'default',
+        },
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)
+# Pool statistics are exported to Prometheus at most this often per process
+DATABASE_POOL_STATS_INTERVAL = env.float('DATABASE_POOL_STATS_INTERVAL', default=5.0)
+
+# Read replicas (comma-separated URLs) become replica1, replica2, ... with
+# the primary's connection options and a pool of their own. Add
+# ?connect_timeout=2 to the URLs: a request pays it when a replica is down.
+DATABASE_REPLICAS = []
+for _number, _url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), 1):
+    _alias = f'replica{_number}'
+    _replica = env.db_url_config(_url)
+    _options = {**DATABASES['default'].get('OPTIONS', {}), **_replica.get('OPTIONS', {})}
+    if 'pool' in _options:
+        _options['pool'] = {**_options['pool'], 'name': _alias}
+    DATABASES[_alias] = {
+        **_replica,
+        # Unset when the primary is pooled; pools need 0.
+        'CONN_MAX_AGE': DATABASES['default'].get('CONN_MAX_AGE', 0),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': _options,
+        # Tests read the replicas through the test database.
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(_alias)
+DATABASE_ROUTERS = ['apps.core.db_router.ReplicaRouter']
+# A replica further behind than this (seconds) gets no reads
+DATABASE_REPLICA_MAX_LAG = env.float('DATABASE_REPLICA_MAX_LAG', default=5.0)
+# Seconds between lag measurements, per process
+DATABASE_REPLICA_LAG_INTERVAL = env.float('DATABASE_REPLICA_LAG_INTERVAL', default=5.0)
+# After writing, a client reads from the primary for this long; keep it
+# above DATABASE_REPLICA_MAX_LAG.
+DATABASE_REPLICA_PIN_SECONDS = env.float('DATABASE_REPLICA_PIN_SECONDS', default=10.0)
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -116,7 +178,17 @@ STATIC_ROOT = env('STATIC_ROOT', default=BASE_DIR / 'staticfiles')
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Hashed names plus Brotli/gzip variants; only changed files are recompressed
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'apps.core.static_storage.IncrementalCompressedStorage',
+    },
+}
+# Compression processes for collectstatic (0: one per core)
+STATICFILES_COMPRESS_WORKERS = env.int('STATICFILES_COMPRESS_WORKERS', default=0)
 
 # Media files
 MEDIA_URL = env('MEDIA_URL', default='/media/')
@@ -144,9 +216,10 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.FormParser',
         'rest_framework.parsers.MultiPartParser',
     ],
+    # One atomic Redis script call per check (see apps/api/throttling.py)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'apps.api.throttling.AnonRateThrottle',
+        'apps.api.throttling.UserRateThrottle'
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '1000/day',
@@ -154,6 +227,88 @@ REST_FRAMEWORK = {
     }
 }
 
+# Bulk item import
+ITEMS_BULK_BATCH_SIZE = env.int('ITEMS_BULK_BATCH_SIZE', default=1000)
+ITEMS_BULK_MAX_BATCH_SIZE = env.int('ITEMS_BULK_MAX_BATCH_SIZE', default=10000)
+ITEMS_BULK_COPY_THRESHOLD = env.int('ITEMS_BULK_COPY_THRESHOLD', default=1000)
+
+# Streaming item export (rows fetched per server-side cursor round trip)
+ITEMS_EXPORT_CHUNK_SIZE = env.int('ITEMS_EXPORT_CHUNK_SIZE', default=2000)
+
+# Health checks (seconds): snapshots younger than the TTL are served as is,
+# stale ones for up to STALE_TTL more while one background refresh runs.
+HEALTH_CHECK_CACHE_TTL = env.float('HEALTH_CHECK_CACHE_TTL', default=10.0)
+HEALTH_CHECK_STALE_TTL = env.float('HEALTH_CHECK_STALE_TTL', default=30.0)
+HEALTH_CHECK_TIMEOUTS = {
+    'default': env.float('HEALTH_CHECK_TIMEOUT', default=2.0),
+}
+
+# Storage health: roots probed for writability every STORAGE_HEALTH_INTERVAL
+# seconds in the background; free space/inodes are checked per request.
+STORAGE_HEALTH_PATHS = {
+    'media': MEDIA_ROOT,
+    'static': STATIC_ROOT,
+}
+STORAGE_HEALTH_INTERVAL = env.float('STORAGE_HEALTH_INTERVAL', default=300.0)
+STORAGE_HEALTH_MIN_FREE_PERCENT = env.float('STORAGE_HEALTH_MIN_FREE_PERCENT', default=5.0)
+STORAGE_HEALTH_MIN_FREE_INODES_PERCENT = env.float('STORAGE_HEALTH_MIN_FREE_INODES_PERCENT', default=5.0)
+
+# Application stats (api_stats): cache TTL in seconds, XFetch early-refresh
+# factor, and the windows used for rates and active users (minutes)
+STATS_CACHE_TTL = env.int('STATS_CACHE_TTL', default=300)
+STATS_EARLY_REFRESH_BETA = env.float('STATS_EARLY_REFRESH_BETA', default=1.0)
+STATS_WINDOW_MINUTES = env.int('STATS_WINDOW_MINUTES', default=60)
+STATS_ACTIVE_USER_MINUTES = env.int('STATS_ACTIVE_USER_MINUTES', default=15)
+
+# Webhooks: repeated deliveries of the same key within this window are ignored
+WEBHOOK_IDEMPOTENCY_TTL = env.int('WEBHOOK_IDEMPOTENCY_TTL', default=86400)
+
+# Processed/failed webhook events are deleted after this many days
+WEBHOOK_RETENTION_DAYS = env.int('WEBHOOK_RETENTION_DAYS', default=30)
+
+# Cleanup engine (apps.core.cleanup), run by periodic_cleanup_task
+CLEANUP_TARGETS = [
+    'apps.core.cleanup.ExpiredSessions',
+    'apps.api.cleanup.OldWebhookEvents',
+    'apps.core.cleanup.OrphanedMedia',
+]
+CLEANUP_TIME_BUDGET = env.float('CLEANUP_TIME_BUDGET', default=60.0)
+CLEANUP_BATCH_PAUSE = env.float('CLEANUP_BATCH_PAUSE', default=0.1)
+CLEANUP_MAX_REPLICATION_LAG = env.float('CLEANUP_MAX_REPLICATION_LAG', default=5.0)
+CLEANUP_MAX_ACTIVE_QUERIES = env.int('CLEANUP_MAX_ACTIVE_QUERIES', default=20)
+CLEANUP_THROTTLE_SLEEP = env.float('CLEANUP_THROTTLE_SLEEP', default=1.0)
+CLEANUP_MEDIA_GRACE_HOURS = env.float('CLEANUP_MEDIA_GRACE_HOURS', default=24.0)
+
+# Circuit breakers (apps.core.resilience): open after this many failures
+# within the window, then let a probe through after the reset timeout
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = env.int('CIRCUIT_BREAKER_FAILURE_THRESHOLD', default=5)
+CIRCUIT_BREAKER_WINDOW = env.int('CIRCUIT_BREAKER_WINDOW', default=60)
+CIRCUIT_BREAKER_RESET_TIMEOUT = env.int('CIRCUIT_BREAKER_RESET_TIMEOUT', default=30)
+
+# Prometheus scrape endpoint (/metrics): clients in these addresses or
+# networks, or sending "Authorization: Bearer <METRICS_TOKEN>", may read it
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1', '::1'])
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+# Requests tally their metrics in process; a thread adds them to the
+# Prometheus metrics this often (seconds)
+PROMETHEUS_FLUSH_INTERVAL = env.float('PROMETHEUS_FLUSH_INTERVAL', default=1.0)
+
+# Fast JSON: orjson renderer and parser for the API. Serializers hand
+# datetimes to the renderer instead of formatting them field by field.
+API_FAST_JSON = env.bool('API_FAST_JSON', default=True)
+API_JSON_RENDERER = 'rest_framework.renderers.JSONRenderer'
+if API_FAST_JSON:
+    API_JSON_RENDERER = 'apps.api.renderers.ORJSONRenderer'
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [API_JSON_RENDERER]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'][0] = 'apps.api.parsers.ORJSONParser'
+    REST_FRAMEWORK['DATETIME_FORMAT'] = None
+
+# HTML page caching (apps.core.page_cache): whole pages for anonymous
+# visitors and the {% cache %} stats fragments. 0 disables; production enables.
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=0)
+PAGE_CACHE_VARY_HEADERS = env.list('PAGE_CACHE_VARY_HEADERS', default=[])
+FRAGMENT_CACHE_TIMEOUT = env.int('FRAGMENT_CACHE_TIMEOUT', default=0)
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = env('CORS_ALLOWED_ORIGINS', default=[])
 CORS_ALLOW_CREDENTIALS = True
@@ -188,6 +343,62 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+# Results are stored only for tasks declared with ignore_result=False, and
+# expire after CELERY_RESULT_EXPIRES seconds.
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_RESULT_EXPIRES = env.int('CELERY_RESULT_EXPIRES', default=3600)
+
+# Compact transport: msgpack bodies, zlib-compressed above the threshold,
+# and argument reprs in message headers cut short (see config.celery).
+# JSON is still accepted so messages queued before a deploy are consumed.
+CELERY_COMPACT_TRANSPORT = env.bool('CELERY_COMPACT_TRANSPORT', default=True)
+CELERY_COMPRESSION_THRESHOLD = env.int('CELERY_COMPRESSION_THRESHOLD', default=1024)
+CELERY_ARGSREPR_MAXSIZE = 1024
+if CELERY_COMPACT_TRANSPORT:
+    CELERY_ARGSREPR_MAXSIZE = env.int('CELERY_ARGSREPR_MAXSIZE', default=128)
+    CELERY_ACCEPT_CONTENT = ['msgpack', 'json']
+    CELERY_RESULT_ACCEPT_CONTENT = ['msgpack', 'json']
+    CELERY_TASK_SERIALIZER = 'msgpack'
+    CELERY_RESULT_SERIALIZER = 'msgpack'
+    CELERY_TASK_COMPRESSION = 'zlib-threshold'
+    CELERY_RESULT_COMPRESSION = 'zlib-threshold'
+
+# Queues by workload. Each worker profile consumes its own queues (see
+# docker-compose.yml), so interactive tasks never wait behind bulk or
+# maintenance work. Within a queue, lower priority numbers run first.
+CELERY_TASK_QUEUES = [
+    Queue('interactive'),
+    Queue('default'),
+    Queue('bulk'),
+    Queue('maintenance'),
+]
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_TASK_ROUTES = {
+    'apps.core.tasks.send_email_task': {'queue': 'interactive'},
+    'apps.core.tasks.send_email_message_task': {'queue': 'interactive'},
+    'apps.api.tasks.process_webhook_event': {'queue': 'interactive'},
+    'apps.core.tasks.send_bulk_email_task': {'queue': 'bulk'},
+    'apps.core.tasks.send_email_batch_task': {'queue': 'bulk'},
+    'apps.core.tasks.sample_async_task': {'queue': 'bulk'},
+    'apps.core.tasks.periodic_cleanup_task': {'queue': 'maintenance'},
+}
+# Priorities are task attributes: a priority in a route loses to the default.
+CELERY_TASK_ANNOTATIONS = {
+    'apps.core.tasks.send_email_task': {'priority': 1},
+    'apps.core.tasks.send_email_message_task': {'priority': 3},
+    'apps.api.tasks.process_webhook_event': {'priority': 3},
+}
+# Redis emulates priorities with one list per level; 'priority' ordering
+# makes a worker drain its queues in the order given to -Q.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+# Worker profile defaults; docker-compose overrides them per worker.
+CELERY_WORKER_PREFETCH_MULTIPLIER = env.int('CELERY_WORKER_PREFETCH_MULTIPLIER', default=1)
+CELERY_TASK_ACKS_LATE = env.bool('CELERY_TASK_ACKS_LATE', default=True)
 
 # Email configuration
 EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
@@ -196,6 +407,9 @@ EMAIL_PORT = env('EMAIL_PORT', default=587)
 EMAIL_USE_TLS = env('EMAIL_USE_TLS', default=True)
 EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
+# Bulk mail: recipients per SMTP connection, and retries per failed message
+EMAIL_BATCH_SIZE = env.int('EMAIL_BATCH_SIZE', default=100)
+EMAIL_MAX_RETRIES = env.int('EMAIL_MAX_RETRIES', default=5)
 
 # Security settings
 SECURE_BROWSER_XSS_FILTER = env('SECURE_BROWSER_XSS_FILTER', default=True)
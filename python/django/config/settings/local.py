@@ -20,6 +20,7 @@ DATABASES = {
         'PORT': env('DB_PORT', default='5432'),
     }
 }
+DATABASE_REPLICAS = []
 
 # Development cache
 CACHES = {
@@ -69,14 +70,6 @@ STATICFILES_DIRS = [
 CELERY_TASK_ALWAYS_EAGER = env.bool('CELERY_TASK_ALWAYS_EAGER', default=False)
 CELERY_TASK_EAGER_PROPAGATES = env.bool('CELERY_TASK_EAGER_PROPAGATES', default=False)
 
-# Additional Celery settings for development
-CELERY_TASK_ROUTES = {
-    # Route all tasks to default queue
-    '*': {'queue': 'default'},
-}
-CELERY_WORKER_PREFETCH_MULTIPLIER = 1
-CELERY_TASK_ACKS_LATE = True
-
 # Logging for development
 LOGGING['handlers']['console']['level'] = 'DEBUG'
 LOGGING['loggers']['django']['level'] = 'DEBUG'
@@ -89,6 +82,6 @@ SECURE_HSTS_PRELOAD = False
 
 # DRF settings for development
 REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
-    'rest_framework.renderers.JSONRenderer',
+    API_JSON_RENDERER,
     'rest_framework.renderers.BrowsableAPIRenderer',
 ] 
\ No newline at end of file
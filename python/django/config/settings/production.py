@@ -9,22 +9,33 @@ DEBUG = False
 # Production allowed hosts
 ALLOWED_HOSTS = env('ALLOWED_HOSTS', default=[])
 
-# Production database
-DATABASES = {
-    'default': env.db(),
-}
-
-# Production cache
+# Production cache: hot keys are also kept in each process (see apps.core.cache_backends)
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        'BACKEND': 'apps.core.cache_backends.TwoTierRedisCache',
         'LOCATION': env('REDIS_URL'),
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'LOCAL_KEYS': env.list('CACHE_LOCAL_KEYS', default=['app.stats', 'api.items.version', 'pages.generation']),
+            'LOCAL_MAX_ENTRIES': env.int('CACHE_LOCAL_MAX_ENTRIES', default=1000),
+            'LOCAL_TIMEOUT': env.int('CACHE_LOCAL_TIMEOUT', default=30),
         }
     }
 }
 
+# Templates are parsed once per process and kept by the cached loader
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+# Rendered pages for anonymous visitors and the stats fragments
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=300)
+FRAGMENT_CACHE_TIMEOUT = env.int('FRAGMENT_CACHE_TIMEOUT', default=60)
+
 # Security settings
 SECURE_SSL_REDIRECT = env('SECURE_SSL_REDIRECT', default=True)
 SECURE_HSTS_SECONDS = env('SECURE_HSTS_SECONDS', default=31536000)  # 1 year
@@ -43,9 +54,6 @@ CSRF_COOKIE_SECURE = True
 CSRF_COOKIE_HTTPONLY = True
 CSRF_COOKIE_SAMESITE = 'Strict'
 
-# Static files for production
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
-
 # Email configuration for production
 EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = env('EMAIL_HOST')
@@ -74,7 +82,7 @@ ADMIN_URL = env('ADMIN_URL', default='admin/')
 
 # DRF settings for production
 REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
-    'rest_framework.renderers.JSONRenderer',
+    API_JSON_RENDERER,
 ]
 
 # Rate limiting for production
@@ -14,6 +14,9 @@ DATABASES = {
         'PORT': '5432',
     }
 }
+# Routing tests list this alias in DATABASE_REPLICAS; it reads the test database.
+DATABASES['replica1'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = []
 
 # Test cache
 CACHES = {
@@ -55,7 +58,17 @@ SECURE_HSTS_INCLUDE_SUBDOMAINS = False
 SECURE_HSTS_PRELOAD = False
 
 # Static files for testing
-STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
+STORAGES = {
+    **STORAGES,
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# STATIC_ROOT only exists after collectstatic, so only probe media in tests
+STORAGE_HEALTH_PATHS = {
+    'media': MEDIA_ROOT,
+}
 
 # Test specific settings
 DEBUG = False
@@ -6,10 +6,15 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from apps.core.prometheus import metrics_view
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
     
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
+    
     # API routes
     path('api/v1/', include('apps.api.urls')),
     
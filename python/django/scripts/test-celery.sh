@@ -60,12 +60,12 @@ fi
 
 # Test Celery worker
 print_status "Testing Celery worker..."
-if docker-compose exec -T celery uv run celery -A config inspect ping | grep -q "pong"; then
+if docker-compose exec -T celery-interactive uv run celery -A config inspect ping | grep -q "pong"; then
     print_status "✅ Celery worker is responding"
 else
     print_error "❌ Celery worker is not responding"
     print_warning "Checking Celery worker logs..."
-    docker-compose logs --tail=20 celery
+    docker-compose logs --tail=20 celery-interactive celery-bulk celery-maintenance
     exit 1
 fi
 
@@ -94,8 +94,8 @@ print_status "🎉 Celery test completed!"
 
 # Show active tasks
 print_status "Active tasks:"
-docker-compose exec -T celery uv run celery -A config inspect active || true
+docker-compose exec -T celery-interactive uv run celery -A config inspect active || true
 
 # Show registered tasks
 print_status "Registered tasks:"
-docker-compose exec -T celery uv run celery -A config inspect registered || true 
\ No newline at end of file
+docker-compose exec -T celery-interactive uv run celery -A config inspect registered || true 
\ No newline at end of file
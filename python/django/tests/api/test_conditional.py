@@ -0,0 +1,84 @@
+"""
+Tests for conditional GET on the API read endpoints.
+"""
+
+import pytest
+from django.core.cache import cache
+
+from apps.api.bulk import insert_items
+from apps.api.models import Item
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+    """ETag / Last-Modified validators and 304 responses."""
+
+    def test_items_not_modified(self, client, django_assert_num_queries):
+        first = client.get('/api/v1/items/')
+        assert first['ETag'].startswith('W/"')
+        assert 'Last-Modified' in first
+
+        with django_assert_num_queries(0):
+            second = client.get('/api/v1/items/', headers={'if-none-match': first['ETag']})
+        assert second.status_code == 304
+        assert second.content == b''
+        assert second['ETag'] == first['ETag']
+
+    def test_items_if_modified_since(self, client):
+        first = client.get('/api/v1/items/')
+        second = client.get('/api/v1/items/', headers={'if-modified-since': first['Last-Modified']})
+        assert second.status_code == 304
+
+    def test_items_etag_varies_with_query(self, client):
+        first = client.get('/api/v1/items/')
+        second = client.get('/api/v1/items/?sort=name', headers={'if-none-match': first['ETag']})
+        assert second.status_code == 200
+        assert second['ETag'] != first['ETag']
+
+    def test_item_changes_invalidate(self, client, django_capture_on_commit_callbacks):
+        etag = client.get('/api/v1/items/')['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            item = Item.objects.create(name='New')
+        changed = client.get('/api/v1/items/', headers={'if-none-match': etag})
+        assert changed.status_code == 200
+
+        etag = changed['ETag']
+        with django_capture_on_commit_callbacks(execute=True):
+            item.delete()
+        assert client.get('/api/v1/items/', headers={'if-none-match': etag}).status_code == 200
+
+    def test_bulk_insert_invalidates(self, client, django_capture_on_commit_callbacks):
+        etag = client.get('/api/v1/items/')['ETag']
+        with django_capture_on_commit_callbacks(execute=True):
+            insert_items([('Bulk', '', 'active')])
+        assert client.get('/api/v1/items/', headers={'if-none-match': etag}).status_code == 200
+
+    def test_stats_strong_etag(self, client):
+        first = client.get('/api/v1/stats/')
+        assert first['ETag'].startswith('"')
+        second = client.get('/api/v1/stats/', headers={'if-none-match': first['ETag']})
+        assert second.status_code == 304
+
+    def test_status_weak_etag(self, client):
+        first = client.get('/api/v1/status/')
+        assert first['ETag'].startswith('W/"')
+        second = client.get('/api/v1/status/', headers={'if-none-match': first['ETag']})
+        assert second.status_code == 304
+
+    def test_changes_within_a_second_invalidate_if_modified_since(
+        self, client, django_capture_on_commit_callbacks
+    ):
+        last_modified = client.get('/api/v1/items/')['Last-Modified']
+        with django_capture_on_commit_callbacks(execute=True):
+            Item.objects.create(name='New')
+        changed = client.get('/api/v1/items/', headers={'if-modified-since': last_modified})
+        assert changed.status_code == 200
+        assert changed['Last-Modified'] != last_modified
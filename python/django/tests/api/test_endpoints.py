@@ -86,7 +86,7 @@ class APIEndpointsTestCase(TestCase):
             content_type='application/json'
         )
         
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.status_code, 202)
         self.assertEqual(response['Content-Type'], 'application/json')
         
         data = json.loads(response.content)
@@ -167,10 +167,11 @@ class TestAPIEndpoints:
             }
         }
         
-        response = api_client.post('/api/v1/webhook/', webhook_data)
-        assert response.status_code == 200
+        response = api_client.post(
+            '/api/v1/webhook/', json.dumps(webhook_data), content_type='application/json'
+        )
+        assert response.status_code == 202
         
         data = response.json()
         assert data['received'] is True
-        assert 'event' in data
-        assert data['event'] == 'user.created' 
\ No newline at end of file
+        assert 'event_id' in data
\ No newline at end of file
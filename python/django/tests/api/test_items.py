@@ -0,0 +1,207 @@
+"""
+Tests for the database-backed items endpoints.
+"""
+
+import json
+
+import pytest
+
+from apps.api.models import Item
+
+
+@pytest.fixture
+def items(db):
+    """Twenty items created in order."""
+    return [
+        Item.objects.create(name=f'Item {i:02d}', status='active')
+        for i in range(20)
+    ]
+
+
+@pytest.mark.django_db
+class TestItemsPagination:
+    """Page and cursor pagination for the items list."""
+
+    def test_page_mode_returns_meta(self, api_client, items):
+        response = api_client.get('/api/v1/items/', {'per_page': 5, 'page': 2})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert len(data['data']) == 5
+        assert data['meta']['total'] == 20
+        assert data['meta']['last_page'] == 4
+
+    def test_per_page_is_bounded(self, api_client, items):
+        response = api_client.get('/api/v1/items/', {'per_page': 10000, 'cursor': ''})
+        assert response.json()['meta']['per_page'] == 100
+
+    def test_cursor_mode_walks_every_row_once(self, api_client, items):
+        seen, cursor = [], ''
+        while cursor is not None:
+            response = api_client.get(
+                '/api/v1/items/', {'per_page': 6, 'cursor': cursor, 'sort': 'name', 'order': 'asc'}
+            )
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(row['name'] for row in data['data'])
+            cursor = data['meta']['next_cursor']
+
+        assert seen == sorted(item.name for item in items)
+
+    def test_cursor_breaks_ties_on_id(self, api_client, items):
+        Item.objects.update(created_at=items[0].created_at)
+
+        first = api_client.get('/api/v1/items/', {'per_page': 15, 'cursor': ''}).json()
+        second = api_client.get(
+            '/api/v1/items/', {'per_page': 15, 'cursor': first['meta']['next_cursor']}
+        ).json()
+
+        ids = [row['id'] for row in first['data'] + second['data']]
+        assert ids == sorted((item.id for item in items), reverse=True)
+        assert second['meta']['has_more'] is False
+
+    def test_cursor_is_bound_to_ordering(self, api_client, items):
+        first = api_client.get('/api/v1/items/', {'per_page': 5, 'cursor': ''}).json()
+        response = api_client.get(
+            '/api/v1/items/', {'cursor': first['meta']['next_cursor'], 'sort': 'name'}
+        )
+        assert response.status_code == 404
+
+    def test_invalid_cursor(self, api_client, items):
+        response = api_client.get('/api/v1/items/', {'cursor': 'not-a-cursor'})
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestItemsSearch:
+    """Full-text search on the items list."""
+
+    @pytest.fixture(autouse=True)
+    def catalogue(self, db):
+        Item.objects.create(name='Docker Container', description='Runs the app')
+        Item.objects.create(name='Redis Cache', description='Backs the Docker deployment')
+        Item.objects.create(name='PostgreSQL Database', description='Stores items')
+
+    def names(self, response):
+        return [row['name'] for row in response.json()['data']]
+
+    def test_prefix_match(self, api_client):
+        response = api_client.get('/api/v1/items/', {'search': 'postg'})
+        assert self.names(response) == ['PostgreSQL Database']
+
+    def test_stemmed_match(self, api_client):
+        response = api_client.get('/api/v1/items/', {'search': 'caching'})
+        assert self.names(response) == ['Redis Cache']
+
+    def test_relevance_ranks_name_above_description(self, api_client):
+        response = api_client.get('/api/v1/items/', {'search': 'docker', 'sort': 'relevance'})
+        assert self.names(response) == ['Docker Container', 'Redis Cache']
+
+    def test_no_terms_returns_nothing(self, api_client):
+        response = api_client.get('/api/v1/items/', {'search': '!!'})
+        assert self.names(response) == []
+
+
+@pytest.mark.django_db
+class TestItemsBulkCreate:
+    """Bulk creation from JSON arrays and NDJSON streams."""
+
+    url = '/api/v1/items/bulk/'
+
+    def test_json_array_reports_row_errors(self, api_client):
+        rows = [
+            {'name': 'First', 'status': 'active'},
+            {'name': '', 'status': 'active'},
+            {'name': 'Third', 'status': 'unknown'},
+            {'name': 'Fourth', 'status': 'pending', 'description': 'ok'},
+        ]
+        response = api_client.post(self.url, json.dumps(rows), content_type='application/json')
+        assert response.status_code == 201
+
+        data = response.json()
+        assert data['status'] == 'partial'
+        assert data['created'] == 2
+        assert [error['row'] for error in data['errors']] == [1, 2]
+        assert set(Item.objects.values_list('name', flat=True)) == {'First', 'Fourth'}
+
+    def test_ndjson_stream(self, api_client):
+        body = '\n'.join([
+            json.dumps({'name': 'One', 'status': 'active'}),
+            '{not json',
+            json.dumps({'name': 'Two', 'status': 'inactive'}),
+        ])
+        response = api_client.post(self.url, body, content_type='application/x-ndjson')
+        assert response.status_code == 201
+
+        data = response.json()
+        assert data['created'] == 2
+        assert data['errors'][0]['row'] == 1
+        assert 'Invalid JSON' in data['errors'][0]['errors']['non_field_errors'][0]
+
+    def test_copy_path_populates_search_vector(self, api_client, settings):
+        settings.ITEMS_BULK_COPY_THRESHOLD = 2
+        rows = [{'name': f'Copied {i}', 'status': 'active'} for i in range(3)]
+        response = api_client.post(self.url, json.dumps(rows), content_type='application/json')
+        assert response.json()['created'] == 3
+
+        search = api_client.get('/api/v1/items/', {'search': 'copied'}).json()
+        assert len(search['data']) == 3
+
+    def test_all_rows_invalid(self, api_client):
+        response = api_client.post(self.url, json.dumps([{}]), content_type='application/json')
+        assert response.status_code == 422
+        assert response.json()['status'] == 'error'
+
+    def test_rejects_non_list_body(self, api_client):
+        response = api_client.post(self.url, json.dumps({'name': 'x'}), content_type='application/json')
+        assert response.status_code == 400
+
+
+@pytest.mark.django_db
+class TestItemsExport:
+    """Streaming NDJSON and CSV exports."""
+
+    url = '/api/v1/items/export/'
+
+    def test_ndjson_export_streams_every_row(self, client, items, settings):
+        settings.ITEMS_EXPORT_CHUNK_SIZE = 7
+        response = client.get(self.url)
+        assert response.status_code == 200
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert [json.loads(line)['id'] for line in lines] == [item.id for item in items]
+
+    def test_csv_export(self, client, items):
+        response = client.get(self.url, {'format': 'csv'})
+        assert response['Content-Type'] == 'text/csv'
+        assert 'items.csv' in response['Content-Disposition']
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'id,name,description,status,created_at,updated_at'
+        assert len(lines) == len(items) + 1
+
+    def test_export_filters_by_status(self, client, items):
+        Item.objects.filter(pk=items[0].pk).update(status='pending')
+        response = client.get(self.url, {'status': 'pending'})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert len(lines) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_export_streams_asynchronously_under_asgi(settings):
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+
+    Item.objects.bulk_create(Item(name=f'Item {i:02d}', status='active') for i in range(20))
+    settings.ITEMS_EXPORT_CHUNK_SIZE = 7
+
+    async def export():
+        response = await AsyncClient().get('/api/v1/items/export/')
+        return response, [chunk async for chunk in response.streaming_content]
+
+    response, chunks = async_to_sync(export)()
+    assert response.is_async
+    assert len(chunks) == 3
+    assert len(b''.join(chunks).decode().splitlines()) == 20
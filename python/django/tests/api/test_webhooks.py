@@ -0,0 +1,120 @@
+"""
+Tests for asynchronous webhook ingestion.
+"""
+
+import json
+
+import pytest
+from django.core.cache import cache
+
+from apps.api.models import WebhookEvent
+
+WEBHOOK_URL = '/api/v1/webhook/'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def deliver(client, payload, **headers):
+    body = payload if isinstance(payload, str) else json.dumps(payload)
+    return client.post(WEBHOOK_URL, body, content_type='application/json', headers=headers)
+
+
+@pytest.mark.django_db
+class TestWebhookIngestion:
+    """202 Accepted, idempotency keys and the processing task."""
+
+    def test_delivery_is_stored_and_processed(self, client, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = deliver(client, {'event': 'user.created'}, idempotency_key='evt-1')
+
+        assert response.status_code == 202
+        event = WebhookEvent.objects.get(pk=response.json()['event_id'])
+        assert json.loads(event.payload) == {'event': 'user.created'}
+        assert event.status == WebhookEvent.Status.PROCESSED
+        assert event.processed_at is not None
+
+    def test_processing_waits_for_commit(self, client, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            response = deliver(client, {'event': 'user.created'})
+
+        assert response.status_code == 202
+        assert len(callbacks) == 1
+        assert WebhookEvent.objects.get().status == WebhookEvent.Status.RECEIVED
+
+    def test_repeated_idempotency_key_is_ignored(self, client):
+        first = deliver(client, {'event': 'a'}, idempotency_key='evt-1')
+        second = deliver(client, {'event': 'b'}, idempotency_key='evt-1')
+
+        assert first.status_code == 202
+        assert second.status_code == 200
+        assert second.json()['duplicate'] is True
+        assert WebhookEvent.objects.count() == 1
+
+    def test_body_is_the_key_without_header(self, client):
+        deliver(client, {'event': 'a'})
+        deliver(client, {'event': 'a'})
+        deliver(client, {'event': 'b'})
+        assert WebhookEvent.objects.count() == 2
+
+    def test_database_catches_duplicates_after_redis_key_expires(self, client):
+        deliver(client, {'event': 'a'}, idempotency_key='evt-1')
+        cache.clear()
+        response = deliver(client, {'event': 'a'}, idempotency_key='evt-1')
+
+        assert response.status_code == 200
+        assert response.json()['duplicate'] is True
+        assert WebhookEvent.objects.count() == 1
+
+    def test_repeated_body_is_new_after_the_ttl(self, client):
+        deliver(client, {'event': 'a'})
+        cache.clear()
+        response = deliver(client, {'event': 'a'})
+
+        assert response.status_code == 202
+        assert WebhookEvent.objects.filter(key_provided=False).count() == 2
+
+    def test_invalid_json_marks_event_failed(self, client, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            response = deliver(client, '{not json')
+
+        assert response.status_code == 202
+        event = WebhookEvent.objects.get()
+        assert event.status == WebhookEvent.Status.FAILED
+        assert event.error.startswith('Invalid JSON')
+
+    def test_deliveries_are_throttled(self, client, monkeypatch):
+        from rest_framework.throttling import SimpleRateThrottle
+
+        monkeypatch.setattr(SimpleRateThrottle, 'THROTTLE_RATES', {'anon': '2/minute', 'user': '2/minute'})
+        responses = [deliver(client, {'event': n}) for n in range(3)]
+
+        assert [response.status_code for response in responses] == [202, 202, 429]
+        assert 'Retry-After' in responses[-1]
+        assert WebhookEvent.objects.count() == 2
+
+    def test_non_json_content_type_is_rejected(self, client):
+        response = client.post(WEBHOOK_URL, {'event': 'a'})
+        assert response.status_code == 415
+        assert not WebhookEvent.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_webhook_under_asgi():
+    from asgiref.sync import async_to_sync
+    from django.test import AsyncClient
+
+    async def deliver_twice():
+        client = AsyncClient()
+        first = await client.post(WEBHOOK_URL, {'event': 'a'}, content_type='application/json')
+        second = await client.post(WEBHOOK_URL, {'event': 'a'}, content_type='application/json')
+        return first, second
+
+    first, second = async_to_sync(deliver_twice)()
+    assert first.status_code == 202
+    assert second.status_code == 200
+    assert WebhookEvent.objects.get().status == WebhookEvent.Status.PROCESSED
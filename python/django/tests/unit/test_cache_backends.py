@@ -0,0 +1,84 @@
+"""
+Unit tests for the two-tier cache's local tier and invalidation handling.
+"""
+
+from unittest import mock
+
+from django_redis.cache import RedisCache
+
+from apps.core.cache_backends import CLEAR_ALL, LocalTier, TwoTierRedisCache
+
+
+class TestLocalTier:
+    """LRU bounds, expiry and invalidation races."""
+
+    def test_lru_eviction(self):
+        tier = LocalTier(max_entries=2, timeout=60)
+        tier.set('a', b'1', None, tier.generation, now=0)
+        tier.set('b', b'2', None, tier.generation, now=0)
+        tier.get('a', now=1)
+        tier.set('c', b'3', None, tier.generation, now=1)
+        assert tier.get('a', now=1) == b'1'
+        assert tier.get('b', now=1) is None
+        assert tier.get('c', now=1) == b'3'
+
+    def test_expiry_is_bounded_by_redis_ttl(self):
+        tier = LocalTier(max_entries=10, timeout=60)
+        tier.set('a', b'1', 5, tier.generation, now=0)
+        assert tier.get('a', now=4) == b'1'
+        assert tier.get('a', now=5) is None
+
+    def test_expiry_is_bounded_by_local_timeout(self):
+        tier = LocalTier(max_entries=10, timeout=30)
+        tier.set('a', b'1', None, tier.generation, now=0)
+        assert tier.get('a', now=29) == b'1'
+        assert tier.get('a', now=30) is None
+
+    def test_read_that_raced_an_invalidation_is_not_stored(self):
+        tier = LocalTier(max_entries=10, timeout=60)
+        generation = tier.generation
+        tier.invalidate('a')
+        tier.set('a', b'stale', None, generation)
+        assert tier.get('a') is None
+
+    def test_clear_all(self):
+        tier = LocalTier(max_entries=10, timeout=60)
+        tier.set('a', b'1', None, tier.generation)
+        tier.set('b', b'2', None, tier.generation)
+        tier.invalidate(CLEAR_ALL)
+        assert tier.entries == {}
+
+
+class TestTwoTierRedisCache:
+    """Key selection and pub/sub messages (no Redis connection needed)."""
+
+    def make_cache(self):
+        return TwoTierRedisCache('redis://localhost:6379/0', {
+            'OPTIONS': {'LOCAL_KEYS': ['app.stats', 'page:*']},
+        })
+
+    def test_only_listed_keys_are_local(self):
+        cache = self.make_cache()
+        assert cache.is_local('app.stats')
+        assert cache.is_local('page:home')
+        assert not cache.is_local('app.stats.lock')
+        assert not cache.is_local('metrics:requests')
+
+    def test_messages_from_other_processes_invalidate(self):
+        cache = self.make_cache()
+        cache.local.set(':1:app.stats', b'1', None, cache.local.generation)
+        cache.handle_message(f'{cache.origin}|:1:app.stats'.encode())
+        assert cache.local.get(':1:app.stats') == b'1'
+        cache.handle_message(b'other-process|:1:app.stats')
+        assert cache.local.get(':1:app.stats') is None
+
+    def test_writes_invalidate_a_version_passed_by_position(self):
+        cache = self.make_cache()
+        with mock.patch.object(RedisCache, 'set'), mock.patch.object(RedisCache, 'delete'), \
+                mock.patch.object(cache, 'invalidate') as invalidate:
+            cache.set('app.stats', 1, 60, 2)
+            cache.delete('app.stats', 3)
+            cache.set('app.stats', 1, version=4)
+        assert invalidate.call_args_list == [
+            mock.call('app.stats', 2), mock.call('app.stats', 3), mock.call('app.stats', 4),
+        ]
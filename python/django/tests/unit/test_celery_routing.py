@@ -0,0 +1,34 @@
+"""
+Unit tests for Celery queue routing and priorities.
+"""
+
+import pytest
+
+from apps.api.tasks import process_webhook_event
+from apps.core.tasks import periodic_cleanup_task, resilient_task, send_email_batch_task, send_email_task
+from config.celery import app
+
+
+def queue_for(task):
+    return app.amqp.router.route({}, task.name)['queue'].name
+
+
+class TestRouting:
+    """Each workload goes to its own queue."""
+
+    @pytest.mark.parametrize('task, queue', [
+        (send_email_task, 'interactive'),
+        (process_webhook_event, 'interactive'),
+        (send_email_batch_task, 'bulk'),
+        (periodic_cleanup_task, 'maintenance'),
+        (resilient_task, 'default'),
+    ])
+    def test_task_queue(self, task, queue):
+        assert queue_for(task) == queue
+
+    def test_declared_queues(self):
+        assert {queue.name for queue in app.conf.task_queues} == {'interactive', 'default', 'bulk', 'maintenance'}
+
+    def test_interactive_tasks_outrank_default_priority(self):
+        assert send_email_task.priority < process_webhook_event.priority < app.conf.task_default_priority
+        assert periodic_cleanup_task.priority == app.conf.task_default_priority
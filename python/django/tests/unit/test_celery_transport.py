@@ -0,0 +1,71 @@
+"""
+Unit tests for the compact Celery transport profile.
+"""
+
+import uuid
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+import pytest
+from kombu import compression, serialization
+
+from apps.api.tasks import process_webhook_event
+from apps.core.tasks import debug_task, periodic_cleanup_task, send_bulk_email_task
+from config.celery import THRESHOLD_COMPRESSION, app
+
+
+class TestThresholdCompression:
+    """zlib above CELERY_COMPRESSION_THRESHOLD, raw below it."""
+
+    def test_small_bodies_are_not_compressed(self):
+        body = b'x' * (app.conf.compression_threshold - 1)
+        compressed, content_type = compression.compress(body, 'zlib-threshold')
+        assert content_type == THRESHOLD_COMPRESSION
+        assert compressed == b'\x00' + body
+        assert compression.decompress(compressed, content_type) == body
+
+    def test_large_bodies_are_compressed(self):
+        body = b'user@example.com,' * 1000
+        compressed, content_type = compression.compress(body, 'zlib-threshold')
+        assert len(compressed) < len(body) // 10
+        assert compression.decompress(compressed, content_type) == body
+
+
+class TestCompactProfile:
+    """Settings applied by CELERY_COMPACT_TRANSPORT."""
+
+    def test_msgpack_serialization_with_json_accepted(self):
+        assert app.conf.task_serializer == 'msgpack'
+        assert app.conf.result_serializer == 'msgpack'
+        assert set(app.conf.accept_content) == {'msgpack', 'json'}
+        assert app.conf.task_compression == 'zlib-threshold'
+
+    def test_results_are_opt_in_and_expire(self):
+        assert periodic_cleanup_task.ignore_result
+        assert process_webhook_event.ignore_result
+        assert send_bulk_email_task.ignore_result
+        assert not debug_task.ignore_result
+        assert app.conf.result_expires == 3600
+
+    def test_argument_reprs_are_truncated(self):
+        assert app.amqp.argsrepr_maxsize == 128
+        message = app.amqp.as_task_v2('id', 'apps.core.tasks.send_bulk_email_task', args=(['a@example.com'] * 1000,))
+        assert len(message.headers['argsrepr']) < 160  # saferepr overshoots slightly
+
+
+class TestMsgpackSerializer:
+    """Task payloads survive the msgpack serializer as they did JSON."""
+
+    payload = {
+        'args': [datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC), date(2026, 1, 2)],
+        'kwargs': {'amount': Decimal('12.30'), 'id': uuid.UUID(int=1), 'raw': b'\x00\xff'},
+    }
+
+    @pytest.mark.parametrize('serializer', ['msgpack', 'json'])
+    def test_round_trip(self, serializer):
+        content_type, encoding, body = serialization.dumps(self.payload, serializer=serializer)
+        assert serialization.loads(body, content_type, encoding, accept=[content_type]) == self.payload
+
+    def test_unknown_types_still_fail_to_encode(self):
+        with pytest.raises(serialization.EncodeError):
+            serialization.dumps({'value': object()}, serializer='msgpack')
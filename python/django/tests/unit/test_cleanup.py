@@ -0,0 +1,147 @@
+"""
+Unit tests for the incremental cleanup engine.
+"""
+
+import os
+import time
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.api.cleanup import OldWebhookEvents
+from apps.api.models import WebhookEvent
+from apps.core import cleanup
+from apps.core.cleanup import ExpiredSessions, OrphanedMedia, run_cleanup, run_target
+from apps.core.models import CleanupState
+
+
+@pytest.fixture(autouse=True)
+def quiet_database(settings):
+    settings.CLEANUP_BATCH_PAUSE = 0
+    settings.CLEANUP_THROTTLE_SLEEP = 0.01
+    cache.delete(cleanup.LOCK_KEY)
+    with mock.patch('apps.core.cleanup.database_busy', return_value=False):
+        yield
+
+
+def make_sessions(count, expired=True):
+    expire_date = timezone.now() + timedelta(days=-1 if expired else 1)
+    Session.objects.bulk_create(
+        Session(session_key=f'{"old" if expired else "new"}{i:05d}', session_data='', expire_date=expire_date)
+        for i in range(count)
+    )
+
+
+def far_future():
+    return time.monotonic() + 60
+
+
+@pytest.mark.django_db
+class TestModelCleanup:
+    """Batched, resumable deletes of expired rows."""
+
+    def test_deletes_only_expired_rows_in_batches(self):
+        make_sessions(25)
+        make_sessions(5, expired=False)
+        target = ExpiredSessions()
+        target.batch_size = 10
+        result = run_target(target, far_future())
+        assert result == {'deleted': 25, 'batches': 3, 'finished': True}
+        assert Session.objects.count() == 5
+        state = CleanupState.objects.get(target='sessions')
+        assert (state.cursor, state.deleted, state.passes) == (None, 25, 1)
+
+    def test_resumes_from_saved_cursor(self):
+        make_sessions(25)
+        target = ExpiredSessions()
+        target.batch_size = 10
+        first_batch = target.next_batch
+        with mock.patch.object(target, 'next_batch', side_effect=[first_batch(None, 10), RuntimeError]):
+            with pytest.raises(RuntimeError):
+                run_target(target, far_future())
+        # The run died on its second read; the first batch's cursor was saved.
+        state = CleanupState.objects.get(target='sessions')
+        assert state.cursor is not None and state.deleted == 10
+        result = run_target(ExpiredSessions(), far_future())
+        assert result['deleted'] == 15 and result['finished']
+        assert not Session.objects.exists()
+
+    def test_stops_at_deadline_without_finishing(self):
+        make_sessions(5)
+        result = run_target(ExpiredSessions(), time.monotonic() - 1)
+        assert result == {'deleted': 0, 'batches': 0, 'finished': False}
+        assert Session.objects.count() == 5
+
+    def test_old_webhook_events_keep_recent_and_pending(self, settings):
+        settings.WEBHOOK_RETENTION_DAYS = 30
+        old = timezone.now() - timedelta(days=31)
+        for status in (WebhookEvent.Status.PROCESSED, WebhookEvent.Status.FAILED, WebhookEvent.Status.RECEIVED):
+            event = WebhookEvent.objects.create(idempotency_key=f'old-{status}', status=status, payload='{}')
+            WebhookEvent.objects.filter(pk=event.pk).update(received_at=old)
+        WebhookEvent.objects.create(idempotency_key='new', status=WebhookEvent.Status.PROCESSED, payload='{}')
+        assert run_target(OldWebhookEvents(), far_future())['deleted'] == 2
+        assert sorted(WebhookEvent.objects.values_list('idempotency_key', flat=True)) == [
+            'new', f'old-{WebhookEvent.Status.RECEIVED}',
+        ]
+
+
+@pytest.mark.django_db
+class TestRunCleanup:
+    """Locking and throttling around the targets."""
+
+    def test_concurrent_run_is_skipped(self):
+        cache.add(cleanup.LOCK_KEY, True)
+        assert run_cleanup([ExpiredSessions()], budget=5) is None
+
+    def test_lock_is_released_after_run(self):
+        make_sessions(3)
+        assert run_cleanup([ExpiredSessions()], budget=5) == {
+            'sessions': {'deleted': 3, 'batches': 1, 'finished': True},
+        }
+        assert cache.add(cleanup.LOCK_KEY, True)
+
+    def test_busy_database_stops_the_run(self):
+        make_sessions(3)
+        with mock.patch('apps.core.cleanup.database_busy', return_value=True):
+            result = run_cleanup([ExpiredSessions()], budget=0.05)
+        assert result['sessions']['deleted'] == 0
+        assert Session.objects.count() == 3
+
+
+@pytest.mark.django_db
+class TestOrphanedMedia:
+    """Unreferenced, old media files are removed."""
+
+    def test_removes_only_old_unreferenced_files(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.CLEANUP_MEDIA_GRACE_HOURS = 1
+        for name in ('orphan.txt', 'kept.txt', 'fresh.txt', '.probe'):
+            (tmp_path / name).write_text('x')
+        hour_ago = time.time() - 7200
+        for name in ('orphan.txt', 'kept.txt', '.probe'):
+            os.utime(tmp_path / name, (hour_ago, hour_ago))
+        target = OrphanedMedia()
+        with mock.patch.object(target, 'referenced', return_value={'kept.txt'}):
+            result = run_target(target, far_future())
+        assert result['deleted'] == 1
+        assert sorted(os.listdir(tmp_path)) == ['.probe', 'fresh.txt', 'kept.txt']
+
+    def test_pass_lists_and_queries_once(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+        settings.CLEANUP_MEDIA_GRACE_HOURS = 1
+        hour_ago = time.time() - 7200
+        for i in range(7):
+            (tmp_path / f'{i}.txt').write_text('x')
+            os.utime(tmp_path / f'{i}.txt', (hour_ago, hour_ago))
+        target = OrphanedMedia()
+        target.batch_size = 2
+        with mock.patch.object(target, 'referenced', return_value={'3.txt'}) as referenced, \
+                mock.patch('apps.core.cleanup.os.walk', wraps=os.walk) as walk:
+            result = run_target(target, far_future())
+        assert result == {'deleted': 6, 'batches': 4, 'finished': True}
+        assert os.listdir(tmp_path) == ['3.txt']
+        assert referenced.call_count == walk.call_count == 1
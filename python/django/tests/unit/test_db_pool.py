@@ -0,0 +1,61 @@
+"""
+Unit tests for the connection pool metrics.
+"""
+
+from unittest import mock
+
+import pytest
+from django.db import connection, connections
+from prometheus_client import REGISTRY
+from psycopg_pool import ConnectionPool
+
+from apps.core import db_pool
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, {'alias': 'unit-test', **labels}) or 0.0
+
+
+@pytest.fixture
+def pool(db):
+    params = connection.get_connection_params()
+    params.pop('cursor_factory', None)
+    pool = ConnectionPool(kwargs=params, min_size=1, max_size=2, name='unit-test', open=True)
+    pool.wait()
+    pool.pop_stats()
+    yield pool
+    pool.close()
+
+
+def test_record_pool_counts_checkouts_and_sizes(pool):
+    before = sample('django_db_pool_checkouts_total', queued='false')
+    for _ in range(3):
+        with pool.connection() as conn:
+            conn.execute('SELECT 1')
+
+    db_pool.record_pool('unit-test', pool)
+
+    assert sample('django_db_pool_checkouts_total', queued='false') - before == 3
+    assert sample('django_db_pool_connections', state='size') >= 1
+    assert sample('django_db_pool_connections', state='waiting') == 0
+
+
+def test_record_pool_does_not_count_twice(pool):
+    with pool.connection() as conn:
+        conn.execute('SELECT 1')
+    db_pool.record_pool('unit-test', pool)
+    recorded = sample('django_db_pool_checkouts_total', queued='false')
+
+    db_pool.record_pool('unit-test', pool)
+
+    assert sample('django_db_pool_checkouts_total', queued='false') == recorded
+
+
+def test_record_pools_is_throttled(settings):
+    settings.DATABASE_POOL_STATS_INTERVAL = 60
+    with mock.patch.object(db_pool, 'record_pool') as record_pool, \
+            mock.patch.dict(connections.settings['default'], {'OPTIONS': {'pool': True}}):
+        db_pool.record_pools(force=True)
+        db_pool.record_pools()
+
+    assert record_pool.call_count == 1
@@ -0,0 +1,250 @@
+"""
+Unit tests for read-replica routing.
+"""
+
+import time
+from unittest import mock
+
+import pytest
+from django.db import connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.api.conditional import bump_items_version
+from apps.api.health import check_database
+from apps.api.models import Item
+from apps.core import db_router
+from apps.core.db_router import ReplicaRouter, fresh_reads, measure_lag, primary_reads, replica_reads
+from apps.core.middleware import ReplicaMiddleware
+
+router = ReplicaRouter()
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings, monkeypatch):
+    settings.DATABASE_REPLICAS = ['replica1']
+    settings.DATABASE_REPLICA_MAX_LAG = 5
+    settings.DATABASE_REPLICA_LAG_INTERVAL = 60
+    settings.DATABASE_REPLICA_PIN_SECONDS = 10
+    monkeypatch.setattr(db_router, '_replicas', None)
+    lag = {'replica1': 0.5}
+    monkeypatch.setattr(db_router, 'measure_lag', lambda alias: lag[alias])
+    return lag
+
+
+class TestReplicaRouter:
+    """Routing decisions for reads and writes."""
+
+    def test_reads_outside_a_scope_use_the_primary(self):
+        assert router.db_for_read(Item) == 'default'
+
+    def test_reads_in_a_replica_scope_use_a_replica(self):
+        with replica_reads():
+            assert router.db_for_read(Item) == 'replica1'
+            with primary_reads():
+                assert router.db_for_read(Item) == 'default'
+
+    def test_reads_after_a_write_use_the_primary(self):
+        with replica_reads():
+            assert router.db_for_write(Item) == 'default'
+            assert router.db_for_read(Item) == 'default'
+
+    def test_reads_in_a_transaction_use_the_primary(self, db):
+        with replica_reads(), transaction.atomic():
+            assert router.db_for_read(Item) == 'default'
+
+    def test_lagging_replica_leaves_and_rejoins_the_rotation(self, settings, replicas):
+        replicas['replica1'] = 30.0
+        with replica_reads():
+            assert router.db_for_read(Item) == 'default'
+
+        replicas['replica1'] = 1.0
+        settings.DATABASE_REPLICA_LAG_INTERVAL = 0
+        with replica_reads():
+            assert router.db_for_read(Item) == 'replica1'
+
+    def test_unreachable_replica_is_out_of_rotation(self, replicas):
+        replicas['replica1'] = None
+        with replica_reads():
+            assert router.db_for_read(Item) == 'default'
+
+    def test_lag_is_measured_once_per_interval(self):
+        with mock.patch.object(db_router, 'measure_lag', return_value=0.0) as measure:
+            with replica_reads():
+                router.db_for_read(Item)
+                router.db_for_read(Item)
+
+        assert measure.call_count == 1
+
+    def test_replicas_are_not_migrated(self):
+        assert router.allow_migrate('replica1', 'api') is False
+        assert router.allow_migrate('default', 'api') is None
+
+
+@pytest.mark.django_db
+def test_measure_lag_of_a_server_not_in_recovery_is_zero():
+    # ``measure_lag`` was imported before the fixture replaced it.
+    assert measure_lag('default') == 0.0
+
+
+def test_unknown_lag_is_out_of_rotation():
+    # A replica without a streaming WAL receiver that never replayed anything
+    cursor = mock.MagicMock(**{'fetchone.return_value': (None,)})
+    connection = mock.MagicMock(**{'cursor.return_value.__enter__.return_value': cursor})
+
+    with mock.patch.object(db_router, 'connections', {'replica1': connection}):
+        assert measure_lag('replica1') is None
+
+
+class TestReplicaMiddleware:
+    """Read-your-writes pinning for requests."""
+
+    def call(self, method, cookies=None, write=False):
+        routed = {}
+
+        def view(request):
+            if write:
+                router.db_for_write(Item)
+            routed['read'] = router.db_for_read(Item)
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method.lower())('/')
+        request.COOKIES.update(cookies or {})
+        response = ReplicaMiddleware(view)(request)
+        return routed['read'], response
+
+    def test_safe_requests_read_from_a_replica(self):
+        read, response = self.call('GET')
+
+        assert read == 'replica1'
+        assert ReplicaMiddleware.cookie_name not in response.cookies
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        read, response = self.call('POST', write=True)
+
+        assert read == 'default'
+        pinned_until = float(response.cookies[ReplicaMiddleware.cookie_name].value)
+        assert time.time() < pinned_until <= time.time() + 10
+
+    def test_pinned_clients_read_from_the_primary(self):
+        pinned = {ReplicaMiddleware.cookie_name: str(time.time() + 10)}
+        expired = {ReplicaMiddleware.cookie_name: str(time.time() - 1)}
+
+        assert self.call('GET', cookies=pinned)[0] == 'default'
+        assert self.call('GET', cookies=expired)[0] == 'replica1'
+
+    def test_unsafe_requests_read_from_the_primary(self):
+        read, response = self.call('POST')
+
+        assert read == 'default'
+        assert ReplicaMiddleware.cookie_name not in response.cookies
+
+
+@pytest.mark.django_db
+def test_health_check_reports_replica_lag():
+    result = check_database()
+
+    assert result['status'] == 'ok'
+    assert result['replicas'] == {'replica1': {'lag': 0.5, 'in_rotation': True}}
+
+
+class TestVersionedReads:
+    """Reads behind commit-bumped versions and shared caches use current replicas only."""
+
+    def test_writes_in_a_primary_block_pin_the_request(self):
+        with replica_reads() as scope:
+            with primary_reads():
+                router.db_for_write(Item)
+
+        assert scope.wrote
+
+    def test_fresh_reads_need_a_replica_current_as_of_the_version(self):
+        with replica_reads():
+            router.db_for_read(Item)
+            current_as_of = db_router.get_replicas().current_as_of['replica1']
+            with fresh_reads(current_as_of):
+                assert router.db_for_read(Item) == 'replica1'
+            with fresh_reads(current_as_of + 1):
+                assert router.db_for_read(Item) == 'default'
+
+    def test_fresh_reads_outside_a_replica_scope_use_the_primary(self):
+        with fresh_reads(0):
+            assert router.db_for_read(Item) == 'default'
+
+    def test_cache_refills_are_not_older_than_the_entry(self):
+        from django.core.cache import cache
+
+        from apps.core.caching import get_or_recompute
+
+        with replica_reads():
+            value, _ = get_or_recompute('router.test', lambda: router.db_for_read(Item), ttl=60)
+            assert value == 'replica1'
+            # Replace the entry with one computed after the replica was measured.
+            cache.set('router.test', {**cache.get('router.test'), 'computed_at': time.time() + 1, 'expires_at': 0})
+            value, _ = get_or_recompute('router.test', lambda: router.db_for_read(Item), ttl=60)
+        cache.delete('router.test')
+
+        assert value == 'default'
+
+    def test_cached_pages_render_from_a_replica_current_as_of_the_generation(self, settings, replicas):
+        from django.contrib.auth.models import AnonymousUser
+
+        from apps.core import page_cache
+
+        settings.PAGE_CACHE_TIMEOUT = 60
+        replicas['replica1'] = 0.0
+        routed = []
+
+        @page_cache.cache_anonymous_page
+        def page(request):
+            routed.append(router.db_for_read(Item))
+            return HttpResponse('page')
+
+        def render(path):
+            request = RequestFactory().get(path)
+            request.user = AnonymousUser()
+            with replica_reads():
+                page(request)
+
+        render('/router-test/')
+        page_cache.invalidate()
+        render('/router-test/')
+
+        assert routed == ['replica1', 'default']
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica1'])
+class TestReplicaQueries:
+    """Queries per alias for real requests, with replica1 mirroring the test database."""
+
+    def queries(self, client, path):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica1']) as replica:
+            response = client.get(path)
+            b''.join(response.streaming_content) if response.streaming else response.content
+        assert response.status_code == 200
+        return len(primary), len(replica)
+
+    @pytest.fixture(autouse=True)
+    def items(self, replicas):
+        replicas['replica1'] = 0.0
+        Item.objects.bulk_create(Item(name=f'Item {n}', status='active') for n in range(5))
+        # bulk_create sends no signals; the version is what insert_items sets.
+        bump_items_version()
+
+    def test_items_list_reads_from_a_current_replica(self, client):
+        assert self.queries(client, '/api/v1/items/') == (0, 2)
+
+    def test_items_list_waits_for_the_replica_to_replay_the_version(self, client):
+        client.get('/api/v1/items/')  # measures the replica
+        bump_items_version()
+        assert self.queries(client, '/api/v1/items/') == (2, 0)
+
+    def test_stats_refill_reads_from_the_replica(self, client):
+        primary, replica = self.queries(client, '/api/v1/stats/')
+        assert primary == 0 and replica > 0
+
+    def test_streamed_export_reads_from_the_replica(self, client):
+        primary, replica = self.queries(client, '/api/v1/items/export/')
+        assert primary == 0 and replica > 0
@@ -0,0 +1,69 @@
+"""
+Unit tests for batched email delivery.
+"""
+
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+
+from apps.core.tasks import send_bulk_email_task, send_email_batch_task
+
+
+class FlakyBackend(EmailBackend):
+    """locmem backend that fails for selected recipients and counts connections."""
+    opened = 0
+    refuse = ()
+    disconnect = ()
+
+    def open(self):
+        FlakyBackend.opened += 1
+
+    def send_messages(self, messages):
+        recipient = messages[0].to[0]
+        if recipient in self.refuse:
+            raise SMTPRecipientsRefused({recipient: (550, b'No such user')})
+        if recipient in self.disconnect:
+            raise SMTPServerDisconnected('Connection unexpectedly closed')
+        return super().send_messages(messages)
+
+
+@pytest.fixture
+def flaky_backend(settings):
+    settings.EMAIL_BACKEND = f'{__name__}.FlakyBackend'
+    FlakyBackend.opened = 0
+    yield FlakyBackend
+    FlakyBackend.refuse = FlakyBackend.disconnect = ()
+
+
+class TestEmailBatches:
+    """One connection per batch, one message per recipient."""
+
+    def test_batch_sends_one_message_per_recipient_on_one_connection(self, flaky_backend):
+        result = send_email_batch_task('Hi', 'Body', ['a@example.com', 'b@example.com', 'c@example.com'])
+        assert result == {'sent': 3, 'retrying': 0}
+        assert [message.to for message in mail.outbox] == [['a@example.com'], ['b@example.com'], ['c@example.com']]
+        assert flaky_backend.opened == 1
+
+    def test_bulk_splits_recipients_into_batches(self, flaky_backend):
+        recipients = [f'user{i}@example.com' for i in range(25)]
+        send_bulk_email_task('Hi', 'Body', recipients, batch_size=10)
+        assert sorted(message.to[0] for message in mail.outbox) == sorted(recipients)
+        assert flaky_backend.opened == 3
+
+    def test_rejected_recipient_is_retried_alone(self, flaky_backend):
+        flaky_backend.refuse = ('bad@example.com',)
+        with mock.patch('apps.core.tasks.send_email_message_task.delay') as retry:
+            result = send_email_batch_task('Hi', 'Body', ['a@example.com', 'bad@example.com', 'b@example.com'])
+        assert result == {'sent': 2, 'retrying': 1}
+        retry.assert_called_once_with('Hi', 'Body', 'bad@example.com')
+
+    def test_lost_connection_reconnects_for_the_rest_of_the_batch(self, flaky_backend):
+        flaky_backend.disconnect = ('a@example.com',)
+        with mock.patch('apps.core.tasks.send_email_message_task.delay') as retry:
+            result = send_email_batch_task('Hi', 'Body', ['a@example.com', 'b@example.com'])
+        assert result == {'sent': 1, 'retrying': 1}
+        assert flaky_backend.opened == 2
+        retry.assert_called_once_with('Hi', 'Body', 'a@example.com')
@@ -0,0 +1,130 @@
+"""
+Unit tests for the API health monitor.
+"""
+
+import threading
+import time
+
+from apps.api.health import HealthMonitor
+from apps.api.storage_health import StorageProbe
+
+
+def ok():
+    return {'status': 'ok', 'message': 'fine'}
+
+
+class CountingCheck:
+    """Check that records how often it runs."""
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return ok()
+
+
+class TestHealthMonitor:
+    """Concurrency, deadlines and caching of health checks."""
+
+    def test_checks_run_concurrently(self):
+        checks = {name: CountingCheck(delay=0.2) for name in ('a', 'b', 'c')}
+        monitor = HealthMonitor(checks, ttl=10, stale_ttl=0)
+
+        start = time.monotonic()
+        snapshot = monitor.get_snapshot()
+        assert time.monotonic() - start < 0.5
+        assert all(check['status'] == 'ok' for check in snapshot['checks'].values())
+        assert all(check['latency_ms'] >= 200 for check in snapshot['checks'].values())
+
+    def test_slow_check_times_out(self):
+        monitor = HealthMonitor(
+            {'fast': ok, 'slow': CountingCheck(delay=0.5)},
+            ttl=10, stale_ttl=0, timeouts={'slow': 0.05},
+        )
+        checks = monitor.get_snapshot()['checks']
+        assert checks['fast']['status'] == 'ok'
+        assert checks['slow']['status'] == 'error'
+        assert 'timed out' in checks['slow']['message']
+
+    def test_fresh_snapshot_is_reused(self):
+        check = CountingCheck()
+        monitor = HealthMonitor({'a': check}, ttl=10, stale_ttl=0)
+
+        assert monitor.get_snapshot()['cached'] is False
+        assert monitor.get_snapshot()['cached'] is True
+        assert check.calls == 1
+
+    def test_concurrent_probes_share_one_run(self):
+        check = CountingCheck(delay=0.1)
+        monitor = HealthMonitor({'a': check}, ttl=10, stale_ttl=0)
+
+        threads = [threading.Thread(target=monitor.get_snapshot) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert check.calls == 1
+
+    def test_stale_snapshot_served_while_revalidating(self):
+        check = CountingCheck(delay=0.1)
+        monitor = HealthMonitor({'a': check}, ttl=0.05, stale_ttl=10)
+        first = monitor.get_snapshot()
+        time.sleep(0.06)
+
+        stale = monitor.get_snapshot()
+        assert stale['cached'] is True
+        assert stale['timestamp'] == first['timestamp']
+
+        time.sleep(0.2)
+        assert check.calls == 2
+        assert monitor.get_snapshot()['timestamp'] != first['timestamp']
+
+
+class TestStorageProbe:
+    """Background writability probe and per-request statvfs checks."""
+
+    def make_probe(self, paths, **kwargs):
+        options = {'interval': 3600, 'min_free_percent': 0, 'min_free_inodes_percent': 0, **kwargs}
+        return StorageProbe(paths, **options)
+
+    def test_writable_roots_are_ok(self, tmp_path):
+        probe = self.make_probe({'media': tmp_path})
+        try:
+            result = probe.check()
+        finally:
+            probe.stop()
+        assert result['status'] == 'ok'
+        assert result['paths']['media']['writable'] is True
+        assert result['probed_at'] is not None
+
+    def test_requests_do_not_write(self, tmp_path, monkeypatch):
+        probe = self.make_probe({'media': tmp_path})
+        probes = []
+        monkeypatch.setattr(probe, 'probe_writable', lambda: probes.append(1))
+        try:
+            for _ in range(5):
+                probe.check()
+        finally:
+            probe.stop()
+        assert probes == [1]
+
+    def test_missing_root_is_an_error(self, tmp_path):
+        probe = self.make_probe({'media': tmp_path / 'missing'})
+        try:
+            result = probe.check()
+        finally:
+            probe.stop()
+        assert result['status'] == 'error'
+        assert result['paths']['media']['writable'] is False
+
+    def test_free_space_threshold(self, tmp_path):
+        probe = self.make_probe({'media': tmp_path}, min_free_percent=101)
+        try:
+            result = probe.check()
+        finally:
+            probe.stop()
+        assert result['status'] == 'error'
+        assert 'space free' in result['message']
@@ -0,0 +1,55 @@
+"""
+Unit tests for the orjson renderer and parser.
+"""
+
+import io
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from apps.api.parsers import ORJSONParser
+from apps.api.renderers import ORJSONRenderer
+
+
+class TestORJSONRenderer:
+    """Output compatibility with DRF's JSONRenderer."""
+
+    def test_matches_stock_renderer(self):
+        data = {
+            'created_at': datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=UTC),
+            'price': Decimal('1.50'),
+            'label': gettext_lazy('Active'),
+            'tags': ['a', 'b'],
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_none_renders_empty_body(self):
+        assert ORJSONRenderer().render(None) == b''
+
+    def test_indent_from_accept_header(self):
+        body = ORJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+        assert body == b'{\n  "a": 1\n}'
+
+
+class TestORJSONParser:
+    """Parsing and error reporting."""
+
+    def test_parses_body(self):
+        assert ORJSONParser().parse(io.BytesIO(b'{"a": [1, 2]}')) == {'a': [1, 2]}
+
+    def test_invalid_json_is_a_parse_error(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"a": '))
+
+
+@pytest.mark.django_db
+def test_item_datetimes_rendered_natively(client):
+    from apps.api.models import Item
+
+    item = Item.objects.create(name='Dated')
+    data = client.get('/api/v1/items/').json()['data'][0]
+    assert data['created_at'] == item.created_at.isoformat().replace('+00:00', 'Z')
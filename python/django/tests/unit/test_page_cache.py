@@ -0,0 +1,74 @@
+"""
+Unit tests for anonymous page caching and fragment invalidation.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.urls import reverse
+
+from apps.core import page_cache
+
+
+@pytest.fixture(autouse=True)
+def page_caching(settings):
+    settings.PAGE_CACHE_TIMEOUT = 300
+    settings.FRAGMENT_CACHE_TIMEOUT = 60
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+class TestAnonymousPageCache:
+    """Whole-page caching for anonymous visitors."""
+
+    def test_second_request_is_served_from_cache(self, client):
+        first = client.get(reverse('core:home'))
+        second = client.get(reverse('core:home'))
+        assert first['X-Page-Cache'] == 'miss'
+        assert second['X-Page-Cache'] == 'hit'
+        assert second.content == first.content
+
+    def test_query_string_is_part_of_the_key(self, client):
+        client.get(reverse('core:about'))
+        response = client.get(reverse('core:about') + '?ref=docs')
+        assert response['X-Page-Cache'] == 'miss'
+
+    def test_vary_headers_are_part_of_the_key(self, client, settings):
+        settings.PAGE_CACHE_VARY_HEADERS = ['Accept-Language']
+        client.get(reverse('core:about'), HTTP_ACCEPT_LANGUAGE='en')
+        response = client.get(reverse('core:about'), HTTP_ACCEPT_LANGUAGE='de')
+        assert response['X-Page-Cache'] == 'miss'
+
+    def test_authenticated_users_bypass_cache(self, authenticated_client):
+        client, _ = authenticated_client
+        client.get(reverse('core:dashboard'))
+        response = client.get(reverse('core:dashboard'))
+        assert 'X-Page-Cache' not in response
+
+    def test_disabled_when_timeout_is_zero(self, client, settings):
+        settings.PAGE_CACHE_TIMEOUT = 0
+        client.get(reverse('core:home'))
+        response = client.get(reverse('core:home'))
+        assert 'X-Page-Cache' not in response
+
+
+@pytest.mark.django_db
+class TestInvalidation:
+    """invalidate() drops cached pages and stats fragments."""
+
+    def test_invalidate_drops_pages_and_fragments(self, client):
+        client.get(reverse('core:dashboard'))
+        assert cache.get(make_template_fragment_key('dashboard_stats')) is not None
+
+        page_cache.invalidate()
+
+        assert cache.get(make_template_fragment_key('dashboard_stats')) is None
+        assert client.get(reverse('core:dashboard'))['X-Page-Cache'] == 'miss'
+
+    def test_new_user_invalidates_on_commit(self, client, django_user_model, django_capture_on_commit_callbacks):
+        client.get(reverse('core:home'))
+        with django_capture_on_commit_callbacks(execute=True):
+            django_user_model.objects.create_user(username='newcomer', password='x')
+        assert client.get(reverse('core:home'))['X-Page-Cache'] == 'miss'
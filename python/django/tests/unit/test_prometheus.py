@@ -0,0 +1,97 @@
+"""
+Unit tests for the Prometheus request metrics.
+"""
+
+from unittest import mock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from apps.api import views
+from apps.core.prometheus import flush, route_metrics, route_name
+
+
+def sample(name, **labels):
+    flush()
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestPrometheusMiddleware:
+    """Per-route latency, status counts and the scrape endpoint."""
+
+    def test_request_is_recorded_under_its_url_name(self, client):
+        labels = {'route': 'api:status', 'method': 'GET'}
+        before = sample('django_http_request_duration_seconds_count', **labels)
+        ok_before = sample('django_http_responses_total', status='200', **labels)
+
+        client.get('/api/v1/status/')
+
+        assert sample('django_http_request_duration_seconds_count', **labels) == before + 1
+        assert sample('django_http_responses_total', status='200', **labels) == ok_before + 1
+        assert sample('django_http_requests_in_flight', route='api:status') == 0
+
+    def test_unresolved_urls_share_one_label(self, client):
+        labels = {'route': 'unmatched', 'method': 'GET'}
+        before = sample('django_http_responses_total', status='404', **labels)
+
+        client.get('/no-such-page/a')
+        client.get('/no-such-page/b')
+
+        assert sample('django_http_responses_total', status='404', **labels) == before + 2
+
+    def test_tallies_are_flushed_into_the_histogram(self):
+        labels = {'route': 'test:flush', 'method': 'GET'}
+        before = {
+            le: sample('django_http_request_duration_seconds_bucket', le=le, **labels)
+            for le in ('0.005', '0.01', '+Inf')
+        }
+        metrics = route_metrics('test:flush', 'GET')
+        for duration in (0.001, 0.005, 0.007, 20.0):
+            metrics.started()
+            metrics.finished(duration, 200)
+
+        assert sample('django_http_request_duration_seconds_bucket', le='0.005', **labels) == before['0.005'] + 2
+        assert sample('django_http_request_duration_seconds_bucket', le='0.01', **labels) == before['0.01'] + 3
+        assert sample('django_http_request_duration_seconds_bucket', le='+Inf', **labels) == before['+Inf'] + 4
+        assert sample('django_http_request_duration_seconds_sum', **labels) == pytest.approx(20.013)
+        assert sample('django_http_responses_total', status='200', **labels) == 4
+
+    def test_metrics_endpoint(self, client):
+        client.get('/api/v1/status/')
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        assert b'django_http_request_duration_seconds_bucket{' in response.content
+
+
+    def test_metrics_endpoint_is_restricted(self, client, settings):
+        settings.METRICS_ALLOWED_IPS = ['10.0.0.0/8']
+        settings.METRICS_TOKEN = 'scrape-secret'
+
+        assert client.get('/metrics').status_code == 403
+        assert client.get('/metrics', REMOTE_ADDR='10.1.2.3').status_code == 200
+        assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+        assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+class TestRouteName:
+    """Route resolution before the view runs."""
+
+    def test_paths_resolve_to_url_names(self):
+        assert route_name('/api/v1/items/') == 'api:items'
+        assert route_name('/no-such-page/') == 'unmatched'
+
+    @pytest.mark.django_db
+    def test_in_flight_is_labelled_by_route_while_the_view_runs(self, client):
+        seen = []
+        status = views.api_status.cls.get
+
+        def get(self, request, *args, **kwargs):
+            seen.append(sample('django_http_requests_in_flight', route='api:status'))
+            return status(self, request, *args, **kwargs)
+
+        with mock.patch.object(views.api_status.cls, 'get', get):
+            client.get('/api/v1/status/')
+
+        assert seen == [1]
+        assert sample('django_http_requests_in_flight', route='api:status') == 0
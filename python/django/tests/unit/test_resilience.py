@@ -0,0 +1,119 @@
+"""
+Unit tests for the retry policy and circuit breaker.
+"""
+
+from unittest import mock
+
+import pytest
+from celery.exceptions import Retry
+from django.core.cache import cache
+
+from apps.core.resilience import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen, RetryPolicy
+from apps.core.tasks import resilient_task
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def expire_open_period(breaker):
+    cache.delete(breaker.open_key)
+
+
+class TestRetryPolicy:
+    """Full-jitter exponential backoff."""
+
+    def test_countdown_is_jittered_below_the_exponential_bound(self):
+        policy = RetryPolicy(base=2, cap=300)
+        for retries, bound in [(0, 2), (1, 4), (3, 16)]:
+            delays = [policy.countdown(retries) for _ in range(200)]
+            assert all(0 <= delay <= bound for delay in delays)
+            assert len(set(delays)) > 1
+
+    def test_countdown_is_capped(self):
+        with mock.patch('random.uniform', side_effect=lambda low, high: high):
+            assert RetryPolicy(base=2, cap=300).countdown(20) == 300
+
+
+class TestCircuitBreaker:
+    """Closed, open and half-open transitions."""
+
+    def test_opens_after_threshold_failures(self):
+        breaker = CircuitBreaker('dep', failure_threshold=3, window=60, reset_timeout=30)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.state() == CLOSED and breaker.allow()
+        breaker.record_failure()
+        assert breaker.state() == OPEN
+        assert not breaker.allow()
+        assert 0 < breaker.retry_after() <= 30
+
+    def test_half_open_lets_one_probe_through(self):
+        breaker = CircuitBreaker('dep', failure_threshold=1, window=60, reset_timeout=30)
+        breaker.record_failure()
+        expire_open_period(breaker)
+        assert breaker.state() == HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    def test_successful_probe_closes(self):
+        breaker = CircuitBreaker('dep', failure_threshold=1, window=60, reset_timeout=30)
+        breaker.record_failure()
+        expire_open_period(breaker)
+        breaker.allow()
+        breaker.record_success()
+        assert breaker.state() == CLOSED
+        assert breaker.allow() and breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker('dep', failure_threshold=5, window=60, reset_timeout=30)
+        breaker.open()
+        expire_open_period(breaker)
+        breaker.allow()
+        breaker.record_failure()
+        assert breaker.state() == OPEN
+
+
+class TestResilientTask:
+    """Tasks retry with the policy and respect the circuit."""
+
+    def test_failure_retries_with_policy_countdown(self):
+        with mock.patch.object(resilient_task.retry_policy, 'countdown', return_value=7) as countdown:
+            with pytest.raises(Retry) as retry:
+                resilient_task.delay({'should_fail': True})
+        countdown.assert_called_once_with(0)
+        assert retry.value.when == 7
+        assert cache.get(CircuitBreaker('resilient-task').failures_key) == 1
+
+    def test_open_circuit_skips_the_task_body(self):
+        CircuitBreaker('resilient-task', reset_timeout=30).open()
+        with mock.patch('apps.core.tasks.logger') as logger:
+            with pytest.raises(Retry) as retry:
+                resilient_task.delay({})
+        logger.info.assert_not_called()
+        assert isinstance(retry.value.exc, CircuitOpen)
+        assert retry.value.when >= 29
+
+    def test_deferrals_do_not_use_retries(self):
+        CircuitBreaker('resilient-task', reset_timeout=30).open()
+        max_retries = resilient_task.retry_policy.max_retries
+        with pytest.raises(Retry) as retry:
+            resilient_task.apply(({},), retries=max_retries, headers={'deferrals': 4})
+        assert retry.value.sig.options['retries'] == max_retries
+        assert retry.value.sig.options['headers'] == {'deferrals': 5}
+
+    def test_deferrals_have_their_own_cap(self):
+        CircuitBreaker('resilient-task', reset_timeout=30).open()
+        max_deferrals = resilient_task.retry_policy.max_deferrals
+        with pytest.raises(CircuitOpen):
+            resilient_task.apply(({},), headers={'deferrals': max_deferrals})
+
+    def test_successful_probe_task_closes_circuit(self):
+        breaker = CircuitBreaker('resilient-task')
+        breaker.open()
+        expire_open_period(breaker)
+        assert resilient_task.delay({}).get().startswith('Resilient task completed')
+        assert breaker.state() == CLOSED
@@ -0,0 +1,91 @@
+"""
+Unit tests for the incremental precompressing static files storage.
+"""
+
+import json
+
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.test import RequestFactory
+from django.utils.functional import empty
+
+from apps.core.middleware import StaticFilesMiddleware
+
+
+@pytest.fixture
+def static_dirs(settings, tmp_path):
+    source = tmp_path / 'static'
+    (source / 'js').mkdir(parents=True)
+    (source / 'js' / 'app.js').write_text('console.log("hello");\n' * 200)
+    settings.STATICFILES_DIRS = [source]
+    settings.STATIC_ROOT = tmp_path / 'staticfiles'
+    settings.STATICFILES_COMPRESS_WORKERS = 1
+    settings.INSTALLED_APPS = ['apps.core.apps.StaticFilesConfig']
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'apps.core.static_storage.IncrementalCompressedStorage'},
+    }
+    return source, tmp_path / 'staticfiles'
+
+
+def collect():
+    call_command('collectstatic', interactive=False, verbosity=0)
+
+
+def hashed_name(root, name):
+    return json.loads((root / 'staticfiles.json').read_text())['paths'][name]
+
+
+class TestIncrementalCompressedStorage:
+    """Precompression, incremental skipping and stale file cleanup."""
+
+    def test_writes_brotli_and_gzip_variants(self, static_dirs):
+        _, root = static_dirs
+        collect()
+        name = hashed_name(root, 'js/app.js')
+        for suffix in ('', '.gz', '.br'):
+            assert (root / (name + suffix)).exists()
+        assert (root / (name + '.br')).stat().st_size < (root / name).stat().st_size
+
+    def test_unchanged_files_are_not_recompressed(self, static_dirs):
+        _, root = static_dirs
+        collect()
+        variant = root / (hashed_name(root, 'js/app.js') + '.gz')
+        variant.write_bytes(b'marker')
+        collect()
+        assert variant.read_bytes() == b'marker'
+
+    def test_files_left_uncompressed_are_not_retried(self, static_dirs, monkeypatch):
+        source, root = static_dirs
+        (source / 'js' / 'tiny.js').write_text('1;')
+        collect()
+        assert not (root / (hashed_name(root, 'js/tiny.js') + '.gz')).exists()
+
+        def no_compression(*args, **kwargs):
+            raise AssertionError('nothing changed, nothing to compress')
+
+        monkeypatch.setattr('apps.core.static_storage.ProcessPoolExecutor', no_compression)
+        collect()
+
+    def test_changed_files_replace_stale_hashed_files(self, static_dirs):
+        source, root = static_dirs
+        collect()
+        old = hashed_name(root, 'js/app.js')
+        (source / 'js' / 'app.js').write_text('console.log("changed");\n' * 200)
+        collect()
+        new = hashed_name(root, 'js/app.js')
+        assert new != old
+        assert (root / (new + '.br')).exists()
+        assert not (root / old).exists()
+        assert not (root / (old + '.br')).exists()
+
+    def test_hashed_files_are_served_immutable_and_precompressed(self, static_dirs):
+        _, root = static_dirs
+        collect()
+        staticfiles_storage._wrapped = empty  # reload the manifest written by collect()
+        middleware = StaticFilesMiddleware(lambda request: None)
+        url = '/static/' + hashed_name(root, 'js/app.js')
+        response = middleware(RequestFactory().get(url, HTTP_ACCEPT_ENCODING='gzip, br'))
+        assert response['Cache-Control'] == 'max-age=315360000, public, immutable'
+        assert response['Content-Encoding'] == 'br'
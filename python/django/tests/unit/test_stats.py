@@ -0,0 +1,83 @@
+"""
+Unit tests for request metrics and stampede-safe stats caching.
+"""
+
+import time
+
+import pytest
+from django.core.cache import cache
+
+from apps.core.caching import get_or_recompute
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+class Compute:
+    """Callable that counts invocations."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'n': self.calls}
+
+
+class TestGetOrRecompute:
+    """XFetch early refresh and the recompute lock."""
+
+    def test_fresh_value_is_reused(self):
+        compute = Compute()
+        first, computed_at = get_or_recompute('k', compute, ttl=60)
+        second, again = get_or_recompute('k', compute, ttl=60)
+        assert first == second == {'n': 1}
+        assert computed_at == again
+        assert compute.calls == 1
+
+    def test_expired_value_is_recomputed(self):
+        compute = Compute()
+        get_or_recompute('k', compute, ttl=60)
+        entry = cache.get('k')
+        cache.set('k', {**entry, 'expires_at': time.time() - 1}, 120)
+
+        value, _ = get_or_recompute('k', compute, ttl=60)
+        assert value == {'n': 2}
+
+    def test_locked_recompute_serves_previous_value(self):
+        compute = Compute()
+        get_or_recompute('k', compute, ttl=60)
+        entry = cache.get('k')
+        cache.set('k', {**entry, 'expires_at': time.time() - 1}, 120)
+        cache.add('k.lock', 'someone-else', 30)
+
+        value, _ = get_or_recompute('k', compute, ttl=60)
+        assert value == {'n': 1}
+        assert compute.calls == 1
+
+
+@pytest.mark.django_db
+class TestRequestMetrics:
+    """Middleware counters feeding api_stats."""
+
+    def test_stats_reflect_recorded_requests(self, client, django_user_model):
+        user = django_user_model.objects.create_user(username='metrics', password='x')
+        client.force_login(user)
+        for _ in range(3):
+            client.get('/health/')
+
+        data = client.get('/api/v1/stats/').json()['data']
+        assert data['total_requests'] == 3
+        assert data['window_requests'] == 3
+        assert data['active_users'] == 1
+        assert data['users_count'] == 1
+        assert data['error_rate'] == '0.00%'
+
+    def test_cached_at_is_when_stats_were_computed(self, client):
+        first = client.get('/api/v1/stats/').json()
+        second = client.get('/api/v1/stats/').json()
+        assert first['cached_at'] == second['cached_at']